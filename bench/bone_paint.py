@@ -0,0 +1,35 @@
+"""Bone painting with cached geometry and style against rebuilding them"""
+
+from common import application, chain_document, measure, report
+
+app = application()
+
+from megabone.views.editor_view import MainEditorView  # noqa: E402
+
+for count in (10, 100, 1000):
+    # Short bones keep the whole chain inside the scene rect
+    document = chain_document(count, length=0.25)
+    view = MainEditorView(document)
+    view.resize(1280, 720)
+    view.show()
+    app.processEvents()
+
+    scene = view.modal_scene
+    bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+
+    def repaint(cached: bool) -> None:
+        if not cached:
+            # What every paint did before the cache
+            for bone in bones:
+                bone._geometry_key = None
+                bone._style_key = None
+        view.viewport().repaint()
+
+    for cached in (True, False):
+        label = "cached" if cached else "rebuilt"
+        report(
+            f"{count:>4} bones: view repaint, {label}",
+            measure(lambda: repaint(cached), number=10),
+        )
+
+    view.close()
@@ -0,0 +1,61 @@
+"""Shared setup of the benchmark scripts.
+
+Run a script from the repository root, e.g. ``python bench/scene_sync.py``.
+Scripts use the offscreen Qt platform unless QT_QPA_PLATFORM is set.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def application():
+    from megabone.qt import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def chain_document(count: int, length: float = 10.0):
+    """Document with a straight chain of count bones along the x axis"""
+
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.model.bone import BoneData
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.util.types import Point
+
+    document = Document()
+    parent_id = ""
+    for i in range(count):
+        bone = BoneData(
+            name=f"bone {i}",
+            parent_id=parent_id,
+            start_point=Point(i * length, 0),
+            end_point=Point((i + 1) * length, 0),
+        )
+        document.bones.add_item(bone, UpdateSource.LOAD)
+        parent_id = bone.id
+
+    return document
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Best time of repeat runs of number calls, in milliseconds per call"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best * 1000
+
+
+def report(label: str, value: float, unit: str = "ms") -> None:
+    print(f"{label:<48} {value:10.3f} {unit}")
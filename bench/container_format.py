@@ -0,0 +1,62 @@
+"""Binary container against JSON: file size, open time and full decode time"""
+
+import tempfile
+from pathlib import Path
+
+from common import application, chain_document, measure, report
+
+from megabone.model.collection import UpdateSource
+from megabone.model.document import Document
+from megabone.model.keyframe import KeyframeData
+from megabone.views.editor_scene import ModalEditorScene
+
+application()
+directory = Path(tempfile.mkdtemp())
+
+
+def synthetic_document(keyframes: int) -> Document:
+    bones = max(keyframes // 50, 1)
+    document = chain_document(bones)
+    bone_ids = [bone.id for bone in document.bones.get_items()]
+    for i in range(keyframes):
+        keyframe = KeyframeData(
+            bone_id=bone_ids[i % bones], frame=i // bones, value=i * 0.5
+        )
+        document.keyframes.add_item(keyframe, UpdateSource.LOAD)
+    return document
+
+
+def decode_all(path: Path) -> None:
+    document = Document.load(path)
+    for collection in document.get_all_collections():
+        collection.get_items()
+
+
+def open_in_editor(path: Path) -> None:
+    ModalEditorScene(document=Document.load(path))
+
+
+projects = Path(__file__).resolve().parents[1] / "projects"
+documents = [
+    (path.stem, Document.load(path)) for path in sorted(projects.glob("*.mgb"))
+]
+documents += [
+    (f"{count} keys", synthetic_document(count)) for count in (1_000, 100_000)
+]
+
+for name, document in documents:
+    json_path = directory / f"{name}.json"
+    binary_path = directory / f"{name}.mgb"
+    document.write(json_path)
+    document.write(binary_path, binary=True)
+
+    repeat = 3 if len(document.keyframes.get_items()) > 10_000 else 20
+    for kind, path in (("json", json_path), ("mgb", binary_path)):
+        label = f"{name[:20]}, {kind}"
+        report(f"{label}: file size", path.stat().st_size / 1024, "KiB")
+        report(
+            f"{label}: open in editor", measure(lambda: open_in_editor(path), repeat)
+        )
+        report(f"{label}: decode all", measure(lambda: decode_all(path), repeat))
+
+        path.unlink()
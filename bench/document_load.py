@@ -0,0 +1,64 @@
+"""Document load: streamed JSON records against a whole-file json.load"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from common import application, chain_document, measure, report
+
+from megabone.manager.document import DocumentManager
+from megabone.model.collection import UpdateSource
+from megabone.model.document import Document
+from megabone.model.keyframe import KeyframeData
+from megabone.util.types import Point
+
+application()
+manager = DocumentManager()
+directory = Path(tempfile.mkdtemp())
+
+for keyframes in (1_000, 10_000, 100_000):
+    bones = max(keyframes // 50, 1)
+    document = chain_document(bones)
+    bone_ids = [bone.id for bone in document.bones.get_items()]
+    for i in range(keyframes):
+        keyframe = KeyframeData(
+            bone_id=bone_ids[i % bones],
+            frame=i // bones,
+            value=Point(i * 0.5, -i * 0.25),
+        )
+        document.keyframes.add_item(keyframe, UpdateSource.LOAD)
+
+    path = directory / f"synthetic_{keyframes}.json"
+    document.write(path)
+    size = path.stat().st_size
+
+    calls = []
+
+    def load_counted():
+        calls.clear()
+        Document.load(path, lambda done, total: calls.append(done))
+
+    dialog = manager._load_progress_dialog(path)
+
+    def load_dialog():
+        Document.load(
+            path, lambda done, total: manager._load_progress(dialog, done, total)
+        )
+
+    def parse_only():
+        with path.open(encoding="utf-8") as file:
+            json.load(file)
+
+    label = f"{keyframes:>6} keys"
+    report(f"{label}: file size", size / 1e6, "MB")
+    report(f"{label}: json.load, parse only", measure(parse_only, repeat=3))
+    report(f"{label}: streamed load", measure(load_counted, repeat=3))
+    report(f"{label}: streamed load, dialog", measure(load_dialog, repeat=3))
+    report(f"{label}: progress callbacks", len(calls), "calls")
+
+    updates = {100 * done // size for done in calls}
+    report(f"{label}: dialog updates", len(updates), "calls")
+
+    dialog.reset()
+    dialog.deleteLater()
+    path.unlink()
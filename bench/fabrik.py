@@ -0,0 +1,33 @@
+"""FABRIK backends: pure Python QPointF solver against the NumPy one"""
+
+from common import application, chain_document, measure, report
+
+app = application()
+
+from megabone.IKSolver import IKSolverFactory, SolverType  # noqa: E402
+from megabone.util.types import Point  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+ITERATIONS = 10
+
+for count in (2, 4, 8, 16, 32, 64):
+    document = chain_document(count)
+    scene = ModalEditorScene(document=document)
+    bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+
+    # Alternate between two reachable targets so every solve does real work
+    reach = count * 10 * 0.7
+    targets = [Point(reach * 0.6, reach * 0.8), Point(reach * 0.8, -reach * 0.6)]
+
+    for solver_type in (SolverType.FABRIK, SolverType.FABRIK_NUMPY):
+        solver = IKSolverFactory.create(bones, solver_type)
+        kwargs = {"tolerance": 0.0} if solver_type == SolverType.FABRIK_NUMPY else {}
+        step = iter(range(1 << 30))
+
+        def solve():
+            solver.solve(targets[next(step) % 2], ITERATIONS, **kwargs)
+
+        report(
+            f"{count:>2} bones {solver_type.name.lower()}, {ITERATIONS} iterations",
+            measure(solve, number=20),
+        )
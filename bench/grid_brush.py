@@ -0,0 +1,57 @@
+"""Editor checkerboard: cached texture brush against one fillRect per cell"""
+
+from common import application, measure, report
+
+app = application()
+
+from megabone.editor.grid import EditorGrid  # noqa: E402
+from megabone.qt import (  # noqa: E402
+    QBrush,
+    QColor,
+    QGraphicsView,
+    QImage,
+    QPainter,
+    QRectF,
+)
+
+DARK = QColor("#404040")
+LIGHT = QColor("#666666")
+
+
+def per_cell(painter: QPainter, rect: QRectF, size: int) -> None:
+    """Checkerboard fill of the grid before the texture brush, for reference"""
+
+    left = int(rect.left() - rect.left() % size)
+    top = int(rect.top() - rect.top() % size)
+    for y in range(top, int(rect.bottom()), size):
+        for x in range(left, int(rect.right()), size):
+            color = DARK if (x / size + y / size) % 2 else LIGHT
+            painter.fillRect(QRectF(x, y, size, size), QBrush(color))
+
+
+view = QGraphicsView()
+grid = EditorGrid(view)
+image = QImage(1920, 1080, QImage.Format.Format_ARGB32_Premultiplied)
+
+# Exposed scene rects of a full HD viewport at decreasing zoom levels
+for zoom in (2.0, 1.0, 0.5, 0.25):
+    rect = QRectF(-960 / zoom, -540 / zoom, 1920 / zoom, 1080 / zoom)
+
+    def draw(fill) -> None:
+        painter = QPainter(image)
+        painter.translate(960, 540)
+        painter.scale(zoom, zoom)
+        fill(painter, rect)
+        painter.end()
+
+    cells = int(rect.width() // grid.grid_size + 1) * int(
+        rect.height() // grid.grid_size + 1
+    )
+    report(
+        f"zoom {zoom:<4} ({cells} cells): texture brush",
+        measure(lambda: draw(grid.drawBackground), number=10),
+    )
+    report(
+        f"zoom {zoom:<4} ({cells} cells): fillRect per cell",
+        measure(lambda: draw(lambda p, r: per_cell(p, r, grid.grid_size)), number=3),
+    )
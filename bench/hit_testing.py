@@ -0,0 +1,160 @@
+"""Hit testing on an animated rig: Qt's BSP index against the layer grid.
+
+Every frame moves all bones and then runs one query, as picking, rubber
+band selection or hovering during playback would. Queries on the rig at
+rest are measured too. With the BSP index the queries go through
+QGraphicsScene, with NoIndex picking and rubber band selection go through
+the layer spatial indexes. "bsp + grid" keeps Qt's index and picks through
+the layer indexes, as the editor does. Hover is always dispatched by
+QGraphicsScene itself, so it shows what NoIndex costs Qt's own lookups.
+"""
+
+import math
+
+from common import application, measure, report
+
+app = application()
+
+import megabone.widget  # noqa: E402,F401  (resolves the widget import cycle)
+from megabone.model.bone import BoneData  # noqa: E402
+from megabone.model.collection import UpdateSource  # noqa: E402
+from megabone.model.document import Document  # noqa: E402
+from megabone.qt import (  # noqa: E402
+    QEvent,
+    QGraphicsItem,
+    QGraphicsScene,
+    QGraphicsView,
+    QMouseEvent,
+    QPainterPath,
+    QPointF,
+    QRectF,
+    Qt,
+    QTransform,
+)
+from megabone.util.types import Point  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+CHAIN_LENGTH = 10
+BONE_LENGTH = 12.0
+
+
+def rig_document(chains: int) -> Document:
+    """Chains of CHAIN_LENGTH bones laid out in rows over the scene"""
+
+    document = Document()
+    columns = math.ceil(math.sqrt(chains))
+    for chain in range(chains):
+        x0 = (chain % columns) * CHAIN_LENGTH * BONE_LENGTH * 1.2
+        y0 = (chain // columns) * 24.0
+
+        parent_id = ""
+        for i in range(CHAIN_LENGTH):
+            bone = BoneData(
+                parent_id=parent_id,
+                start_point=Point(x0 + i * BONE_LENGTH, y0),
+                end_point=Point(x0 + (i + 1) * BONE_LENGTH, y0),
+            )
+            document.bones.add_item(bone, UpdateSource.LOAD)
+            parent_id = bone.id
+
+    return document
+
+
+def bsp_pick(scene: ModalEditorScene, pos: QPointF):
+    return scene.itemAt(pos, QTransform())
+
+
+def grid_pick(scene: ModalEditorScene, pos: QPointF):
+    return scene.layer_manager.item_at(pos)
+
+
+def bsp_band(scene: ModalEditorScene, rect: QRectF) -> list:
+    return scene.items(rect, Qt.ItemSelectionMode.IntersectsItemShape)
+
+
+def grid_band(scene: ModalEditorScene, rect: QRectF) -> list:
+    # As SelectionMode resolves the rubber band
+    path = QPainterPath()
+    path.addRect(rect)
+    return [
+        item
+        for item in scene.layer_manager.items_in_rect(rect)
+        if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+        and item.collidesWithPath(item.mapFromScene(path))
+    ]
+
+
+def hover(view: QGraphicsView, pos: QPointF) -> None:
+    local = QPointF(view.mapFromScene(pos))
+    event = QMouseEvent(
+        QEvent.Type.MouseMove,
+        local,
+        QPointF(view.viewport().mapToGlobal(local.toPoint())),
+        Qt.MouseButton.NoButton,
+        Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier,
+    )
+    app.sendEvent(view.viewport(), event)
+
+
+for chains in (20, 200):
+    count = chains * CHAIN_LENGTH
+    document = rig_document(chains)
+    scene = ModalEditorScene(document=document)
+    bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+    rest = [(bone.start_point, bone.end_point) for bone in bones]
+
+    view = QGraphicsView(scene)
+    view.resize(1280, 720)
+    view.setMouseTracking(True)
+    view.show()
+    app.processEvents()
+
+    center = scene.itemsBoundingRect().center()
+    band = QRectF(center.x() - 80, center.y() - 60, 160, 120)
+
+    frame = iter(range(1 << 30))
+
+    def animate() -> QPointF:
+        """Move every bone and return a point on one of them"""
+
+        t = next(frame)
+        dy = math.sin(t * 0.3) * 4
+        for bone, (start, end) in zip(bones, rest):
+            bone.start_point = Point(start.x, start.y + dy)
+            bone.end_point = Point(end.x, end.y + dy)
+
+        target = bones[(t * 7) % count]
+        return (target.start_point + target.end_point).to_qpointf() * 0.5
+
+    bsp = QGraphicsScene.ItemIndexMethod.BspTreeIndex
+    no_index = QGraphicsScene.ItemIndexMethod.NoIndex
+
+    for label, method, pick, select in (
+        ("bsp", bsp, bsp_pick, bsp_band),
+        ("grid", no_index, grid_pick, grid_band),
+        ("bsp + grid", bsp, grid_pick, grid_band),
+    ):
+        scene.setItemIndexMethod(method)
+        assert pick(scene, animate()) is not None
+
+        prefix = f"{count:>4} bones, {label:<10}"
+        pos = animate()
+        report(f"{prefix}: pick, static", measure(lambda: pick(scene, pos), number=20))
+        report(f"{prefix}: hover, static", measure(lambda: hover(view, pos), number=20))
+
+        report(f"{prefix}: move", measure(animate, number=20))
+        report(
+            f"{prefix}: move + pick",
+            measure(lambda: pick(scene, animate()), number=20),
+        )
+        report(
+            f"{prefix}: move + rubber band",
+            measure(lambda: (animate(), select(scene, band)), number=20),
+        )
+        report(
+            f"{prefix}: move + hover",
+            measure(lambda: hover(view, animate()), number=20),
+        )
+
+    view.close()
@@ -0,0 +1,59 @@
+"""Keyframe lookup: bisect with a segment cursor against a linear scan"""
+
+import random
+
+from common import measure, report
+
+from megabone.model.animation_track import AnimationTrack
+
+
+def linear_value(track: AnimationTrack, frame: int):
+    """Lookup of the track before the bisect cursor, for reference"""
+
+    prev_keyframe = None
+    next_keyframe = None
+    for keyframe in track.keyframes:
+        if keyframe.frame <= frame:
+            prev_keyframe = keyframe
+        else:
+            next_keyframe = keyframe
+            break
+
+    if not prev_keyframe:
+        return track.keyframes[0].value
+    if not next_keyframe:
+        return prev_keyframe.value
+
+    t = (frame - prev_keyframe.frame) / (next_keyframe.frame - prev_keyframe.frame)
+    return prev_keyframe.interpolate(next_keyframe, t)
+
+
+for count in (10, 100, 1000, 10_000):
+    track = AnimationTrack(None, None)
+    for i in range(count):
+        track.addKeyframe(i * 4, float(i))
+
+    # Long tracks are played at a stride to bound the linear scan timings
+    playback = list(range(0, count * 4, max(count // 1000, 1)))
+    scrub = playback[:]
+    random.Random(0).shuffle(scrub)
+
+    def play_cursor(frames=playback):
+        for frame in frames:
+            track.getValue(frame)
+
+    def play_linear(frames=playback):
+        for frame in frames:
+            linear_value(track, frame)
+
+    assert [track.getValue(f) for f in scrub] == [linear_value(track, f) for f in scrub]
+
+    frames = len(playback)
+    for label, fn in (
+        ("playback, cursor", play_cursor),
+        ("playback, linear scan", play_linear),
+        ("random scrub, bisect", lambda: play_cursor(scrub)),
+        ("random scrub, linear scan", lambda: play_linear(scrub)),
+    ):
+        per_frame = measure(fn, repeat=3) * 1000 / frames
+        report(f"{count:>5} keys: {label}", per_frame, "us/frame")
@@ -0,0 +1,71 @@
+"""Layer z-order: scene build with 5,000 sprites and per item reordering"""
+
+from common import application, measure, report
+
+app = application()
+
+import megabone.widget  # noqa: E402,F401  (resolves the widget import cycle)
+from megabone.editor.layer import Layer  # noqa: E402
+from megabone.model.collection import UpdateSource  # noqa: E402
+from megabone.model.document import Document  # noqa: E402
+from megabone.model.sprite import SpriteData  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+COUNT = 5000
+
+
+def sprite_document(stored_keys: bool) -> Document:
+    document = Document()
+    for i in range(COUNT):
+        z_index = i * 256 if stored_keys else -1
+        sprite = SpriteData(name=f"sprite {i}", z_index=z_index)
+        document.sprites.add_item(sprite, UpdateSource.LOAD)
+    return document
+
+
+for stored_keys in (True, False):
+    document = sprite_document(stored_keys)
+    label = "stored keys" if stored_keys else "no keys, stored on insert"
+    report(
+        f"build {COUNT} sprites, {label}",
+        measure(lambda: ModalEditorScene(document=document), repeat=3),
+    )
+
+document = sprite_document(stored_keys=True)
+scene = ModalEditorScene(document=document)
+layers = scene.layer_manager
+order = layers.layers[Layer.SPRITE]
+
+# Raise and lower the middle sprite, as the R and F shortcuts do
+middle = order.items[COUNT // 2]
+scene.clearSelection()
+middle.setSelected(True)
+step = iter(range(1 << 30))
+
+
+def raise_lower():
+    layers._move_selected(1 if next(step) % 2 else -1)
+
+
+report("raise or lower one sprite (undoable)", measure(raise_lower, number=200))
+
+# Insert just above the bottom sprite until its gap is exhausted and renumbered
+bottom_key = order.keys[0]
+
+
+def insert_low():
+    sprite = SpriteData(z_index=bottom_key + 1)
+    document.sprites.add_item(sprite, UpdateSource.COMMAND)
+
+
+report(
+    "insert at a taken key, renumbering as gaps fill",
+    measure(insert_low, number=50),
+)
+
+stale = [
+    item.id
+    for item in order.items
+    if document.sprites.get_item(item.id).z_index != item.z_index
+]
+print(f"records with stale z_index after the run: {len(stale)}")
@@ -0,0 +1,134 @@
+"""Allocations per BoneItem.paint, and Point size against a dict backed class"""
+
+import tracemalloc
+from dataclasses import dataclass
+
+from common import application, chain_document, report
+
+app = application()
+
+from megabone.editor.item import BoneItem  # noqa: E402
+from megabone.model.bone import BoneData  # noqa: E402
+from megabone.qt import (  # noqa: E402
+    QColor,
+    QImage,
+    QPainter,
+    QPainterPath,
+    QStyleOptionGraphicsItem,
+)
+from megabone.util.types import Point  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+COUNT = 100_000
+BONES = 1000
+
+
+@dataclass
+class DictPoint:
+    """Point as it was before slots, for reference"""
+
+    x: float = 0.0
+    y: float = 0.0
+
+
+def allocating_path(bone: BoneItem) -> QPainterPath:
+    """BoneItem._build_path before the in place variants, for reference"""
+
+    start, end = bone.start_point, bone.end_point
+    np = (end - start).normalized()
+    nx, ny = -np.y, np.x
+
+    hw_start = bone._bone_width_start / 2
+    hw_end = bone._bone_width_end / 2
+
+    path = QPainterPath()
+    path.moveTo(start.x + nx * hw_start, start.y + ny * hw_start)
+    path.lineTo(end.x + nx * hw_end, end.y + ny * hw_end)
+    path.lineTo(end.x - nx * hw_end, end.y - ny * hw_end)
+    path.lineTo(start.x - nx * hw_start, start.y - ny * hw_start)
+    path.closeSubpath()
+    return path
+
+
+def paint_allocations(bones, painter, moving: bool) -> tuple[float, float]:
+    """Points created and Python bytes allocated per paint call"""
+
+    option = QStyleOptionGraphicsItem()
+    points = 0
+    allocated_bytes = 0
+
+    init = Point.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal points
+        points += 1
+        init(self, *args, **kwargs)
+
+    Point.__init__ = counting_init
+    tracemalloc.start()
+    try:
+        for bone in bones:
+            if moving:
+                # An animated bone is painted with new geometry every frame
+                bone._geometry_key = None
+
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            bone.paint(painter, option)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated_bytes += peak - current
+    finally:
+        tracemalloc.stop()
+        Point.__init__ = init
+
+    return points / len(bones), allocated_bytes / len(bones)
+
+
+def allocated(factory) -> float:
+    """Bytes per object still held after creating COUNT of them"""
+
+    tracemalloc.start()
+    objects = [factory(i) for i in range(COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / COUNT
+
+
+document = chain_document(BONES, length=2.0)
+scene = ModalEditorScene(document=document)
+bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+sample = bones[:100]
+
+image = QImage(BONES * 2 + 16, 64, QImage.Format.Format_ARGB32_Premultiplied)
+image.fill(QColor(0, 0, 0, 0))
+painter = QPainter(image)
+painter.translate(8, 32)
+
+for bone in bones:
+    bone.paint(painter, QStyleOptionGraphicsItem())
+
+for label, build in (
+    ("in place", None),
+    ("allocating operators", allocating_path),
+):
+    for bone in sample:
+        if build is None:
+            bone.__dict__.pop("_build_path", None)
+        else:
+            bone._build_path = lambda bone=bone: build(bone)
+
+    for moving in (False, True):
+        state = "moving" if moving else "static"
+
+        # The first pass warms caches such as the QPointF conversions
+        paint_allocations(sample, painter, moving)
+        points, allocated_bytes = paint_allocations(sample, painter, moving)
+        report(f"paint, {state}, {label}: Points", points, "/paint")
+        report(f"paint, {state}, {label}: allocated", allocated_bytes, "B/paint")
+
+painter.end()
+
+report("Point, slots", allocated(lambda i: Point(i, i)), "B/object")
+report("Point, __dict__", allocated(lambda i: DictPoint(i, i)), "B/object")
+report("BoneData, slots", allocated(lambda i: BoneData(name="b")), "B/object")
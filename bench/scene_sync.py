@@ -0,0 +1,28 @@
+"""Editor scene sync: per record updates against a full rebuild"""
+
+from common import application, chain_document, measure, report
+
+app = application()
+
+from megabone.model.collection import UpdateSource  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+for count in (10, 100, 1000):
+    document = chain_document(count)
+    scene = ModalEditorScene(document=document)
+    bones = document.bones.get_items()
+    middle = bones[count // 2]
+
+    def modify():
+        document.bones.modify_item(middle, UpdateSource.COMMAND)
+
+    def remove_and_add():
+        document.bones.remove_item(middle.id, UpdateSource.COMMAND)
+        document.bones.add_item(middle, UpdateSource.COMMAND)
+
+    report(f"{count} bones: modify one bone", measure(modify, number=50))
+    report(
+        f"{count} bones: remove and re-add one bone",
+        measure(remove_and_add, number=20),
+    )
+    report(f"{count} bones: full rebuild", measure(scene.rebuild, repeat=3))
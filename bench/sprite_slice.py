@@ -0,0 +1,75 @@
+"""Grid slicing of sprite sheets: NumPy alpha reduction against a per pixel loop"""
+
+from pathlib import Path
+
+from common import application, measure, report
+
+app = application()
+
+from megabone.qt import QColor, QImage, qAlpha  # noqa: E402
+from megabone.util.image import Image, SliceMode  # noqa: E402
+
+CELL_SIZES = (16, 32)
+
+
+def per_pixel(image: QImage, size: int) -> list[QImage]:
+    """Image._extract_grid before the alpha reduction, for reference"""
+
+    def is_transparent(frame: QImage) -> bool:
+        for y in range(frame.height()):
+            for x in range(frame.width()):
+                if qAlpha(frame.pixel(x, y)) != 0:
+                    return False
+        return True
+
+    frames = []
+    for row in range(image.height() // size):
+        for col in range(image.width() // size):
+            frame = image.copy(col * size, row * size, size, size)
+            if not is_transparent(frame):
+                frames.append(frame)
+    return frames
+
+
+def sliced(image: QImage, size: int) -> list[QImage]:
+    return Image.extract_frames(image, size, size, mode=SliceMode.GRID)
+
+
+def keyed(path: Path) -> QImage:
+    """Sheet as the slicer sees it, the top left color keyed out if opaque"""
+
+    image = QImage(path.as_posix()).convertToFormat(QImage.Format.Format_ARGB32)
+    if image.pixelColor(0, 0).alpha() == 255:
+        Image.key_colors(image, [image.pixelColor(0, 0)])
+    return image
+
+
+def sparse_sheet(size: int = 2048) -> QImage:
+    """Mostly empty sheet with a few small sprites"""
+
+    image = QImage(size, size, QImage.Format.Format_ARGB32)
+    image.fill(QColor(0, 0, 0, 0))
+    for i in range(16):
+        x = (i * 397) % (size - 8)
+        y = (i * 211) % (size - 8)
+        for dy in range(8):
+            for dx in range(8):
+                image.setPixelColor(x + dx, y + dy, QColor(255, 0, 0))
+    return image
+
+
+projects = Path(__file__).resolve().parents[1] / "projects"
+sheets = [
+    (path.stem.rsplit(" - ", 1)[-1], keyed(path))
+    for path in sorted(projects.glob("*.png"))
+]
+sheets.append(("sparse 2048x2048", sparse_sheet()))
+
+for name, image in sheets:
+    for size in CELL_SIZES:
+        frames = sliced(image, size)
+        assert frames == per_pixel(image, size)
+
+        label = f"{name}, {size}px, {len(frames)} frames"
+        report(f"{label}: alpha reduction", measure(lambda: sliced(image, size)))
+        report(f"{label}: per pixel", measure(lambda: per_pixel(image, size), 1))
@@ -0,0 +1,49 @@
+"""Editor repaints through the raster viewport against the OpenGL one"""
+
+from common import application, chain_document, measure, report
+
+app = application()
+
+from megabone.editor.grid import EditorGrid  # noqa: E402
+from megabone.qt import QGraphicsView  # noqa: E402
+from megabone.util.opengl import opengl_available, use_opengl_viewport  # noqa: E402
+from megabone.util.types import Point  # noqa: E402
+from megabone.views.editor_scene import ModalEditorScene  # noqa: E402
+
+BONES = 500
+
+document = chain_document(BONES, length=1.0)
+scene = ModalEditorScene(document=document)
+scene.setSceneRect(-256, -256, 512, 512)
+bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+
+if not opengl_available():
+    print("OpenGL is not available here, only the raster viewport is measured")
+
+for opengl in (False, True):
+    view = QGraphicsView(scene)
+    view.resize(1280, 720)
+    if use_opengl_viewport(view, opengl) != opengl:
+        continue
+
+    EditorGrid(view)
+    view.show()
+    app.processEvents()
+
+    name = "opengl" if opengl else "raster"
+    step = iter(range(1 << 30))
+
+    def repaint():
+        view.viewport().repaint()
+
+    def animate():
+        # Move the root so the whole chain is re-evaluated and repainted
+        offset = next(step) % 2
+        bones[0].start_point = Point(offset, offset)
+        bones[0].propagate([bones[0]])
+        app.processEvents()
+        view.viewport().repaint()
+
+    report(f"{BONES} bones, {name}: full repaint", measure(repaint, number=10))
+    report(f"{BONES} bones, {name}: move root and repaint", measure(animate, number=10))
+    view.close()
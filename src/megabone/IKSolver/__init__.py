@@ -1 +1,4 @@
-from .fabrik import FABRIK
\ No newline at end of file
+from .batch import BatchFABRIK
+from .fabrik import FABRIK
+from .fabrik_numpy import NumpyFABRIK
+from .solver_factory import IKSolverFactory, SolverType
@@ -0,0 +1,149 @@
+import numpy as np
+
+from megabone.editor.item import BoneItem
+
+from .fabrik_numpy import NumpyFABRIK, target_xy
+
+
+class BatchFABRIK:
+    """Solve several FABRIK chains together.
+
+    Chains are packed into one padded (chain x joint x 2) array. Shorter
+    chains are padded with zero length bones collapsed onto their end
+    effector, so every reaching step runs as one vectorized operation over
+    all chains. Chains without bones are left out, solve takes a target
+    for every chain given and skips theirs.
+    """
+
+    def __init__(self, chains: list[NumpyFABRIK]):
+        # Which of the given chains are solved, in order
+        self._kept = [bool(chain.bones) for chain in chains]
+        self.chains = [chain for chain in chains if chain.bones]
+
+        count = len(self.chains)
+        joint_count = max((len(c.bones) for c in self.chains), default=0) + 1
+
+        self.counts = np.array([len(c.bones) for c in self.chains], dtype=np.intp)
+        self.joints = np.zeros((count, joint_count, 2), dtype=np.float64)
+        self.lengths = np.zeros((count, joint_count - 1), dtype=np.float64)
+
+        for i, chain in enumerate(self.chains):
+            self.lengths[i, : self.counts[i]] = chain.lengths
+
+        self.total_lengths = self.lengths.sum(axis=1)
+        self._padding = np.arange(joint_count)[None, :] >= self.counts[:, None]
+
+    def read_joints(self) -> np.ndarray:
+        """Refresh the packed joints from the current bone positions"""
+
+        for i, chain in enumerate(self.chains):
+            joints = chain.read_joints()
+            self.joints[i, : len(joints)] = joints
+            self.joints[i, len(joints) :] = joints[-1]
+
+        return self.joints
+
+    def solve(
+        self,
+        targets: list,
+        iterations: int = 10,
+        tolerance: float = 0.01,
+        apply: bool = True,
+        from_previous: bool = False,
+    ) -> list[np.ndarray]:
+        """Reach every chain for its target.
+
+        Returns the solved (bones + 1) x 2 joint positions of each chain with
+        bones and,
+        unless apply is False, writes them back to the bone items. With
+        from_previous the solve starts from the joints of the last solve
+        instead of the bone positions, as playback would after applying it.
+        """
+
+        if not self.chains:
+            return []
+
+        joints = self.joints if from_previous else self.read_joints()
+        targets = np.array(
+            [target_xy(t) for t, kept in zip(targets, self._kept) if kept],
+            dtype=np.float64,
+        )
+        roots = joints[:, 0].copy()
+
+        reach = targets - roots
+        distance = np.hypot(reach[:, 0], reach[:, 1])
+        reachable = distance < self.total_lengths
+
+        # Out of reach chains are stretched towards their target in one step
+        if not reachable.all():
+            far = ~reachable
+            direction = np.divide(
+                reach[far],
+                distance[far, None],
+                out=np.zeros_like(reach[far]),
+                where=distance[far, None] > 0,
+            )
+            reached = np.cumsum(self.lengths[far], axis=1)
+            joints[far, 1:] = roots[far, None] + reached[..., None] * direction[:, None]
+
+        rows = np.arange(len(self.chains))
+        for _ in range(iterations):
+            effector = joints[rows, self.counts] - targets
+            error = np.hypot(effector[:, 0], effector[:, 1])
+
+            active = np.flatnonzero(reachable & (error > tolerance))
+            if active.size == 0:
+                break
+
+            joints[active] = self._iterate(
+                joints[active],
+                self.lengths[active],
+                roots[active],
+                targets[active],
+                self._padding[active],
+            )
+
+        solved = [joints[i, : count + 1].copy() for i, count in enumerate(self.counts)]
+
+        if apply:
+            for chain, chain_joints in zip(self.chains, solved):
+                chain.apply_joints(chain_joints, propagate=False)
+
+            # Children of every chain are updated in a single pass
+            BoneItem.propagate([bone for chain in self.chains for bone in chain.bones])
+
+        return solved
+
+    @staticmethod
+    def _iterate(
+        joints: np.ndarray,
+        lengths: np.ndarray,
+        roots: np.ndarray,
+        targets: np.ndarray,
+        padding: np.ndarray,
+    ) -> np.ndarray:
+        """One backward and forward reaching pass over a chain subset"""
+
+        # Backward reaching: pin end effectors (and padding) to the targets
+        joints[padding] = np.repeat(targets, padding.sum(axis=1), axis=0)
+        for i in range(joints.shape[1] - 2, -1, -1):
+            BatchFABRIK._reach(joints[:, i], joints[:, i + 1], lengths[:, i])
+
+        # Forward reaching: pin the roots back in place
+        joints[:, 0] = roots
+        for i in range(joints.shape[1] - 1):
+            BatchFABRIK._reach(joints[:, i + 1], joints[:, i], lengths[:, i])
+
+        return joints
+
+    @staticmethod
+    def _reach(points: np.ndarray, anchors: np.ndarray, lengths: np.ndarray) -> None:
+        """Move points in place to lie at lengths from their anchors"""
+
+        delta = points - anchors
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        scale = np.divide(
+            lengths, distance, out=np.zeros_like(distance), where=distance > 0
+        )
+        np.multiply(delta, scale[:, None], out=delta)
+        np.add(anchors, delta, out=points)
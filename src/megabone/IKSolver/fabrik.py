@@ -3,6 +3,7 @@ from typing import List
 
 from megabone.editor.item import BoneItem
 from megabone.qt import QPointF
+from megabone.util.types import Point
 
 
 class FABRIK:
@@ -25,11 +26,14 @@ class FABRIK:
         if not self.bones:
             return
 
+        if isinstance(target_pos, Point):
+            target_pos = target_pos.to_qpointf()
+
         # Get chain points
         points = [self.bones[0].start_point]
         for bone in self.bones:
             points.append(bone.end_point)
-        points = [QPointF(p.x(), p.y()) for p in points]
+        points = [p.to_qpointf() for p in points]
 
         # Check if target is reachable
         base_to_target = math.sqrt(
@@ -79,9 +83,7 @@ class FABRIK:
                 )
 
             # Forward reaching: Update points from start to end
-            points[0] = QPointF(
-                self.bones[0].start_point.x(), self.bones[0].start_point.y()
-            )
+            points[0] = self.bones[0].start_point.to_qpointf()
 
             for i in range(len(points) - 1):
                 current = points[i]
@@ -132,8 +134,8 @@ class FABRIK:
 
         # Update bone positions
         for i, bone in enumerate(self.bones):
-            bone.start_point = points[i]
-            bone.end_point = points[i + 1]
+            bone.start_point = Point.from_qpointf(points[i])
+            bone.end_point = Point.from_qpointf(points[i + 1])
             bone.update()
-            bone.update_children_transform()
-            bone.update_model()
+
+        BoneItem.propagate(self.bones)
@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+
+from megabone.editor.item import BoneItem
+from megabone.util.types import Point
+
+
+def target_xy(target) -> tuple[float, float]:
+    """Coordinates of a Point or QPointF target"""
+
+    if isinstance(target, Point):
+        return target.x, target.y
+    return target.x(), target.y()
+
+
+class NumpyFABRIK:
+    """FABRIK solver working on contiguous float64 joint arrays.
+
+    Joints are read from the bones when a solve starts, the reaching passes
+    update the arrays in place and the bones are written back once at the end.
+    """
+
+    def __init__(self, bones: list[BoneItem], tolerance: float = 0.01):
+        self.bones = bones
+        self.tolerance = tolerance
+
+        self.joints = np.zeros((len(bones) + 1, 2), dtype=np.float64)
+        self.lengths = np.array(
+            [bone.calculate_length() for bone in bones], dtype=np.float64
+        )
+        self.total_length = float(self.lengths.sum())
+
+        self._delta = np.zeros(2, dtype=np.float64)
+
+    def read_joints(self) -> np.ndarray:
+        """Refresh the joint array from the current bone positions"""
+
+        if self.bones:
+            start = self.bones[0].start_point
+            self.joints[0] = (start.x, start.y)
+
+            for i, bone in enumerate(self.bones, start=1):
+                self.joints[i] = (bone.end_point.x, bone.end_point.y)
+
+        return self.joints
+
+    def solve(self, target_pos, iterations: int = 10, tolerance: float | None = None):
+        """Reach for the target and return the number of iterations used"""
+
+        if not self.bones:
+            return 0
+
+        tolerance = self.tolerance if tolerance is None else tolerance
+        joints = self.read_joints()
+        lengths = self.lengths
+        count = len(self.bones)
+
+        root = joints[0].copy()
+        target = np.array(target_xy(target_pos), dtype=np.float64)
+        reach = target - root
+        distance = math.hypot(reach[0], reach[1])
+
+        used = 0
+        if distance >= self.total_length:
+            # Out of reach, the solution is the chain stretched towards the target
+            if distance > 0:
+                np.multiply.outer(np.cumsum(lengths), reach / distance, out=joints[1:])
+                joints[1:] += root
+        else:
+            for used in range(iterations):
+                if self._distance(joints[-1], target) <= tolerance:
+                    break
+
+                # Backward reaching: pin the end effector to the target
+                joints[-1] = target
+                for i in range(count - 1, -1, -1):
+                    self._reach(joints[i], joints[i + 1], lengths[i])
+
+                # Forward reaching: pin the root back in place
+                joints[0] = root
+                for i in range(count):
+                    self._reach(joints[i + 1], joints[i], lengths[i])
+            else:
+                used = iterations
+
+        self.apply_joints(joints)
+        return used
+
+    def apply_joints(self, joints: np.ndarray, propagate: bool = True) -> None:
+        """Write solved joint positions back to the bone items"""
+
+        points = joints.tolist()
+        for i, bone in enumerate(self.bones):
+            bone.start_point = Point(*points[i])
+            bone.end_point = Point(*points[i + 1])
+            bone.update()
+
+        if propagate:
+            BoneItem.propagate(self.bones)
+
+    def _reach(self, point: np.ndarray, anchor: np.ndarray, length: float) -> None:
+        """Move point in place to lie at length from anchor"""
+
+        delta = self._delta
+        np.subtract(point, anchor, out=delta)
+
+        distance = math.hypot(delta[0], delta[1])
+        if distance > 0:
+            delta *= length / distance
+            np.add(anchor, delta, out=point)
+        else:
+            point[:] = anchor
+
+    def _distance(self, a: np.ndarray, b: np.ndarray) -> float:
+        np.subtract(a, b, out=self._delta)
+        return math.hypot(self._delta[0], self._delta[1])
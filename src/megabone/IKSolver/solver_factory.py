@@ -0,0 +1,27 @@
+from enum import Enum, auto
+
+from megabone.editor.item import BoneItem
+
+from .fabrik import FABRIK
+from .fabrik_numpy import NumpyFABRIK
+
+
+class SolverType(Enum):
+    FABRIK = auto()
+    FABRIK_NUMPY = auto()
+
+
+class IKSolverFactory:
+    """Create IK chain solvers for the selected backend"""
+
+    default = SolverType.FABRIK_NUMPY
+
+    @classmethod
+    def create(
+        cls, bones: list[BoneItem], solver_type: SolverType | None = None
+    ) -> FABRIK | NumpyFABRIK:
+        match solver_type or cls.default:
+            case SolverType.FABRIK:
+                return FABRIK(bones)
+            case SolverType.FABRIK_NUMPY:
+                return NumpyFABRIK(bones)
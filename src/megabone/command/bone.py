@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from megabone.model.bone import BoneData
 from megabone.model.collection import UpdateSource
 from megabone.model.document import Document
@@ -30,13 +32,15 @@ class MoveBoneCommand(DocumentCommand):
         return True
 
     def redo(self) -> None:
-        data = self._document.bones.get_item(self._bone_id)
-        data.end_point = self._new_end
-        self._document.bones.update_item(data, UpdateSource.COMMAND)
+        self._apply(self._new_end)
 
     def undo(self) -> None:
+        self._apply(self._old_end)
+
+    def _apply(self, end_point: Point) -> None:
+        # Replace the record, snapshots being saved may still hold the old one
         data = self._document.bones.get_item(self._bone_id)
-        data.end_point = self._old_end
+        data = replace(data, end_point=end_point)
         self._document.bones.modify_item(data, UpdateSource.COMMAND)
 
 
@@ -89,5 +93,5 @@ class RenameBoneCommand(DocumentCommand):
         data = self._document.bones.get_item(self._bone_id)
 
         assert isinstance(data, BoneData)
-        data.name = name
+        data = replace(data, name=name)
         self._document.bones.modify_item(data, UpdateSource.COMMAND)
@@ -1,5 +1,11 @@
+from dataclasses import replace
+
+from megabone.model.collection import BaseCollectionModel, UpdateSource
 from megabone.qt import QUndoCommand
 
+# Collection, record id, old and new z index
+ZIndexChange = tuple[BaseCollectionModel, str, int, int]
+
 
 class DocumentCommand(QUndoCommand):
     """Base for all undoable document operations"""
@@ -7,3 +13,45 @@ class DocumentCommand(QUndoCommand):
     def __init__(self, document, description: str):
         super().__init__(description)
         self._document = document
+
+
+class MacroCommand(DocumentCommand):
+    """Run a group of commands as a single undo step and notification"""
+
+    def __init__(self, document, description: str, commands: list[DocumentCommand]):
+        super().__init__(document, description)
+        self._commands = commands
+
+    def redo(self) -> None:
+        with self._document.batch():
+            for command in self._commands:
+                command.redo()
+
+    def undo(self) -> None:
+        with self._document.batch():
+            for command in reversed(self._commands):
+                command.undo()
+
+
+class ReorderCommand(DocumentCommand):
+    """Store new z indexes of records, e.g. after raising a sprite"""
+
+    def __init__(self, document, changes: list[ZIndexChange]):
+        super().__init__(document, "Reorder")
+        self._changes = changes
+
+    def redo(self) -> None:
+        self._apply(new=True)
+
+    def undo(self) -> None:
+        self._apply(new=False)
+
+    def _apply(self, new: bool) -> None:
+        with self._document.batch():
+            for model, item_id, old_index, new_index in self._changes:
+                data = model.get_item(item_id)
+                if data is None:
+                    continue
+
+                z_index = new_index if new else old_index
+                model.modify_item(replace(data, z_index=z_index), UpdateSource.COMMAND)
@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from megabone.model.collection import UpdateSource
 from megabone.model.document import Document
 from megabone.model.sprite import SpriteData
@@ -77,7 +79,7 @@ class MoveSpriteCommand(DocumentCommand):
         data = self._document.sprites.get_item(self._sprite_id)
 
         assert isinstance(data, SpriteData)
-        data.position = pos
+        data = replace(data, position=pos)
         self._document.sprites.modify_item(data, UpdateSource.COMMAND)
 
 
@@ -98,5 +100,5 @@ class ChangeFrameCommand(DocumentCommand):
 
     def _apply(self, frame_index: int) -> None:
         data = self._document.sprites.get_item(self._sprite_id)
-        data.frame_index = frame_index
+        data = replace(data, frame_index=frame_index)
         self._document.sprites.modify_item(data, UpdateSource.COMMAND)
@@ -1,7 +1,9 @@
 from enum import Enum, auto
 
 from megabone.manager.document import DocumentManager
+from megabone.manager.status import StatusBarManager as status
 from megabone.qt import QObject, Signal
+from megabone.util.opengl import opengl_available, set_opengl_enabled
 
 from .editor import EditorController
 
@@ -81,9 +83,9 @@ class AppController(QObject):
         if not doc:
             return
 
-        path = FileDialog.save_file()
-        if path:
-            self._documents.save_document_as(doc.id, path)
+        target = FileDialog.save_file()
+        if target:
+            self._documents.save_document_as(doc.id, *target)
 
     def on_close_document(self) -> None:
         doc = self._documents.get_active_document()
@@ -101,3 +103,14 @@ class AppController(QObject):
 
     def on_zen_mode(self) -> None:
         self.requestZenMode.emit()
+
+    def on_opengl_viewport(self, enabled: bool) -> None:
+        set_opengl_enabled(enabled)
+
+        # Views pick their viewport when created
+        if enabled and not opengl_available():
+            message = "OpenGL is not available, views keep the raster viewport"
+        else:
+            state = "enabled" if enabled else "disabled"
+            message = f"OpenGL viewport {state}, restart to apply it to every view"
+        status().set_status(message, timeout=5000)
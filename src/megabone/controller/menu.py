@@ -1,10 +1,11 @@
 from collections import OrderedDict
 from enum import Enum, auto
 
-from megabone.builder import MenuBuilder
+from megabone.builder import MenuBuilder, MenuItemState
 from megabone.manager.document import DocumentManager
 from megabone.manager.recent_files import RecentFilesManager
 from megabone.qt import QKeySequence, QMenuBar
+from megabone.util.opengl import opengl_enabled
 
 from .app import AppController
 
@@ -80,9 +81,19 @@ class MainMenuController:
             .action("Full Screen", self.controller.on_full_screen, "F11")
             .action("Zen Mode", self.controller.on_zen_mode, "Ctrl+F11")
             .separator()
+            .action(
+                "OpenGL Viewport",
+                self.controller.on_opengl_viewport,
+                checkable=True,
+                tooltip="Paint views through OpenGL, applies after a restart",
+            )
+            .separator()
             .submenu("Show")
             .back()
         )
+        self._menus[MenuType.VIEW].update_item_state(
+            "OpenGL Viewport", MenuItemState(checked=opengl_enabled())
+        )
 
         self._menus[MenuType.HELP] = (
             MenuBuilder("Help")
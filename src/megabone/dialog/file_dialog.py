@@ -14,7 +14,7 @@ class FileDialog:
             None,
             "Open File...",
             "",
-            c._DEFAULT_DESCRIPTOR,
+            f"{c._OPEN_DESCRIPTOR};;{c._DEFAULT_DESCRIPTOR};;{c._BINARY_DESCRIPTOR}",
             options=options,
         )
 
@@ -22,21 +22,26 @@ class FileDialog:
             return Path(file)
 
     @staticmethod
-    def save_file() -> Path | None:
+    def save_file() -> tuple[Path, bool] | None:
+        """Path to save to and whether the binary format was picked"""
+
+
         options = QFileDialog.Option.DontUseNativeDialog
-        file, _ = QFileDialog.getSaveFileName(
+        file, selected = QFileDialog.getSaveFileName(
             None,
             "Save File As...",
             "",
-            c._DEFAULT_DESCRIPTOR,
+            f"{c._DEFAULT_DESCRIPTOR};;{c._BINARY_DESCRIPTOR}",
             options=options,
         )
 
         if file:
-            if not file.endswith(c._DEFAULT_FILE_EXT):
-                file += c._DEFAULT_FILE_EXT
+            # The filter picks the format, older JSON projects use .mgb too
+            binary = selected == c._BINARY_DESCRIPTOR
+            if not file.endswith((c._DEFAULT_FILE_EXT, c._BINARY_FILE_EXT)):
+                file += c._BINARY_FILE_EXT if binary else c._DEFAULT_FILE_EXT
 
-            return Path(file)
+            return Path(file), binary
 
     @staticmethod
     def select_directory() -> Path | None:
@@ -60,3 +65,13 @@ class FileDialog:
 
             assert file is not None
             return Path(file)
+
+    @staticmethod
+    def open_images() -> list[Path]:
+        dialog = ImageFileDialog(
+            None, "Open Sprite Sheet Images...", "", "Image Files (*.png)"
+        )
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            return [Path(file) for file in dialog.get_files_selected()]
+
+        return []
@@ -32,10 +32,10 @@ class ImageFileDialog(QFileDialog):
         self._files_selected: list[str] | None = None
 
     def _on_file_selected(self, file: str):
-        self.file_selected = file
+        self._file_selected = file
 
     def _on_files_selected(self, files: list[str]):
-        self.files_selected = files
+        self._files_selected = files
 
     def show_preview(self, path: str):
         if os.path.isfile(path):
@@ -54,7 +54,7 @@ class ImageFileDialog(QFileDialog):
             self.preview_label.setText("Preview")
 
     def get_file_selected(self) -> str | None:
-        return self.file_selected
+        return self._file_selected
 
     def get_files_selected(self) -> list[str]:
-        return self.files_selected or []
+        return self._files_selected or []
@@ -1,6 +1,8 @@
 from pathlib import Path
 
 from megabone.qt import (
+    QCheckBox,
+    QColor,
     QDialog,
     QFormLayout,
     QFrame,
@@ -10,16 +12,19 @@ from megabone.qt import (
     QLabel,
     QLineEdit,
     QMessageBox,
+    QPainter,
     QPixmap,
     QPoint,
     QPushButton,
+    QRect,
     QRegularExpression,
     QRegularExpressionValidator,
     QSpinBox,
     Qt,
+    QTimer,
     QVBoxLayout,
 )
-from megabone.util.image import Image
+from megabone.util.image import Image, SliceMode
 from megabone.util.types import Point, Size
 from megabone.widget.button import AlphaColorPickerButton
 from megabone.widget.slider import RoundHandleSlider
@@ -27,19 +32,43 @@ from megabone.widget.viewer import ScrollImageViewer
 
 
 class SpriteSheetDialog(QDialog):
+    OVERLAY_DELAY_MS = 30
+    KEYING_DELAY_MS = 150
+
     def __init__(self, image_path: Path, parent=None):
         super().__init__(parent)
         self.setMinimumSize(800, 600)
         self.image_path = image_path
-        self.image = QImage(image_path.resolve().as_posix())
-
-        # Cache checker board image
-        self.checker = Image.checker_board(self.image.size(), 8)
+        # Picked colors are keyed out of a copy of the source image
+        self.source = QImage(image_path.resolve().as_posix()).convertToFormat(
+            QImage.Format.Format_ARGB32
+        )
+        self.image = self.source
 
         self.frame_size = Size(32, 32)  # Default size
         self.offset = Point(0, 0)
         self.spacing = Point(0, 0)
 
+        # Colors keyed out of the sheet, in pick order
+        self.backgrounds: list[QColor] = []
+
+        self.mode = SliceMode.GRID
+
+        # Auto detected frame bounds, found again after the image changes
+        self._sprite_rects: list[QRect] | None = None
+
+        # Coalesces spin box changes into one overlay repaint
+        self.overlay_timer = QTimer(self)
+        self.overlay_timer.setSingleShot(True)
+        self.overlay_timer.setInterval(self.OVERLAY_DELAY_MS)
+        self.overlay_timer.timeout.connect(self.update_overlay)
+
+        # Keys the sheet again once the tolerance stops changing
+        self.keying_timer = QTimer(self)
+        self.keying_timer.setSingleShot(True)
+        self.keying_timer.setInterval(self.KEYING_DELAY_MS)
+        self.keying_timer.timeout.connect(self.update_keying)
+
         self.setup_ui()
 
         self.update_display()
@@ -72,10 +101,24 @@ class SpriteSheetDialog(QDialog):
         self.alpha_btn.setToolTip("Pick background color as transparent")
         control_layout.addWidget(self.alpha_btn)
 
+        self.tolerance_spin = QSpinBox()
+        self.tolerance_spin.setRange(0, 255)
+        self.tolerance_spin.setToolTip("Maximum channel difference to a picked color")
+        self.tolerance_spin.valueChanged.connect(lambda: self.keying_timer.start())
+        control_layout.addWidget(QLabel("Tolerance:"))
+        control_layout.addWidget(self.tolerance_spin)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.setToolTip("Clear the picked background colors")
+        clear_btn.clicked.connect(self.clear_alpha_colors)
+        control_layout.addWidget(clear_btn)
+
         control_layout.addStretch()
         left_layout.addLayout(control_layout)
 
         self.img_viewer = ScrollImageViewer(self)
+        self.img_viewer.set_background(Image.checker_brush(8))
+        self.img_viewer.set_overlay(self.paint_overlay)
         self.img_viewer.clicked.connect(self.pick_alpha_color)
         self.img_viewer.zoomChanged.connect(
             lambda x: self.zoom_slider.setValue(int(x * 10))
@@ -99,6 +142,12 @@ class SpriteSheetDialog(QDialog):
         # Connect signals
         self.alpha_btn.clicked.connect(lambda clicked: self.pick_alpha())
 
+        # Slicing mode
+        self.auto_check = QCheckBox("Auto detect")
+        self.auto_check.setToolTip("Find the bounds of every sprite in the sheet")
+        self.auto_check.toggled.connect(self.update_mode)
+        right_layout.addWidget(self.auto_check)
+
         # Frame size input
         frame_size_group = QGroupBox("Size")
         size_layout = QFormLayout()
@@ -119,6 +168,7 @@ class SpriteSheetDialog(QDialog):
 
         frame_size_group.setLayout(size_layout)
         right_layout.addWidget(frame_size_group)
+        self.frame_size_group = frame_size_group
 
         # Offset input
         offset_group = QGroupBox("Offset")
@@ -138,6 +188,7 @@ class SpriteSheetDialog(QDialog):
 
         offset_group.setLayout(offset_layout)
         right_layout.addWidget(offset_group)
+        self.offset_group = offset_group
 
         # Spacing input
         spacing_group = QGroupBox("Spacing")
@@ -157,6 +208,7 @@ class SpriteSheetDialog(QDialog):
 
         spacing_group.setLayout(spacing_layout)
         right_layout.addWidget(spacing_group)
+        self.spacing_group = spacing_group
 
         # Base name input
         name_group = QGroupBox("Name")
@@ -196,35 +248,97 @@ class SpriteSheetDialog(QDialog):
 
     def pick_alpha_color(self, pos: QPoint):
         self.img_viewer.toggle_click()
-        color = self.image.pixelColor(pos.x(), pos.y())
+
+        # Sample the source, the shown pixel may already be keyed out
+        color = self.source.pixelColor(pos.x(), pos.y())
         self.alpha_btn.set_color(color)
+        self.backgrounds.append(color)
+        self.update_keying()
+
+    def clear_alpha_colors(self):
+        self.backgrounds.clear()
+        self.update_keying()
+
+    @property
+    def tolerance(self) -> int:
+        return self.tolerance_spin.value()
+
+    def update_keying(self):
+        self.keying_timer.stop()
 
-        # Update the image
-        self.image = Image.remove_background(self.image, color)
+        if self.backgrounds:
+            self.image = self.source.copy()
+            Image.key_colors(self.image, self.backgrounds, self.tolerance)
+        else:
+            self.image = self.source
+
+        self._sprite_rects = None
         self.update_display()
 
+    def update_mode(self, auto: bool):
+        self.mode = SliceMode.AUTO if auto else SliceMode.GRID
+
+        # The grid parameters don't apply to detected frames
+        for group in (self.frame_size_group, self.offset_group, self.spacing_group):
+            group.setEnabled(not auto)
+
+        self.update_overlay()
+
+    def sprite_rects(self) -> list[QRect]:
+        if self._sprite_rects is None:
+            self._sprite_rects = Image.sprite_rects(self.image)
+        return self._sprite_rects
+
     def update_size(self):
         self.frame_size = Size(self.width_spin.value(), self.height_spin.value())
         self.offset = Point(self.offset_x_spin.value(), self.offset_y_spin.value())
         self.spacing = Point(self.spacing_x_spin.value(), self.spacing_y_spin.value())
-        self.update_display()
 
-    def update_display(self):
-        pixmap = QPixmap.fromImage(self.image)
-        grid = Image.grid(
-            pixmap.size(),
-            self.frame_size.w,
-            self.frame_size.h,
-            self.offset.x,
-            self.offset.y,
-            self.spacing.x,
-            self.spacing.y,
-        )
+        # Restarting the timer drops the repaints of intermediate values
+        self.overlay_timer.start()
 
-        result = Image.flatten([self.checker, pixmap, grid], pixmap.size())
-        self.img_viewer.setPixmap(result)
+    def update_overlay(self):
+        self.overlay_timer.stop()
+        self.img_viewer.update_overlay()
+
+    def update_display(self):
+        """Upload the image after keying, the overlay is painted on top"""
+
+        self.img_viewer.setPixmap(QPixmap.fromImage(self.image))
+
+    def paint_overlay(self, painter: QPainter, exposed: QRect):
+        """Frame outlines within the exposed part of the image"""
+
+        painter.setPen(Image.grid_pen())
+
+        match self.mode:
+            case SliceMode.AUTO:
+                rects = [
+                    rect for rect in self.sprite_rects() if rect.intersects(exposed)
+                ]
+            case SliceMode.GRID:
+                rects = Image.grid_rects(
+                    self.image.size(),
+                    self.frame_size.w,
+                    self.frame_size.h,
+                    self.offset.x,
+                    self.offset.y,
+                    self.spacing.x,
+                    self.spacing.y,
+                    within=exposed,
+                )
+
+        painter.drawRects(rects)
 
     def validate_extract(self):
+        # Extract from the sheet keyed with the latest tolerance
+        if self.keying_timer.isActive():
+            self.update_keying()
+
+        if self.mode == SliceMode.AUTO:
+            self.accept()
+            return
+
         width = self.width_spin.value()
         height = self.height_spin.value()
 
@@ -237,12 +351,3 @@ class SpriteSheetDialog(QDialog):
             return
 
         self.accept()
-
-    def get_sprites(self) -> list[QPixmap]:
-        return Image.extract_sprites(
-            self.image,
-            self.frame_size.w,
-            self.frame_size.h,
-            self.offset.x,
-            self.offset.y,
-        )
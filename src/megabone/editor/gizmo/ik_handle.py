@@ -1,6 +1,6 @@
 from megabone.editor.item import BoneItem
 from megabone.editor.layer import Layer, LayeredItemMixin
-from megabone.IKSolver import FABRIK
+from megabone.IKSolver import IKSolverFactory
 from megabone.qt import QColor, QGraphicsItem, QPen, QRectF, Qt
 
 from .pole_vector import PoleControl
@@ -34,7 +34,7 @@ class IKHandle(LayeredItemMixin, QGraphicsItem):
             bones.insert(0, current)
             current = current.parent_bone
 
-        self.chain = FABRIK(bones)
+        self.chain = IKSolverFactory.create(bones)
 
     def boundingRect(self):
         rect = QRectF()
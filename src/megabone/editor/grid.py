@@ -5,6 +5,7 @@ from megabone.qt import (
     QLineF,
     QPainter,
     QPen,
+    QPixmap,
     QPointF,
     QRect,
     QRectF,
@@ -24,20 +25,41 @@ class EditorGrid:
         self.view.drawForeground = self.drawForeground
         self.view.drawBackground = self.drawBackground
 
-    def drawBackground(self, painter: QPainter, rect: QRectF | QRect) -> None:
-        painter.setPen(QPen(Qt.PenStyle.NoPen))
+        # Checker tile brush and the (grid size, device pixel ratio) it was made for
+        self._checker: QBrush | None = None
+        self._checker_key: tuple[int, float] | None = None
+
+    def set_grid_size(self, size: int) -> None:
+        self.grid_size = size
+        self.view.resetCachedContent()
+        self.view.viewport().update()
+
+    def _checker_brush(self) -> QBrush:
+        """Texture brush with one 2x2 cell checker tile, made once per size and DPI"""
 
-        left = int(rect.left() - rect.left() % self.grid_size)
-        top = int(rect.top() - rect.top() % self.grid_size)
+        dpr = self.view.devicePixelRatioF()
+        key = (self.grid_size, dpr)
+        if self._checker is not None and key == self._checker_key:
+            return self._checker
 
-        for y in range(top, int(rect.bottom()), self.grid_size):
-            for x in range(left, int(rect.right()), self.grid_size):
-                is_dark = (x / self.grid_size + y / self.grid_size) % 2
+        size = self.grid_size
+        tile = QPixmap(round(2 * size * dpr), round(2 * size * dpr))
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(self.__darkColor)
 
-                color = self.__darkColor if is_dark else self.__lightColor
-                painter.fillRect(
-                    QRectF(x, y, self.grid_size, self.grid_size), QBrush(color)
-                )
+        painter = QPainter(tile)
+        painter.fillRect(0, 0, size, size, self.__lightColor)
+        painter.fillRect(size, size, size, size, self.__lightColor)
+        painter.end()
+
+        self._checker = QBrush(tile)
+        self._checker_key = key
+        return self._checker
+
+    def drawBackground(self, painter: QPainter, rect: QRectF | QRect) -> None:
+        # The brush origin stays at the scene origin so the tile is aligned
+        # to scene coordinates whatever part of the scene is exposed
+        painter.fillRect(rect, self._checker_brush())
 
         left = rect.left()
         right = rect.right()
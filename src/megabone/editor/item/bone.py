@@ -12,7 +12,6 @@ from megabone.qt import (
     QLinearGradient,
     QPainterPath,
     QPen,
-    QPointF,
     QRectF,
     Qt,
 )
@@ -37,7 +36,7 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
         start_point: Point | None = None,
         end_point: Point | None = None,
         id: str = "",
-        z_index: int = 0,
+        z_index: int = -1,
         is_ghost: bool = False,
     ):
         super().__init__(
@@ -47,8 +46,18 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
             model=document.bones,
             document=document,
         )
-        self.start_point = start_point or Point(0, 0)
-        self.end_point = end_point or Point(1, 1)
+        # Geometry and brushes rebuilt only when the bone shape changes
+        self._geometry_key: tuple | None = None
+        self._path = QPainterPath()
+        self._rect = QRectF()
+        self._style_key: tuple | None = None
+        self._style: tuple[QPen, QBrush, QBrush] | None = None
+
+        # Scratch direction reused by every path rebuild
+        self._direction = Point()
+
+        self._start_point = start_point or Point(0, 0)
+        self._end_point = end_point or Point(1, 1)
 
         self.is_hovered = False
         self.is_ghost = is_ghost
@@ -87,43 +96,101 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
         length = self.calculate_length()
         return length if length > 0 else 0.001
 
+    @property
+    def start_point(self) -> Point:
+        return self._start_point
+
+    @start_point.setter
+    def start_point(self, point: Point) -> None:
+        self.prepareGeometryChange()
+        self._start_point = point
+        self._geometry_key = None
+        self.notify_geometry_changed()
+
+    @property
+    def end_point(self) -> Point:
+        return self._end_point
+
+    @end_point.setter
+    def end_point(self, point: Point) -> None:
+        self.prepareGeometryChange()
+        self._end_point = point
+        self._geometry_key = None
+        self.notify_geometry_changed()
+
+    def _current_key(self) -> tuple:
+        # Everything the path and gradient are built from. The endpoint
+        # setters also clear the geometry key, the coordinates keep the style
+        # cache of one pose apart from the next
+        start, end = self._start_point, self._end_point
+        return (
+            start.x,
+            start.y,
+            end.x,
+            end.y,
+            self._bone_width_start,
+            self._bone_width_end,
+        )
+
+    def _ensure_geometry(self) -> tuple:
+        key = self._current_key()
+        if key != self._geometry_key:
+            self._path = self._build_path()
+            self._rect = self._path.boundingRect()
+            self._geometry_key = key
+        return key
+
     def boundingRect(self) -> QRectF:
-        return self.shape().boundingRect()
+        self._ensure_geometry()
+        return self._rect
 
     def shape(self) -> QPainterPath:
-        np = (self.end_point - self.start_point).normalized()
-        nx, ny = -np.y, np.x
+        self._ensure_geometry()
+        return self._path
+
+    def _build_path(self) -> QPainterPath:
+        start, end = self._start_point, self._end_point
+        direction = self._direction.set(end.x, end.y).isub(start).inormalize()
+        nx, ny = -direction.y, direction.x
 
         hw_start = self._bone_width_start / 2
         hw_end = self._bone_width_end / 2
 
-        start_left = QPointF(
-            self.start_point.x + nx * hw_start, self.start_point.y + ny * hw_start
-        )
-        start_right = QPointF(
-            self.start_point.x - nx * hw_start, self.start_point.y - ny * hw_start
-        )
-        end_left = QPointF(
-            self.end_point.x + nx * hw_end, self.end_point.y + ny * hw_end
-        )
-        end_right = QPointF(
-            self.end_point.x - nx * hw_end, self.end_point.y - ny * hw_end
-        )
-
         path = QPainterPath()
-        path.moveTo(start_left)
-        path.lineTo(end_left)
-        path.lineTo(end_right)
-        path.lineTo(start_right)
+        path.moveTo(start.x + nx * hw_start, start.y + ny * hw_start)
+        path.lineTo(end.x + nx * hw_end, end.y + ny * hw_end)
+        path.lineTo(end.x - nx * hw_end, end.y - ny * hw_end)
+        path.lineTo(start.x - nx * hw_start, start.y - ny * hw_start)
         path.closeSubpath()
         return path
 
+    def _bone_style(
+        self, key: tuple, base_color: QColor
+    ) -> tuple[QPen, QBrush, QBrush]:
+        style_key = (key, base_color.rgba())
+        if style_key != self._style_key or self._style is None:
+            gradient = QLinearGradient(
+                self._start_point.to_qpointf(), self._end_point.to_qpointf()
+            )
+            gradient.setColorAt(0, base_color.lighter(120))
+            gradient.setColorAt(1, base_color.darker(120))
+
+            self._style = (
+                QPen(base_color.darker(150), 1),
+                QBrush(gradient),
+                QBrush(base_color.darker(120)),
+            )
+            self._style_key = style_key
+        return self._style
+
     def paint(self, painter, option, widget=None) -> None:
+        key = self._ensure_geometry()
+
         if self.is_ghost:
             pen = QPen(self._ghost_color, 1, Qt.PenStyle.DashLine)
             painter.setPen(pen)
             painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawPath(self.shape())
+            painter.drawPath(self._path)
             return
 
         if self.isSelected():
@@ -133,19 +200,15 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
         else:
             base_color = self._primary_color
 
-        gradient = QLinearGradient(
-            self.start_point.to_qpointf(), self.end_point.to_qpointf()
-        )
-        gradient.setColorAt(0, base_color.lighter(120))
-        gradient.setColorAt(1, base_color.darker(120))
+        pen, fill, joint = self._bone_style(key, base_color)
 
-        painter.setPen(QPen(base_color.darker(150), 1))
-        painter.setBrush(QBrush(gradient))
-        painter.drawPath(self.shape())
+        painter.setPen(pen)
+        painter.setBrush(fill)
+        painter.drawPath(self._path)
 
         joint_radius = min(self._bone_width_start, self._bone_width_end) * 0.6
-        painter.setBrush(QBrush(base_color.darker(120)))
-        painter.drawEllipse(self.start_point.to_qpointf(), joint_radius, joint_radius)
+        painter.setBrush(joint)
+        painter.drawEllipse(self._start_point.to_qpointf(), joint_radius, joint_radius)
 
     def hoverEnterEvent(self, event) -> None:
         self.is_hovered = True
@@ -195,11 +258,31 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
                 sprite.apply_bone_transform(self, att)
 
     def update_children(self) -> None:
-        """Propagate end point to all child start points recursively"""
+        """Propagate end point to all child start points"""
+        BoneItem.propagate([self])
+
+    @staticmethod
+    def propagate(bones: list["BoneItem"]) -> None:
+        """Update the children of several moved bones in one skeleton pass"""
+        skeleton = getattr(bones[0].scene(), "skeleton", None) if bones else None
+
+        pending = [
+            bone
+            for bone in bones
+            if skeleton is None or not skeleton.mark_dirty(bone)
+        ]
+        if skeleton is not None:
+            skeleton.evaluate()
+
+        # Bones outside a scene skeleton (e.g. ghosts) walk their children
+        for bone in pending:
+            bone._update_children_recursive()
+
+    def _update_children_recursive(self) -> None:
         for child in self.child_bones:
             child.start_point = self.end_point
             child.update()
-            child.update_children()
+            child._update_children_recursive()
 
     def create_data_for_model(self) -> BoneData:
         return BoneData(
@@ -215,9 +298,7 @@ class BoneItem(LayeredItemMixin, ModelBoundItem):
 
         self.start_point = data.start_point
         self.end_point = data.end_point
-        self.z_index = data.z_index
 
-        self.prepareGeometryChange()
         self.update()
 
     def request_delete(self) -> None:
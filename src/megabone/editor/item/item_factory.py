@@ -16,6 +16,21 @@ class ItemFactory:
 
         return decorator
 
+    @classmethod
+    def creates_items_for(cls, data_type: type) -> bool:
+        """True if records of data_type are shown as scene items"""
+        return data_type in cls._registry
+
+    @classmethod
+    def create_item(cls, document: Document, data: Serializable) -> QGraphicsItem | None:
+        """Create the scene item bound to a single model record"""
+
+        item_cls = cls._registry.get(data.__class__)
+        if item_cls is None:
+            return None
+
+        return item_cls(document=document, id=data.id)
+
     @classmethod
     def create_items(cls, document: Document):
         created: dict[str, tuple[Serializable, object]] = {}
@@ -30,6 +30,10 @@ class ModelBoundItem(QGraphicsItem):
         self._model = model
         self._document = document
 
+    @property
+    def model(self) -> BaseCollectionModel:
+        return self._model
+
     def push_command(self, command) -> None:
         """Push an undoable command to the document stack"""
 
@@ -1,3 +1,6 @@
+from dataclasses import replace
+
+from megabone.command.document import MacroCommand
 from megabone.command.sprite import MoveSpriteCommand
 from megabone.editor.layer import Layer, LayeredItemMixin
 from megabone.manager.resource import ResourceManager
@@ -16,7 +19,6 @@ class SpriteItem(LayeredItemMixin, ModelBoundItem):
     def __init__(self, document: Document, id: str = ""):
         super().__init__(
             layer=Layer.SPRITE,
-            z_index=0,
             id=id,
             model=document.sprites,
             document=document,
@@ -26,6 +28,7 @@ class SpriteItem(LayeredItemMixin, ModelBoundItem):
         self.setAcceptHoverEvents(True)
 
         self._sprite_sheet_path = ""
+        self._frame_index = -1
         self._pixmap: QPixmap = self._placeholder_pixmap()
 
     def boundingRect(self) -> QRectF:
@@ -47,6 +50,24 @@ class SpriteItem(LayeredItemMixin, ModelBoundItem):
     def mouseReleaseEvent(self, event) -> None:
         super().mouseReleaseEvent(event)
 
+        # Qt moves every selected sprite but only the grabber gets the release
+        sprites = [self]
+        if scene := self.scene():
+            sprites += [
+                item
+                for item in scene.selectedItems()
+                if isinstance(item, SpriteItem) and item is not self
+            ]
+
+        commands = [cmd for sprite in sprites if (cmd := sprite._move_command())]
+        if len(commands) == 1:
+            self.push_command(commands[0])
+        elif commands:
+            self.push_command(
+                MacroCommand(self._document, f"Move {len(commands)} Sprites", commands)
+            )
+
+    def _move_command(self) -> MoveSpriteCommand | None:
         snapshot = self.current_data_from_model()
         assert isinstance(snapshot, SpriteData)
 
@@ -55,41 +76,39 @@ class SpriteItem(LayeredItemMixin, ModelBoundItem):
         current = self.create_data_for_model()
         new_pos = current.position
 
-        if old_pos != new_pos:
-            self.push_command(
-                MoveSpriteCommand(
-                    self._document,
-                    self.id,
-                    old_pos,
-                    new_pos,
-                )
-            )
+        if old_pos == new_pos:
+            return None
+
+        return MoveSpriteCommand(self._document, self.id, old_pos, new_pos)
 
     def apply_data_from_model(self, data: Serializable) -> None:
         assert isinstance(data, SpriteData)
 
-        if data.path != self._sprite_sheet_path:
+        if (data.path, data.frame_index) != (
+            self._sprite_sheet_path,
+            self._frame_index,
+        ):
             self._load_pixmap(data.path, data.frame_index)
             self._sprite_sheet_path = data.path
+            self._frame_index = data.frame_index
 
         self.setPos(data.position.to_qpointf())
         self.setRotation(data.rotation)
         self.prepareGeometryChange()
 
     def create_data_for_model(self) -> SpriteData:
-        from copy import copy
-
-        # Shallow copy, get a new reference to the model data object
-        data = copy(self.current_data_from_model())
+        data = self.current_data_from_model()
 
+        # New record, the stored one is never mutated
         assert isinstance(data, SpriteData)
-        data.position = Point.from_qpointf(self.pos())
-        data.rotation = self.rotation()
-        return data
+        return replace(
+            data, position=Point.from_qpointf(self.pos()), rotation=self.rotation()
+        )
 
     def set_pixmap(self, pixmap: QPixmap) -> None:
         self.prepareGeometryChange()
         self._pixmap = pixmap
+        self.notify_geometry_changed()
         self.update()
 
     def _load_pixmap(self, path: str, frame_index: int) -> None:
@@ -106,6 +125,7 @@ class SpriteItem(LayeredItemMixin, ModelBoundItem):
             self._pixmap = pixmap if not pixmap.isNull() else self._placeholder_pixmap()
 
         self.prepareGeometryChange()
+        self.notify_geometry_changed()
         self.update()
 
     @staticmethod
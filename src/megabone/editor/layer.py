@@ -1,6 +1,18 @@
+from bisect import bisect_left
 from enum import Enum, auto
+from typing import Callable
 
-from megabone.qt import QGraphicsItem, QGraphicsScene, QKeySequence, QShortcut, Qt
+from megabone.qt import (
+    QGraphicsItem,
+    QGraphicsScene,
+    QKeySequence,
+    QPointF,
+    QRectF,
+    QShortcut,
+    Qt,
+)
+
+from .spatial_index import SpatialIndex
 
 
 class Layer(Enum):
@@ -12,15 +24,36 @@ class Layer(Enum):
 
 
 class LayeredItemMixin:
-    _items_per_layer = 100_000
+    # Range of z keys per layer, the layers stay below the modal overlay
+    _items_per_layer = 1 << 24
 
-    def __init__(self, *args, layer: Layer, z_index: int = 0, **kwargs) -> None:
+    def __init__(self, *args, layer: Layer, z_index: int = -1, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.layer = layer
+
+        # Negative until the item is placed in its layer
         self.z_index = z_index
 
+        # Report moves so the layer spatial index can follow them
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+
+    def itemChange(self, change, value):
+        if change in (
+            QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged,
+            QGraphicsItem.GraphicsItemChange.ItemTransformHasChanged,
+            QGraphicsItem.GraphicsItemChange.ItemRotationHasChanged,
+            QGraphicsItem.GraphicsItemChange.ItemScaleHasChanged,
+        ):
+            self.notify_geometry_changed()
+        return super().itemChange(change, value)
+
+    def notify_geometry_changed(self) -> None:
+        """Flag the item for reindexing after its scene bounds changed"""
+        if manager := getattr(self.scene(), "layer_manager", None):
+            manager.mark_moved(self)
+
     def update_z_value(self, z_index: int) -> None:
-        """Set actual z-index after layer sorting"""
+        """Set actual z-index after the layer order changed"""
         self.z_index = z_index
         self.setZValue(self.calculate_value())
 
@@ -31,54 +64,227 @@ class LayeredItemMixin:
         return f"Layer item(z-index={self.z_index}, layer={self.layer})"
 
 
+class LayerOrder:
+    """Items of one layer sorted by sparse z keys.
+
+    Keys are spaced by STEP so an item can be inserted between two others by
+    taking a key from the gap. Only when a gap is exhausted is the whole
+    layer renumbered, and reordering swaps the keys of two neighbours.
+    Negative keys mean unset, 0 is a valid key.
+    """
+
+    STEP = 1 << 8
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.keys: list[int] = []
+        self.items: list[LayeredItemMixin] = []
+
+        # Items given a key since the last take_changed
+        self.changed: list[LayeredItemMixin] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def next_key(self) -> int:
+        """Key an item appended on top of the layer would get"""
+        return self.keys[-1] + self.STEP if self.keys else self.STEP
+
+    def index_of(self, item: LayeredItemMixin) -> int:
+        i = bisect_left(self.keys, item.z_index)
+        assert i < len(self.items) and self.items[i] is item, "Item not in layer"
+        return i
+
+    def insert(self, item: LayeredItemMixin, key: int | None = None) -> int:
+        """Place an item at key, on top if it has none, and return its key"""
+
+        keys = self.keys
+        if key is None or key < 0:
+            i = len(keys)
+        else:
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                # Key taken, go right above its owner
+                i, key = i + 1, None
+
+        low = keys[i - 1] if i else -1
+        high = keys[i] if i < len(keys) else self.capacity
+        if key is None or not low < key < high:
+            base = max(low, 0)
+            key = base + self.STEP if high - base > self.STEP else (base + high) // 2
+
+        keys.insert(i, key)
+        self.items.insert(i, item)
+        self.changed.append(item)
+
+        if low < key < high:
+            item.update_z_value(key)
+        else:
+            self._renumber()
+
+        return item.z_index
+
+    def remove(self, item: LayeredItemMixin) -> None:
+        i = self.index_of(item)
+        del self.keys[i]
+        del self.items[i]
+
+    def move(self, item: LayeredItemMixin, offset: int) -> bool:
+        """Swap an item with the neighbour offset positions above or below it"""
+
+        i = self.index_of(item)
+        j = i + offset
+        if not 0 <= j < len(self.items):
+            return False
+
+        items = self.items
+        items[i], items[j] = items[j], items[i]
+        self._assign(items[i], self.keys[i])
+        self._assign(items[j], self.keys[j])
+        return True
+
+    def clear(self) -> None:
+        self.keys.clear()
+        self.items.clear()
+        self.changed.clear()
+
+    def take_changed(self) -> list[LayeredItemMixin]:
+        changed, self.changed = self.changed, []
+        return changed
+
+    def _assign(self, item: LayeredItemMixin, key: int) -> None:
+        if item.z_index != key:
+            item.update_z_value(key)
+            self.changed.append(item)
+
+    def _renumber(self) -> None:
+        step = max(1, min(self.STEP, self.capacity // (len(self.items) + 1)))
+        self.keys = [(i + 1) * step for i in range(len(self.items))]
+        for key, item in zip(self.keys, self.items):
+            self._assign(item, key)
+
+
+KeysChanged = Callable[[list[LayeredItemMixin], bool], None]
+"""Items given new z keys, and whether the change should be undoable"""
+
+
 class LayerManager:
+    # Sprites rarely change between repaints so they are cached in device
+    # pixels, bones are redrawn while animating and would only churn a cache
+    _default_cache_modes = {
+        Layer.SPRITE: QGraphicsItem.CacheMode.DeviceCoordinateCache,
+        Layer.BONE: QGraphicsItem.CacheMode.NoCache,
+        Layer.GIZMO: QGraphicsItem.CacheMode.NoCache,
+    }
+
     def __init__(self, scene: QGraphicsScene) -> None:
         self.scene = scene
-        self.items: list[LayeredItemMixin] = []
+        self.layers = {
+            layer: LayerOrder(LayeredItemMixin._items_per_layer) for layer in Layer
+        }
+        self.cache_modes = dict(self._default_cache_modes)
+        self.indexes = {layer: SpatialIndex() for layer in Layer}
+
+        # Told about new keys so the scene can store them in the model
+        self.keys_changed: KeysChanged | None = None
+
         self._setup_shortcuts()
 
-    def get_next_index(self) -> int:
-        if len(self.items) > 0:
-            return self.items[len(self.items) - 1].z_index + 1
-        return 0
+    @property
+    def items(self) -> list[LayeredItemMixin]:
+        return [item for order in self.layers.values() for item in order.items]
+
+    def get_next_index(self, layer: Layer = Layer.SPRITE) -> int:
+        """z index that puts a new item on top of a layer"""
+        return self.layers[layer].next_key()
 
     def clear(self) -> None:
-        self.items.clear()
+        for order in self.layers.values():
+            order.clear()
+        for index in self.indexes.values():
+            index.clear()
 
-    def add_item(self, item: QGraphicsItem) -> int:
-        assert isinstance(item, LayeredItemMixin)
-        self.items.append(item)
+    def add_item(self, item: QGraphicsItem, z_index: int | None = None) -> int:
+        """Insert an item at z_index in its layer, on top if it has none"""
 
-        if item.z_index == 0:
-            item.update_z_value(len(self.items))
-        self.sort_layer(item.layer)
+        assert isinstance(item, LayeredItemMixin)
+        item.setCacheMode(self.cache_modes[item.layer])
+        self.indexes[item.layer].insert(item)
 
-        return item.z_index
+        key = self.layers[item.layer].insert(
+            item, item.z_index if z_index is None else z_index
+        )
+        self._report_changes(item.layer, undoable=False)
+        return key
 
     def remove_item(self, item: QGraphicsItem) -> None:
         assert isinstance(item, LayeredItemMixin)
-        self.items.remove(item)
-        self.sort_layer(item.layer)
+        self.layers[item.layer].remove(item)
+        self.indexes[item.layer].remove(item)
+
+    def restack(self, keys: dict[LayeredItemMixin, int]) -> None:
+        """Move items to new keys, e.g. the stored ones after an undo"""
+
+        # Take every item out first so keys swapped between them don't collide
+        for item in keys:
+            self.layers[item.layer].remove(item)
+
+        for item, key in sorted(keys.items(), key=lambda entry: entry[1]):
+            self.layers[item.layer].insert(item, key)
+
+        for layer in {item.layer for item in keys}:
+            self._report_changes(layer, undoable=False)
 
-    def sort_layer(self, layer: Layer) -> None:
-        layer_items = [item for item in self.items if item.layer == layer]
-        layer_items.sort(key=lambda x: x.z_index)
-        for i, item in enumerate(layer_items):
-            item.update_z_value(i)
+    def _report_changes(self, layer: Layer, undoable: bool) -> None:
+        changed = self.layers[layer].take_changed()
+        if changed and self.keys_changed is not None:
+            self.keys_changed(changed, undoable)
+
+    def mark_moved(self, item: LayeredItemMixin) -> None:
+        self.indexes[item.layer].mark_dirty(item)
+
+    def item_at(
+        self, pos: QPointF, layers: tuple[Layer, ...] | None = None
+    ) -> QGraphicsItem | None:
+        """Topmost visible item under pos, searching upper layers first"""
+
+        for layer in sorted(layers or Layer, key=lambda x: x.value, reverse=True):
+            hits = [
+                item
+                for item in self.indexes[layer].query_point(pos)
+                if item.isVisible()
+            ]
+            if hits:
+                return max(hits, key=lambda item: item.zValue())
+
+        return None
+
+    def items_in_rect(
+        self, rect: QRectF, layers: tuple[Layer, ...] | None = None
+    ) -> list[QGraphicsItem]:
+        """Visible items whose bounds intersect rect"""
+
+        return [
+            item
+            for layer in layers or Layer
+            for item in self.indexes[layer].query_rect(rect)
+            if item.isVisible()
+        ]
 
     def set_layer_visibility(self, layer: Layer, visible: bool) -> None:
-        for item in self.items:
-            if item.layer == layer:
-                assert isinstance(item, QGraphicsItem)
-                item.setVisible(visible)
+        for item in self.indexes[layer]:
+            item.setVisible(visible)
 
     def set_layer_selectability(self, layer: Layer, selectable: bool) -> None:
-        for item in self.items:
-            if item.layer == layer:
-                assert isinstance(item, QGraphicsItem)
-                item.setFlag(
-                    QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, selectable
-                )
+        for item in self.indexes[layer]:
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, selectable)
+
+    def set_layer_cache_mode(
+        self, layer: Layer, mode: QGraphicsItem.CacheMode
+    ) -> None:
+        self.cache_modes[layer] = mode
+        for item in self.indexes[layer]:
+            item.setCacheMode(mode)
 
     def _setup_shortcuts(self) -> None:
         self.item_up = QShortcut(QKeySequence(Qt.Key.Key_R), self.scene)
@@ -94,33 +300,17 @@ class LayerManager:
 
         return None
 
-    def _get_layer_items(self, layer: Layer) -> list[LayeredItemMixin]:
-        items = [item for item in self.items if item.layer == layer]
-        items.sort(key=lambda x: x.z_index)
-        return items
-
     def _increase_z_index(self) -> None:
-        if item := self._get_item():
-            assert isinstance(item, LayeredItemMixin)
-            if item.layer != Layer.SPRITE:
-                return
-
-            items = self._get_layer_items(item.layer)
-            index = items.index(item)
-            if index < len(items) - 1:
-                items[index], items[index + 1] = items[index + 1], items[index]
-                for i, item in enumerate(items):
-                    item.update_z_value(i)
+        self._move_selected(1)
 
     def _decrease_z_index(self) -> None:
+        self._move_selected(-1)
+
+    def _move_selected(self, offset: int) -> None:
         if item := self._get_item():
             assert isinstance(item, LayeredItemMixin)
             if item.layer != Layer.SPRITE:
                 return
 
-            items = self._get_layer_items(item.layer)
-            index = items.index(item)
-            if index > 0:
-                items[index], items[index - 1] = items[index - 1], items[index]
-                for i, item in enumerate(items):
-                    item.update_z_value(i)
+            if self.layers[item.layer].move(item, offset):
+                self._report_changes(item.layer, undoable=True)
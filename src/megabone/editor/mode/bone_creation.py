@@ -1,5 +1,6 @@
 from megabone.command.bone import CreateBoneCommand
 from megabone.editor.item import BoneItem
+from megabone.editor.layer import Layer
 from megabone.model.bone import BoneData
 from megabone.qt import QPointF, Qt
 from megabone.util.types import Point
@@ -45,7 +46,7 @@ class CreateBoneMode(AbstractEditorMode):
         parent_bone = None
 
         if modifiers & Qt.KeyboardModifier.ShiftModifier:
-            hit = self.scene.itemAt(scene_pos, self.view.transform())
+            hit = self.scene.layer_manager.item_at(scene_pos, (Layer.BONE,))
             if isinstance(hit, BoneItem):
                 parent_bone = hit
                 parent_bone.setSelected(False)
@@ -68,7 +69,7 @@ class CreateBoneMode(AbstractEditorMode):
         parent_id = self._ghost.parent_bone.id if self._ghost.parent_bone else ""
 
         # Remove ghost before pushing command
-        self.scene.removeItem(self._ghost)
+        self.scene.remove_item(self._ghost)
         self._ghost = None
         self._start_point = None
 
@@ -1,7 +1,8 @@
 import math
 
 from megabone.editor.item import BoneItem
-from megabone.IKSolver import FABRIK
+from megabone.editor.layer import Layer
+from megabone.IKSolver import BatchFABRIK, IKSolverFactory, NumpyFABRIK
 from megabone.qt import QGraphicsEllipseItem, QPen, Qt
 
 from .abstract_mode import AbstractEditorMode
@@ -13,6 +14,7 @@ class IKMode(AbstractEditorMode):
     def __init__(self, controller):
         super().__init__(controller)
         self.ik_chain = None
+        self.ik_batch: BatchFABRIK | None = None
         self.target_indicator = None
         self.dragging = False
 
@@ -32,7 +34,7 @@ class IKMode(AbstractEditorMode):
 
     def mousePressEvent(self, event, scene_pos):
         if event.button() == Qt.MouseButton.LeftButton:
-            item = self.scene.itemAt(scene_pos, self.view.transform())
+            item = self.scene.layer_manager.item_at(scene_pos, (Layer.BONE,))
             if isinstance(item, BoneItem):
                 bones = []
                 current_bone = item
@@ -49,7 +51,9 @@ class IKMode(AbstractEditorMode):
                         break
                     current_bone = current_bone.parent_bone
 
-                self.ik_chain = FABRIK(bones)
+                self.ik_chain = IKSolverFactory.create(bones)
+                if isinstance(self.ik_chain, NumpyFABRIK):
+                    self.ik_batch = BatchFABRIK([self.ik_chain])
                 self.target_indicator.setPos(scene_pos)
                 self.target_indicator.show()
                 self.dragging = True
@@ -57,7 +61,10 @@ class IKMode(AbstractEditorMode):
     def mouseMoveEvent(self, event, scene_pos):
         if self.dragging and self.ik_chain:
             self.target_indicator.setPos(scene_pos)
-            self.ik_chain.solve(scene_pos)
+            if self.ik_batch:
+                self.ik_batch.solve([scene_pos])
+            else:
+                self.ik_chain.solve(scene_pos)
 
             for bone in self.ik_chain.bones:
                 for sprite in bone.connected_sprites:
@@ -72,4 +79,5 @@ class IKMode(AbstractEditorMode):
         if event.button() == Qt.MouseButton.LeftButton:
             self.dragging = False
             self.ik_chain = None
+            self.ik_batch = None
             self.target_indicator.hide()
@@ -1,5 +1,6 @@
 from megabone.editor.gizmo import IKHandle
 from megabone.editor.item import BoneItem
+from megabone.editor.layer import Layer
 from megabone.qt import Qt
 
 from .abstract_mode import AbstractEditorMode
@@ -18,7 +19,7 @@ class IKHandleMode(AbstractEditorMode):
 
     def mousePressEvent(self, event, scene_pos):
         if event.button() == Qt.MouseButton.LeftButton:
-            item = self.scene.itemAt(scene_pos, self.view.transform())
+            item = self.scene.layer_manager.item_at(scene_pos, (Layer.BONE,))
 
             if isinstance(item, BoneItem):
                 if not self.creating_handle:
@@ -1,5 +1,11 @@
-from megabone.editor.item import BoneItem, SpriteItem
-from megabone.qt import QGraphicsView, Qt
+from megabone.qt import (
+    QGraphicsItem,
+    QGraphicsView,
+    QPainterPath,
+    QRectF,
+    QRubberBand,
+    Qt,
+)
 
 from .abstract_mode import AbstractEditorMode
 from .editor_mode_register import EditorModeRegistry
@@ -12,24 +18,74 @@ class SelectionMode(AbstractEditorMode):
         self.dragging = False
         self.last_pos = None
 
+        # Rubber band selection, resolved through the layer spatial indexes
+        self._band: QRubberBand | None = None
+        self._band_origin = None
+        self._band_base: set[QGraphicsItem] = set()
+        self._band_hits: set[QGraphicsItem] = set()
+
     def activate(self):
-        self.view.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
+        # QGraphicsView rubber band selection can't use the layer indexes
+        self.view.setDragMode(QGraphicsView.DragMode.NoDrag)
         self.view.setCursor(Qt.CursorShape.ArrowCursor)
 
+    def deactivate(self):
+        self._end_band()
+        self.view.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
+
     def mousePressEvent(self, event, scene_pos):
-        pass
-        # if event.button() == Qt.MouseButton.LeftButton:
-        #     item = self.scene.itemAt(scene_pos, self.view.transform())
-        #     if item:
-        #         if isinstance(item, BoneItem):
-        #             self.view.selectBone(item)
-        #         elif isinstance(item, SpriteItem):
-        #             self.view.selectSprite(item)
-        #     else:
-        #         self.view.clearSelection()
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+
+        # Clicks on items are handled by the scene
+        if self.scene.layer_manager.item_at(scene_pos) is not None:
+            return
+
+        self._band_origin = scene_pos
+        self._band_hits = set()
+        self._band_base = (
+            set(self.scene.selectedItems())
+            if event.modifiers() & Qt.KeyboardModifier.ControlModifier
+            else set()
+        )
+
+        self._band = QRubberBand(QRubberBand.Shape.Rectangle, self.view.viewport())
+        self._band.show()
 
     def mouseMoveEvent(self, event, scene_pos):
-        pass
+        if self._band is None:
+            return
+
+        rect = QRectF(self._band_origin, scene_pos).normalized()
+        self._band.setGeometry(self.view.mapFromScene(rect).boundingRect())
+
+        path = QPainterPath()
+        path.addRect(rect)
+
+        hits = {
+            item
+            for item in self.scene.layer_manager.items_in_rect(rect)
+            if item.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable
+            and item.collidesWithPath(item.mapFromScene(path))
+        }
+
+        # Only items entering or leaving the band change state
+        for item in self._band_hits - hits - self._band_base:
+            item.setSelected(False)
+        for item in hits - self._band_hits:
+            item.setSelected(True)
+
+        self._band_hits = hits
 
     def mouseReleaseEvent(self, event, scene_pos):
-        pass
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._end_band()
+
+    def _end_band(self) -> None:
+        if self._band is not None:
+            self._band.hide()
+            self._band.deleteLater()
+
+        self._band = None
+        self._band_base.clear()
+        self._band_hits.clear()
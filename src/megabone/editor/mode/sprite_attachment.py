@@ -1,9 +1,10 @@
 import math
 
 from megabone.editor.item import BoneItem, SpriteItem
+from megabone.editor.layer import Layer
 from megabone.model.attachment import AttachmentData
 from megabone.model.collection import UpdateSource
-from megabone.qt import QGraphicsItem, QGraphicsView, Qt
+from megabone.qt import QGraphicsView, Qt
 
 from .abstract_mode import AbstractEditorMode
 from .editor_mode_register import EditorModeRegistry
@@ -28,17 +29,17 @@ class SpriteAttachMode(AbstractEditorMode):
         self.view.setCursor(Qt.CursorShape.PointingHandCursor)
 
         # Lock bone items
-        for item in self.scene.items():
-            if isinstance(item, BoneItem):
-                item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
-            elif isinstance(item, SpriteItem):
-                item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        self.scene.layer_manager.set_layer_selectability(Layer.BONE, False)
+        self.scene.layer_manager.set_layer_selectability(Layer.SPRITE, True)
+
+    def deactivate(self):
+        self.scene.layer_manager.set_layer_selectability(Layer.BONE, True)
 
     def mousePressEvent(self, event, scene_pos):
         if event.button() != Qt.MouseButton.LeftButton:
             return
 
-        item = self.scene.itemAt(scene_pos, self.view.transform())
+        item = self.scene.layer_manager.item_at(scene_pos, (Layer.SPRITE,))
         if isinstance(item, SpriteItem) and self._target_bone:
             self._attach(item)
             self.controller.set_edit_mode(SelectionMode)
@@ -0,0 +1,126 @@
+from collections.abc import Iterable, Mapping
+
+from megabone.editor.item import BoneItem
+from megabone.model.bone import BoneData
+from megabone.model.document import Document
+
+
+class SkeletonEvaluator:
+    """Evaluate the bone hierarchy of a scene in dependency order.
+
+    Bones are kept in a flat list sorted so that every parent comes before
+    its children, built from BoneData.parent_id. Moved bones are marked dirty
+    and a single linear pass then snaps the start point of their children to
+    the parent end point, touching every bone at most once per evaluation.
+    """
+
+    def __init__(self, document: Document, items: Mapping[str, object]):
+        self._document = document
+        self._items = items
+
+        # Rebuilt lazily after structural changes
+        self._order: list[BoneItem] | None = None
+        self._parents: list[int] = []
+        self._position: dict[str, int] = {}
+
+        self._dirty = bytearray()
+        self._first_dirty = 0
+        self._has_dirty = False
+
+        # Bones recomputed by the last evaluation, for profiling
+        self.recomputed = 0
+
+    def invalidate(self) -> None:
+        """Drop the evaluation order after bones were added, removed or reparented"""
+        self._order = None
+
+    def __contains__(self, bone: BoneItem) -> bool:
+        self._ensure_order()
+        position = self._position.get(bone.id)
+        return position is not None and self._order[position] is bone
+
+    def mark_dirty(self, bone: BoneItem) -> bool:
+        """Flag a bone whose end point moved, False if it is not in the skeleton"""
+
+        if bone not in self:
+            return False
+
+        position = self._position[bone.id]
+        self._dirty[position] = 1
+
+        if not self._has_dirty or position < self._first_dirty:
+            self._first_dirty = position
+        self._has_dirty = True
+        return True
+
+    def evaluate(self) -> int:
+        """Propagate dirty bones to their children and return the bones updated"""
+
+        self.recomputed = 0
+        self._ensure_order()
+        if not self._has_dirty:
+            return 0
+
+        order, parents, dirty = self._order, self._parents, self._dirty
+        assert order is not None
+
+        for i in range(self._first_dirty, len(order)):
+            parent = parents[i]
+            if parent < 0 or not dirty[parent]:
+                continue
+
+            child = order[i]
+            child.start_point = order[parent].end_point
+            child.update()
+            self.recomputed += 1
+
+        # Children only inherit a start point so dirtiness never goes deeper
+        self._dirty[:] = bytes(len(dirty))
+        self._has_dirty = False
+        return self.recomputed
+
+    def _ensure_order(self) -> None:
+        if self._order is not None:
+            return
+
+        bones: dict[str, BoneItem] = {}
+        parent_ids: dict[str, str] = {}
+        for data in self._document.bones.get_items():
+            item = self._items.get(data.id)
+            if isinstance(data, BoneData) and isinstance(item, BoneItem):
+                bones[data.id] = item
+                parent_ids[data.id] = data.parent_id
+
+        children: dict[str, list[str]] = {}
+        roots: list[str] = []
+        for bone_id, parent_id in parent_ids.items():
+            if parent_id in bones and parent_id != bone_id:
+                children.setdefault(parent_id, []).append(bone_id)
+            else:
+                roots.append(bone_id)
+
+        # Breadth first from the roots keeps parents ahead of their children
+        order = self._visit(roots, children)
+
+        self._order = [bones[bone_id] for bone_id in order]
+        self._position = {bone_id: i for i, bone_id in enumerate(order)}
+        self._parents = [
+            self._position.get(parent_ids[bone_id], -1) for bone_id in order
+        ]
+        self._dirty = bytearray(len(order))
+        self._has_dirty = False
+
+    @staticmethod
+    def _visit(roots: Iterable[str], children: dict[str, list[str]]) -> list[str]:
+        order = list(roots)
+        visited = set(order)
+
+        i = 0
+        while i < len(order):
+            for child in children.get(order[i], ()):
+                if child not in visited:
+                    visited.add(child)
+                    order.append(child)
+            i += 1
+
+        return order
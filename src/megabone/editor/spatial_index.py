@@ -0,0 +1,106 @@
+import math
+from collections.abc import Iterator
+
+from megabone.qt import QGraphicsItem, QPointF, QRectF
+
+
+class SpatialIndex:
+    """Uniform grid over the scene bounding rects of a set of items.
+
+    Moved items are only flagged and put back in their cells on the next
+    query, so items animated every frame cost a set insertion per change
+    instead of a tree update.
+    """
+
+    def __init__(self, cell_size: float = 128.0) -> None:
+        self.cell_size = cell_size
+
+        self._cells: dict[tuple[int, int], set[QGraphicsItem]] = {}
+        self._item_cells: dict[QGraphicsItem, list[tuple[int, int]]] = {}
+        self._dirty: set[QGraphicsItem] = set()
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item: QGraphicsItem) -> bool:
+        return item in self._item_cells
+
+    def __iter__(self) -> Iterator[QGraphicsItem]:
+        return iter(self._item_cells)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._item_cells.clear()
+        self._dirty.clear()
+
+    def insert(self, item: QGraphicsItem) -> None:
+        self._item_cells.setdefault(item, [])
+        self._dirty.add(item)
+
+    def remove(self, item: QGraphicsItem) -> None:
+        self._unlink(item)
+        self._item_cells.pop(item, None)
+        self._dirty.discard(item)
+
+    def mark_dirty(self, item: QGraphicsItem) -> None:
+        if item in self._item_cells:
+            self._dirty.add(item)
+
+    def query_rect(self, rect: QRectF) -> list[QGraphicsItem]:
+        """Items whose scene bounding rect intersects rect"""
+
+        self._reindex()
+
+        found: set[QGraphicsItem] = set()
+        for key in self._cover(rect):
+            found.update(self._cells.get(key, ()))
+
+        return [item for item in found if item.sceneBoundingRect().intersects(rect)]
+
+    def query_point(self, point: QPointF) -> list[QGraphicsItem]:
+        """Items whose shape contains point"""
+
+        self._reindex()
+
+        key = (
+            math.floor(point.x() / self.cell_size),
+            math.floor(point.y() / self.cell_size),
+        )
+        return [
+            item
+            for item in self._cells.get(key, ())
+            if item.contains(item.mapFromScene(point))
+        ]
+
+    def _cover(self, rect: QRectF) -> Iterator[tuple[int, int]]:
+        size = self.cell_size
+        left, right = math.floor(rect.left() / size), math.floor(rect.right() / size)
+        top, bottom = math.floor(rect.top() / size), math.floor(rect.bottom() / size)
+
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield x, y
+
+    def _unlink(self, item: QGraphicsItem) -> None:
+        for key in self._item_cells.get(item, ()):
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.discard(item)
+                if not cell:
+                    del self._cells[key]
+
+    def _reindex(self) -> None:
+        item_cells = self._item_cells
+        for item in self._dirty:
+            keys = list(self._cover(item.sceneBoundingRect()))
+
+            # Animated items mostly move within the cells they already cover
+            if keys == item_cells[item]:
+                continue
+
+            self._unlink(item)
+            for key in keys:
+                self._cells.setdefault(key, set()).add(item)
+            item_cells[item] = keys
+
+        self._dirty.clear()
@@ -2,8 +2,11 @@ import os
 import tempfile
 import time
 from pathlib import Path
+from typing import Callable
 
 from megabone.model.document import Document
+from megabone.model.journal import ChangeJournal
+from megabone.model.snapshot import DocumentSnapshot
 from megabone.qt import QObject, QTimer, Signal
 
 from .document import DocumentManager
@@ -15,6 +18,9 @@ class AutoSaveManager(QObject):
     _MINIMUM_INTERVAL_SECS = 30
     _SAVE_INTERVAL_SECS = 2 * 60 * 1000
 
+    # Journal entries after which the next autosave writes a full snapshot
+    _COMPACT_THRESHOLD = 2000
+
     autosaveCompleted = Signal(str)  # document id
     backupRecovered = Signal(str)  # document id
 
@@ -25,6 +31,9 @@ class AutoSaveManager(QObject):
         self._autosave_timer = QTimer(self)
         self._dirty_documents: set[str] = set()
         self._last_save_times: dict[str, float] = {}
+        self._journals: dict[str, ChangeJournal] = {}
+        self._modified_slots: dict[str, Callable[[], None]] = {}
+        self._snapshots: set[str] = set()
         self._backup_path = self._setup_backup_directory()
 
         # Configure timer
@@ -70,23 +79,71 @@ class AutoSaveManager(QObject):
                 self._save_backup(doc_id, document)
                 self._last_save_times[doc_id] = current_time
                 self._dirty_documents.discard(doc_id)
-                self.autosaveCompleted.emit(doc_id)
             except Exception as e:
-                self.document_manager.on_autosave_failed(doc_id, str(e))
+                self._on_backup_failed(doc_id, str(e))
 
     def _save_backup(self, doc_id: str, document: Document) -> None:
-        """Save a backup of the document"""
+        """Queue the changes since the last backup, or a full snapshot.
+
+        What is written is captured here, the writing itself happens on the
+        save thread of the document manager.
+        """
+
+        journal = self._journals.get(doc_id)
+        if (
+            journal is None
+            or doc_id not in self._snapshots
+            or journal.entries + len(journal) > self._COMPACT_THRESHOLD
+        ):
+            self._save_snapshot(doc_id, document)
+            return
 
+        entries = journal.take()
         backup_file = self._get_backup_path(doc_id)
+        journal_file = self._get_journal_path(doc_id)
+        self._submit(
+            doc_id, lambda: ChangeJournal.append(journal_file, entries, backup_file)
+        )
+
+    def _save_snapshot(self, doc_id: str, document: Document) -> None:
+        """Queue a write of the whole document that starts an empty journal"""
 
-        # Create the temp file first
-        temp_file = backup_file.with_suffix(".tmp")
-        document.save(temp_file)
+        snapshot = DocumentSnapshot.capture(document)
+        if doc_id in self._journals:
+            self._journals[doc_id].clear()
+        self._snapshots.add(doc_id)
 
-        # Atomic replacement of the backup file
-        if backup_file.exists():
-            backup_file.with_suffix(".bak").write_bytes(backup_file.read_bytes())
-        temp_file.replace(backup_file)
+        backup_file = self._get_backup_path(doc_id)
+        journal_file = self._get_journal_path(doc_id)
+
+        def write() -> None:
+            # Create the temp file first
+            temp_file = backup_file.with_suffix(".tmp")
+            snapshot.write(temp_file)
+
+            # Keep the previous snapshot and atomically replace the backup file
+            if backup_file.exists():
+                backup_file.replace(backup_file.with_suffix(".bak"))
+            temp_file.replace(backup_file)
+
+            # A journal left by a crash before this line names the previous
+            # snapshot, now the .bak file, and is only replayed onto that
+            journal_file.unlink(missing_ok=True)
+
+        self._submit(doc_id, write)
+
+    def _submit(self, doc_id: str, job: Callable[[], None]) -> None:
+        self.document_manager.save_queue.submit(
+            job,
+            lambda: self.autosaveCompleted.emit(doc_id),
+            lambda error: self._on_backup_failed(doc_id, error),
+        )
+
+    def _on_backup_failed(self, doc_id: str, error: str) -> None:
+        # The captured changes are gone from the journal, start over
+        self._snapshots.discard(doc_id)
+        self._dirty_documents.add(doc_id)
+        self.document_manager.on_autosave_failed(doc_id, error)
 
     def _get_backup_path(self, doc_id: str) -> Path:
         """Returns the backup file path for a document"""
@@ -94,47 +151,70 @@ class AutoSaveManager(QObject):
         safe_id = "".join(c if c.isalnum() else "_" for c in doc_id)
         return self._backup_path / f"{safe_id}.backup"
 
+    def _get_journal_path(self, doc_id: str) -> Path:
+        return self._get_backup_path(doc_id).with_suffix(".journal")
+
     def check_for_backups(self) -> list[str]:
         """Returns a list of document IDs with avalaible backups"""
 
         return [p.stem for p in self._backup_path.glob("*.backup")]
 
     def recover_backup(self, doc_id: str) -> Document | None:
-        """Attempts to recover a document from backup"""
+        """Attempts to recover a document from backup and its journal"""
 
         backup_file = self._get_backup_path(doc_id)
         if not backup_file.exists():
             return None
 
-        try:
-            document = Document.load(backup_file)
-            self.backupRecovered.emit(doc_id)
-            return document
-        except Exception:
-            # If main backup fails, try the .bak file
-            backup_file = backup_file.with_suffix(".bak")
-            if not backup_file.exists():
-                return None
+        # If main backup fails, try the .bak file
+        journal_file = self._get_journal_path(doc_id)
+        for snapshot in (backup_file, backup_file.with_suffix(".bak")):
+            if not snapshot.exists():
+                continue
 
             try:
-                document = Document.load(backup_file)
-                self.backupRecovered.emit(doc_id)
-                return document
+                document = Document.load(snapshot)
             except Exception:
-                return None
+                continue
 
-    def _on_document_added(self, doc_id: str) -> None:
+            try:
+                # The journal only holds changes made after its own snapshot
+                if journal_file.exists() and ChangeJournal.recorded_against(
+                    journal_file, snapshot
+                ):
+                    ChangeJournal.replay(document, journal_file)
+            except Exception:
+                # Keep what the snapshot holds
+                pass
+
+            self.backupRecovered.emit(doc_id)
+            return document
+
+        return None
+
+    def _on_document_added(self, document: Document) -> None:
         """Handle new document creation"""
 
-        document = self.document_manager.get_document(doc_id)
-        if not document:
-            return
+        doc_id = document.doc_id
+        self._journals[doc_id] = ChangeJournal(document)
 
         # Connect to document changes
-        document.documentModified.connect(lambda: self.mark_document_dirty(doc_id))
+        def on_modified() -> None:
+            self.mark_document_dirty(doc_id)
+
+        document.documentModified.connect(on_modified)
+        self._modified_slots[doc_id] = on_modified
 
     def _on_document_removed(self, doc_id: str) -> None:
         """Clean up when a document is removed"""
 
         self._dirty_documents.discard(doc_id)
         self._last_save_times.pop(doc_id, None)
+        self._snapshots.discard(doc_id)
+
+        journal = self._journals.pop(doc_id, None)
+        slot = self._modified_slots.pop(doc_id, None)
+        if journal is not None:
+            journal.detach()
+            if slot is not None:
+                journal.document.documentModified.disconnect(slot)
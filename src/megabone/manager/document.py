@@ -1,8 +1,20 @@
 from pathlib import Path
+from typing import Callable
 
 from megabone.dialog import FileDialog
+from megabone.manager.save_queue import SaveQueue
+from megabone.manager.status import StatusBarManager as status
 from megabone.model.document import Document
-from megabone.qt import QMessageBox, QObject, QUndoGroup, Signal
+from megabone.model.snapshot import DocumentSnapshot
+from megabone.qt import (
+    QApplication,
+    QMessageBox,
+    QObject,
+    QProgressDialog,
+    Qt,
+    QUndoGroup,
+    Signal,
+)
 
 
 class DocumentManager(QObject):
@@ -26,11 +38,16 @@ class DocumentManager(QObject):
         self._active_document_id: str | None = None
         self._unsaved_changes: set[str] = set()
         self._undo_group = QUndoGroup(self)
+        self._save_queue = SaveQueue(self)
 
     @property
     def undo_group(self) -> QUndoGroup:
         return self._undo_group
 
+    @property
+    def save_queue(self) -> SaveQueue:
+        return self._save_queue
+
     @property
     def count(self) -> int:
         return len(self._documents)
@@ -83,8 +100,12 @@ class DocumentManager(QObject):
             self.load_document(path)
 
     def load_document(self, path: Path):
+        progress = self._load_progress_dialog(path)
+
         try:
-            doc = Document.load(path)
+            doc = Document.load(
+                path, lambda done, total: self._load_progress(progress, done, total)
+            )
             self.add_document(doc)
             self.openedDocument.emit(doc.doc_id, doc.path)
         except Exception:
@@ -94,37 +115,100 @@ class DocumentManager(QObject):
                 f"Unable to open project file: '{path}'",
                 QMessageBox.StandardButton.Ok,
             )
+        finally:
+            progress.reset()
+            progress.deleteLater()
 
-    def save_document(self, document: Document | None = None) -> None:
+    def _load_progress_dialog(self, path: Path) -> QProgressDialog:
+        """Modal dialog that blocks user input while the file is parsed"""
+
+        progress = QProgressDialog(
+            f"Loading {path.name}...", "", 0, 100, QApplication.activeWindow()
+        )
+        progress.setWindowTitle("Open File")
+        progress.setCancelButton(None)
+        progress.setWindowModality(Qt.WindowModality.ApplicationModal)
+        progress.setMinimumDuration(500)
+        progress.setAutoReset(False)
+        progress.setValue(0)
+        return progress
+
+    def _load_progress(self, progress: QProgressDialog, done: int, total: int) -> None:
+        # The reader reports every chunk, repaint only when the percentage moves
+        percent = 100 * done // max(total, 1)
+        if percent != progress.value():
+            progress.setValue(percent)
+
+    def save_document(
+        self,
+        document: Document | None = None,
+        on_saved: Callable[[], None] | None = None,
+    ) -> None:
         doc = document or self.get_active_document()
 
         assert doc is not None
 
         if doc.path:
-            try:
-                doc.save()
-            except Exception:
-                self._save_error(doc)
+            self._write_document(doc, doc.path, doc.binary, on_saved)
         else:
-            self.save_document_as(doc)
+            self.save_document_as(doc, on_saved)
 
-    def save_document_as(self, document: Document | None = None) -> None:
+    def save_document_as(
+        self,
+        document: Document | None = None,
+        on_saved: Callable[[], None] | None = None,
+    ) -> None:
         doc = document or self.get_active_document()
-        path = FileDialog.save_file()
+        target = FileDialog.save_file()
 
         assert doc is not None
 
-        if path:
-            try:
-                doc.save(path)
+        if target:
+            path, binary = target
+
+            def saved() -> None:
+                # The document only moves once the new file was written
+                doc.path, doc.binary = path, binary
                 self.savedDocumentAs.emit(doc.doc_id, path.stem)
-            except Exception:
-                self._save_error(doc)
+                if on_saved:
+                    on_saved()
+
+            self._write_document(doc, path, binary, saved)
+
+    def _write_document(
+        self,
+        document: Document,
+        path: Path,
+        binary: bool,
+        on_saved: Callable[[], None] | None = None,
+    ) -> None:
+        """Capture the document and write it on the save thread"""
+
+        try:
+            snapshot = DocumentSnapshot.capture(document)
+        except Exception:
+            self._save_error(path)
+            return
+
+        status().set_status(f"Saving {path.name}...")
+
+        def saved() -> None:
+            status().set_status(f"Saved {path.name}", timeout=2000)
+            if on_saved:
+                on_saved()
+
+        def failed(error: str) -> None:
+            status().clear_status()
+            self._save_error(path)
+
+        self._save_queue.submit(lambda: snapshot.write(path, binary), saved, failed)
 
     def close_document(self, doc_id: str | None) -> None:
         if not doc_id:
             doc_id = self._active_document_id
 
+        assert doc_id is not None
+
         if doc_id in self._unsaved_changes:
             doc = self.get_document(doc_id)
 
@@ -143,10 +227,17 @@ class DocumentManager(QObject):
             if response == QMessageBox.StandardButton.Cancel:
                 return
             elif response == QMessageBox.StandardButton.Save:
-                self.save_document(doc)
+                # Close once the write went through, a failed or cancelled
+                # save keeps the document open
+                self.save_document(doc, lambda: self._remove_document(doc_id))
+                return
+
+        self._remove_document(doc_id)
+
+    def _remove_document(self, doc_id: str) -> None:
+        if self._documents.pop(doc_id, None) is None:
+            return
 
-        assert doc_id is not None
-        self._documents.pop(doc_id)
         self._unsaved_changes.discard(doc_id)
         self.closedDocument.emit(doc_id)
 
@@ -165,10 +256,10 @@ class DocumentManager(QObject):
     def _on_document_changed(self, doc_id: str) -> None:
         self._unsaved_changes.add(doc_id)
 
-    def _save_error(self, document: Document) -> None:
+    def _save_error(self, path: Path) -> None:
         QMessageBox.critical(
             None,
             "Save File Error",
-            f"Unable to Save project file: '{document.path}'",
+            f"Unable to Save project file: '{path}'",
             QMessageBox.StandardButton.Ok,
         )
@@ -0,0 +1,69 @@
+from typing import Callable
+
+from megabone.qt import QObject, QRunnable, QThreadPool, Signal
+
+
+class SaveSignals(QObject):
+    """Created on the GUI thread so emits from the worker are queued to it"""
+
+    finished = Signal()
+    failed = Signal(str)
+
+
+class SaveTask(QRunnable):
+    def __init__(self, job: Callable[[], None]):
+        super().__init__()
+        self.job = job
+        self.signals = SaveSignals()
+
+    def run(self) -> None:
+        try:
+            self.job()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit()
+
+
+class SaveQueue(QObject):
+    """Run file writes on a single worker thread, in submission order.
+
+    Jobs must only touch data captured on the GUI thread, such as a
+    DocumentSnapshot, never the live document.
+    """
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        # Tasks are kept alive until their result was delivered
+        self._tasks: set[SaveTask] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def submit(
+        self,
+        job: Callable[[], None],
+        on_finished: Callable[[], None] | None = None,
+        on_failed: Callable[[str], None] | None = None,
+    ) -> None:
+        task = SaveTask(job)
+        task.setAutoDelete(False)
+
+        if on_finished:
+            task.signals.finished.connect(on_finished)
+        if on_failed:
+            task.signals.failed.connect(on_failed)
+        task.signals.finished.connect(lambda: self._tasks.discard(task))
+        task.signals.failed.connect(lambda _: self._tasks.discard(task))
+
+        self._tasks.add(task)
+        self._pool.start(task)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until the queued writes are done, e.g. before quitting"""
+        return self._pool.waitForDone(msecs)
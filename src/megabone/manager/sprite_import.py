@@ -0,0 +1,216 @@
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from megabone.model.sprite import FrameData, SpriteSheetData
+from megabone.qt import (
+    QColor,
+    QImage,
+    QObject,
+    QPixmap,
+    QRunnable,
+    QThreadPool,
+    Signal,
+)
+from megabone.util.image import Image, SliceMode
+
+from .resource import ResourceManager
+
+
+@dataclass(frozen=True)
+class SliceSettings:
+    """How the sheets of an import are cut into frames"""
+
+    frame_width: int
+    frame_height: int
+    offset_x: int = 0
+    offset_y: int = 0
+    mode: SliceMode = SliceMode.GRID
+    backgrounds: tuple[QColor, ...] = ()
+    tolerance: int = 0
+
+
+class SliceSignals(QObject):
+    """Created on the GUI thread so emits from the worker are queued to it"""
+
+    sliced = Signal(str, list)  # path, frame images
+    failed = Signal(str, str)  # path, error
+
+
+class SliceTask(QRunnable):
+    """Decode and slice one sheet, QImage only so it can run off the GUI thread"""
+
+    def __init__(
+        self, path: Path, settings: SliceSettings, cancelled: threading.Event
+    ):
+        super().__init__()
+        self.path = path
+        self.settings = settings
+        self.cancelled = cancelled
+        self.signals = SliceSignals()
+
+    def run(self) -> None:
+        if self.cancelled.is_set():
+            return
+
+        image = QImage(self.path.as_posix())
+        if image.isNull():
+            self.signals.failed.emit(str(self.path), "Unable to read image")
+            return
+
+        settings = self.settings
+        if settings.backgrounds:
+            image = image.convertToFormat(QImage.Format.Format_ARGB32)
+            Image.key_colors(image, settings.backgrounds, settings.tolerance)
+
+        if self.cancelled.is_set():
+            return
+
+        frames = Image.extract_frames(
+            image,
+            settings.frame_width,
+            settings.frame_height,
+            settings.offset_x,
+            settings.offset_y,
+            settings.mode,
+        )
+        self.signals.sliced.emit(str(self.path), frames)
+
+
+class SpriteSheetImporter(QObject):
+    """Slice a batch of sprite sheets on a worker pool.
+
+    Sheets are registered with the ResourceManager and announced one by one
+    as they finish, in completion order. Frames only become QPixmaps once
+    they are back on the GUI thread.
+    """
+
+    sheetImported = Signal(SpriteSheetData)
+    sheetFailed = Signal(str, str)  # path, error
+    progress = Signal(int, int)  # sheets done, sheets total
+    finished = Signal()
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+
+        self._pool = QThreadPool(self)
+        self._cancelled = threading.Event()
+        self._tasks: dict[str, SliceTask] = {}
+
+        # Tasks stay referenced until the pool is done with them
+        self._retired: list[SliceTask] = []
+
+        self._settings: SliceSettings | None = None
+        self._total = 0
+        self._done = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, paths: list[Path], settings: SliceSettings) -> None:
+        assert not self.running, "An import is already running"
+
+        if self._pool.activeThreadCount() == 0:
+            self._retired.clear()
+
+        self._cancelled = threading.Event()
+        self._settings = settings
+        self._done = 0
+
+        for path in dict.fromkeys(paths):
+            task = SliceTask(path, settings, self._cancelled)
+            task.setAutoDelete(False)
+            # Bound to the task, a cancelled batch may still be slicing a
+            # sheet of the same path
+            task.signals.sliced.connect(
+                lambda _, frames, task=task: self._on_sliced(task, frames)
+            )
+            task.signals.failed.connect(
+                lambda _, error, task=task: self._on_failed(task, error)
+            )
+            self._tasks[str(path)] = task
+
+        self._total = len(self._tasks)
+        self.progress.emit(0, self._total)
+        for task in list(self._tasks.values()):
+            self._pool.start(task)
+
+        if not self._tasks:
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        """Drop the sheets not sliced yet, running ones are discarded"""
+
+        if not self.running:
+            return
+
+        self._cancelled.set()
+        self._pool.clear()
+        self._retired.extend(self._tasks.values())
+        self._tasks.clear()
+        self.finished.emit()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+    def _on_sliced(self, task: SliceTask, frames: list[QImage]) -> None:
+        if not self._retire(task):
+            return
+
+        path = str(task.path)
+
+        if not frames:
+            self.sheetFailed.emit(path, "No non-transparent frames found")
+            self._advance()
+            return
+
+        settings = self._settings
+        assert settings is not None
+
+        match settings.mode:
+            case SliceMode.AUTO:
+                # Detected frames differ in size, the sheet holds the largest
+                frame_width = max(frame.width() for frame in frames)
+                frame_height = max(frame.height() for frame in frames)
+            case SliceMode.GRID:
+                frame_width = settings.frame_width
+                frame_height = settings.frame_height
+
+        sheet = SpriteSheetData(
+            path=path,
+            frame_width=frame_width,
+            frame_height=frame_height,
+            frames=[
+                FrameData(index=i, pixmap=QPixmap.fromImage(frame))
+                for i, frame in enumerate(frames)
+            ],
+        )
+        ResourceManager.register_sheet(sheet)
+        self.sheetImported.emit(sheet)
+        self._advance()
+
+    def _on_failed(self, task: SliceTask, error: str) -> None:
+        if not self._retire(task):
+            return
+
+        self.sheetFailed.emit(str(task.path), error)
+        self._advance()
+
+    def _retire(self, task: SliceTask) -> bool:
+        """False for results of a cancelled batch"""
+
+        path = str(task.path)
+        if self._tasks.get(path) is not task:
+            return False
+
+        del self._tasks[path]
+        self._retired.append(task)
+        return True
+
+    def _advance(self) -> None:
+        self._done += 1
+        self.progress.emit(self._done, self._total)
+
+        if not self._tasks:
+            self.finished.emit()
@@ -1,5 +1,8 @@
+from megabone.IKSolver import BatchFABRIK, NumpyFABRIK
+
 from .animation_track import AnimationTrack
-from .property import PropertyType
+from .pose_cache import PoseCache
+from .property import POSE_DEPENDENT, PropertyType
 
 
 class Animation:
@@ -9,16 +12,36 @@ class Animation:
         self.frame_start = 0
         self.frame_end = 100
         self.current_frame = 0
+        self._ik_batch: BatchFABRIK | None = None
+
+        # Playback reads precomputed poses while baked
+        self.pose_cache = PoseCache(self)
+        self.baked = False
 
     def addTrack(self, target, property_type):
         track = AnimationTrack(target, property_type)
         self.tracks.append(track)
         return track
 
+    def bake(self) -> None:
+        """Precompute every frame and play back from the pose cache"""
+        self.pose_cache.bake()
+        self.baked = True
+
+    def unbake(self) -> None:
+        self.baked = False
+
     def update(self, frame):
         """Update all targets to specified frame"""
         self.current_frame = frame
 
+        if self.baked:
+            self.pose_cache.apply(frame)
+            return
+
+        ik_chains, ik_targets = [], []
+        dependent = []
+
         for track in self.tracks:
             if not track.enabled:
                 continue
@@ -27,21 +50,60 @@ class Animation:
             if value is None:
                 continue
 
-            # Apply value based on property type
-            if track.property_type == PropertyType.POSITION:
-                track.target.setPos(value)
-            elif track.property_type == PropertyType.ROTATION:
-                track.target.setRotation(value)
-            elif track.property_type == PropertyType.IK_TARGET:
-                track.target.target.setPos(value)
-                track.target.chain.solve(value)
-            elif track.property_type == PropertyType.IK_POLE:
-                track.target.pole.setPos(value)
-                track.target.pole.updateChainWithPoleVector()
-            elif track.property_type == PropertyType.SPRITE_OFFSET:
-                track.target.bone_offset = value
-                # Update sprite position
-                bone = track.target.attached_bone
-                if bone:
-                    new_pos = bone.end_point + value
-                    track.target.setPos(new_pos)
+            if track.property_type in POSE_DEPENDENT:
+                dependent.append((track, value))
+                continue
+
+            self.apply_value(track, value)
+
+            if track.property_type == PropertyType.IK_TARGET:
+                ik_chains.append(track.target.chain)
+                ik_targets.append(value)
+
+        if ik_chains:
+            self.solve_ik(ik_chains, ik_targets)
+
+        # Second pass against the solved pose
+        for track, value in dependent:
+            self.apply_value(track, value)
+
+    def apply_value(self, track, value):
+        """Apply a track value to its target, IK chains are solved separately"""
+        if track.property_type == PropertyType.POSITION:
+            track.target.setPos(value)
+        elif track.property_type == PropertyType.ROTATION:
+            track.target.setRotation(value)
+        elif track.property_type == PropertyType.IK_TARGET:
+            track.target.target.setPos(value)
+        elif track.property_type == PropertyType.IK_POLE:
+            track.target.pole.setPos(value)
+            track.target.pole.updateChainWithPoleVector()
+        elif track.property_type == PropertyType.SPRITE_OFFSET:
+            track.target.bone_offset = value
+            # Update sprite position
+            bone = track.target.attached_bone
+            if bone:
+                new_pos = bone.end_point + value
+                track.target.setPos(new_pos)
+
+    def solve_ik(self, chains: list, targets: list) -> None:
+        """Solve all IK chains of a frame together"""
+
+        # Chains without bones have nothing to solve
+        batched = [
+            (chain, target)
+            for chain, target in zip(chains, targets)
+            if isinstance(chain, NumpyFABRIK) and chain.bones
+        ]
+        for chain, target in zip(chains, targets):
+            if not isinstance(chain, NumpyFABRIK):
+                chain.solve(target)
+
+        if not batched:
+            return
+
+        batch_chains = [chain for chain, _ in batched]
+        if self._ik_batch is None or self._ik_batch.chains != batch_chains:
+            self._ik_batch = BatchFABRIK(batch_chains)
+
+        self._ik_batch.solve([target for _, target in batched])
@@ -1,45 +1,91 @@
-from megabone.model.keyframe import Keyframe
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from megabone.model.keyframe import EaseType, KeyframeData
+from megabone.model.keyframe_columns import KeyframeColumns
 
 
 class AnimationTrack:
     def __init__(self, target, property_type):
         self.target = target  # Bone, IKHandle, or Sprite
         self.property_type = property_type
-        self.keyframes = []  # List of Keyframe objects
+        self.keyframes: list[KeyframeData] = []  # Sorted by frame number
         self.enabled = True
 
-    def addKeyframe(self, frame, value, easing="linear"):
+        # Bumped on every keyframe edit so baked caches can detect changes
+        self.revision = 0
+
+        # Frame numbers parallel to keyframes, searched with bisect
+        self._frames: list[int] = []
+
+        # Index of the segment used by the last lookup
+        self._cursor = 0
+
+        # Columnar copy for whole range sampling, rebuilt after edits
+        self._columns: KeyframeColumns | None = None
+
+    def addKeyframe(self, frame, value, easing=EaseType.LINEAR):
         """Add a keyframe at the specified frame"""
-        # Remove existing keyframe at this frame if it exists
-        self.keyframes = [k for k in self.keyframes if k.frame != frame]
+        keyframe = KeyframeData(frame=frame, value=value, easing=easing)
+
+        # Replace an existing keyframe at this frame or insert in order
+        index = bisect_left(self._frames, frame)
+        if index < len(self._frames) and self._frames[index] == frame:
+            self.keyframes[index] = keyframe
+        else:
+            self._frames.insert(index, frame)
+            self.keyframes.insert(index, keyframe)
+
+        self._columns = None
+        self.revision += 1
 
-        # Add new keyframe
-        keyframe = Keyframe(frame, value, easing)
-        self.keyframes.append(keyframe)
-        # Sort keyframes by frame number
-        self.keyframes.sort(key=lambda k: k.frame)
+    @property
+    def columns(self) -> KeyframeColumns | None:
+        if self._columns is None and self.keyframes:
+            self._columns = KeyframeColumns(self.keyframes)
+        return self._columns
+
+    def sample(self, frames) -> np.ndarray | None:
+        """Get interpolated values for a whole range of frames at once"""
+        columns = self.columns
+        if columns is None:
+            return None
+        return columns.sample(frames)
 
     def getValue(self, frame):
         """Get interpolated value at the specified frame"""
         if not self.keyframes:
             return None
 
-        # Find surrounding keyframes
-        prev_keyframe = None
-        next_keyframe = None
+        index = self._find_segment(frame)
 
-        for keyframe in self.keyframes:
-            if keyframe.frame <= frame:
-                prev_keyframe = keyframe
-            else:
-                next_keyframe = keyframe
-                break
-
-        if not prev_keyframe:
+        if index < 0:
             return self.keyframes[0].value
-        if not next_keyframe:
-            return prev_keyframe.value
+        if index == len(self.keyframes) - 1:
+            return self.keyframes[index].value
 
         # Interpolate between keyframes
+        prev_keyframe = self.keyframes[index]
+        next_keyframe = self.keyframes[index + 1]
+
         t = (frame - prev_keyframe.frame) / (next_keyframe.frame - prev_keyframe.frame)
         return prev_keyframe.interpolate(next_keyframe, t)
+
+    def _find_segment(self, frame) -> int:
+        """Index of the last keyframe at or before frame, -1 if there is none"""
+        frames = self._frames
+        last = len(frames) - 1
+        cursor = self._cursor
+
+        # Sequential playback stays in the cached segment or moves to the next
+        if cursor <= last and frames[cursor] <= frame:
+            if cursor == last or frame < frames[cursor + 1]:
+                return cursor
+            if cursor + 1 == last or frame < frames[cursor + 2]:
+                self._cursor = cursor + 1
+                return cursor + 1
+
+        index = bisect_right(frames, frame) - 1
+        self._cursor = max(index, 0)
+        return index
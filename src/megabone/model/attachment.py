@@ -6,7 +6,7 @@ from .collection import BaseCollectionModel
 from .serializable import Serializable
 
 
-@dataclass
+@dataclass(slots=True)
 class AttachmentData(Serializable):
     bone_id: str = ""
     sprite_id: str = ""
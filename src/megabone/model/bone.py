@@ -6,12 +6,11 @@ from .collection import BaseCollectionModel
 from .serializable import Serializable
 
 
-@dataclass
+@dataclass(slots=True)
 class BoneData(Serializable):
     name: str = "bone"
     sprite_id: str = ""
     parent_id: str = ""
-    z_index: int = 0
     start_point: Point = field(default_factory=lambda: Point())
     end_point: Point = field(default_factory=lambda: Point())
 
@@ -1,5 +1,6 @@
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any, Type
+from typing import Any, Callable, Iterable, Type
 
 from megabone.qt import QObject, Signal
 
@@ -12,30 +13,115 @@ class UpdateSource(Enum):
     AUTOSAVE = auto()
 
 
+@dataclass
+class ChangeSet:
+    """Item ids touched by a collection during a batch, coalesced per id"""
+
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    modified: set[str] = field(default_factory=set)
+
+    def record_added(self, item_id: str) -> None:
+        if item_id in self.removed:
+            # Removed and added back within the batch
+            self.removed.discard(item_id)
+            self.modified.add(item_id)
+        else:
+            self.added.add(item_id)
+
+    def record_removed(self, item_id: str) -> None:
+        if item_id in self.added:
+            # Never visible outside the batch
+            self.added.discard(item_id)
+        else:
+            self.modified.discard(item_id)
+            self.removed.add(item_id)
+
+    def record_modified(self, item_id: str) -> None:
+        if item_id not in self.added:
+            self.modified.add(item_id)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+
 class BaseCollectionModel(QObject):
     itemAdded = Signal(str)
     itemRemoved = Signal(str)
     itemModified = Signal(str, UpdateSource)
 
+    itemsChanged = Signal(object)
+    """A batch was committed, carries the coalesced ChangeSet"""
+
     def __init__(self, data_class: Type[Serializable], key_name: str):
         super().__init__()
-        self._items: dict[str, Serializable] = {}
+        self._store: dict[str, Serializable] = {}
+        self._loader: Callable[[Type[Serializable]], Iterable[Serializable]] | None = None
         self._data_class = data_class
+        self._batch: ChangeSet | None = None
         self.key_name = key_name
 
+    @property
+    def data_class(self) -> Type[Serializable]:
+        return self._data_class
+
+    @property
+    def deferred(self) -> bool:
+        """True while the items are still to be read from file"""
+        return self._loader is not None
+
+    @property
+    def _items(self) -> dict[str, Serializable]:
+        if self._loader is not None:
+            self.ensure_loaded()
+        return self._store
+
     def add_item(self, data: Serializable, source: UpdateSource) -> None:
         self._items[data.id] = data
-        self.itemAdded.emit(data.id)
+
+        if self._batch is not None:
+            self._batch.record_added(data.id)
+        else:
+            self.itemAdded.emit(data.id)
 
     def remove_item(self, item_id: str, source: UpdateSource) -> None:
         if item_id in self._items:
             del self._items[item_id]
-            self.itemRemoved.emit(item_id)
+
+            if self._batch is not None:
+                self._batch.record_removed(item_id)
+            else:
+                self.itemRemoved.emit(item_id)
 
     def modify_item(self, data: Serializable, source: UpdateSource) -> None:
         if data.id in self._items:
             self._items[data.id] = data
-            self.itemModified.emit(data.id, source)
+
+            if self._batch is not None:
+                self._batch.record_modified(data.id)
+            else:
+                self.itemModified.emit(data.id, source)
+
+    def store_item(self, data: Serializable) -> None:
+        """Replace a record without notifications, e.g. a value the scene derives"""
+        if data.id in self._items:
+            self._items[data.id] = data
+
+    def begin_batch(self) -> None:
+        """Suspend per item signals and start recording touched ids"""
+
+        if self._batch is None:
+            self._batch = ChangeSet()
+
+    def end_batch(self) -> ChangeSet | None:
+        """Stop recording and emit the consolidated change set, if any"""
+
+        changes, self._batch = self._batch, None
+        if changes is None or changes.is_empty():
+            return None
+
+        self.itemsChanged.emit(changes)
+        return changes
 
     def next_name(self, base: str) -> str:
         existing = {item.name for item in self.get_items()}
@@ -52,11 +138,34 @@ class BaseCollectionModel(QObject):
     def get_items(self) -> list[Serializable]:
         return list(self._items.values())
 
+    def snapshot(self) -> tuple[Serializable, ...]:
+        """Items as of now, records are replaced on change so they stay valid"""
+        return tuple(self._items.values())
+
     def to_list(self) -> list[dict[str, Any]]:
         return [item.to_dict() for item in self._items.values()]
 
     def from_list(self, data: list[dict[str, Any]]) -> None:
-        self._items.clear()
+        self._loader = None
+        self._store.clear()
 
         for item_data in data:
-            self._items[item_data["id"]] = self._data_class.from_dict(item_data)
+            self.load_item(item_data)
+
+    def defer_load(
+        self, loader: Callable[[Type[Serializable]], Iterable[Serializable]]
+    ) -> None:
+        """Replace the items with the ones loader returns on first access"""
+        self._store.clear()
+        self._loader = loader
+
+    def ensure_loaded(self) -> None:
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            for item in loader(self._data_class):
+                self._store[item.id] = item
+
+    def load_item(self, item_data: dict[str, Any]) -> None:
+        """Add a record read from file, without notifications"""
+        item = self._data_class.from_dict(item_data)
+        self._items[item.id] = item
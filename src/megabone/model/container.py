@@ -0,0 +1,234 @@
+import json
+import mmap
+import struct
+from dataclasses import fields
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Type, get_type_hints
+
+import numpy as np
+
+from megabone.qt import QPointF
+from megabone.util.types import Point
+
+from .serializable import Serializable
+
+MAGIC = b"MGB\x00"
+VERSION = 1
+
+# Magic, version, reserved, length of the JSON section table
+_HEADER = struct.Struct("<4sHHQ")
+
+# Columns start on multiples of the widest stored scalar
+_ALIGNMENT = 8
+
+
+class ColumnKind(Enum):
+    POINT = "point"
+    INT = "int"
+    FLOAT = "float"
+    JSON = "json"
+
+
+_DTYPES = {
+    ColumnKind.POINT: np.dtype("<f8"),
+    ColumnKind.INT: np.dtype("<i8"),
+    ColumnKind.FLOAT: np.dtype("<f8"),
+}
+
+
+def is_container(path: Path) -> bool:
+    """True if path starts with the binary container magic"""
+
+    with path.open("rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _column_kind(values: list, hint: Any) -> ColumnKind:
+    # Points of untyped fields go through JSON as in the JSON format, so
+    # they decode to the same values from either file
+    if hint is Point and all(isinstance(value, Point) for value in values):
+        return ColumnKind.POINT
+    # bool is an int subclass but must round trip as a bool
+    if all(type(value) is int for value in values):
+        if all(-(1 << 63) <= value < 1 << 63 for value in values):
+            return ColumnKind.INT
+    if all(type(value) is float for value in values):
+        return ColumnKind.FLOAT
+    return ColumnKind.JSON
+
+
+def _encode_column(kind: ColumnKind, values: list) -> bytes:
+    match kind:
+        case ColumnKind.POINT:
+            return np.array(
+                [(point.x, point.y) for point in values], dtype=_DTYPES[kind]
+            ).tobytes()
+        case ColumnKind.INT | ColumnKind.FLOAT:
+            return np.array(values, dtype=_DTYPES[kind]).tobytes()
+        case _:
+            return json.dumps(
+                [_json_value(value) for value in values], separators=(",", ":")
+            ).encode("utf-8")
+
+
+def _json_value(value: Any) -> Any:
+    """Same value mapping as Serializable.to_dict"""
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, Point):
+        return (value.x, value.y)
+    if isinstance(value, QPointF):
+        return (value.x(), value.y())
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def write_container(path: Path, sections: dict[str, Iterable[Serializable]]) -> None:
+    """Write collections as column sections of a binary container.
+
+    Point, int and float fields are stored as raw little endian arrays so
+    they can be mapped back without parsing, other fields as a JSON array.
+    """
+
+    table: dict[str, dict] = {}
+    blobs: list[bytes] = []
+    offset = 0
+
+    for key, items in sections.items():
+        items = list(items)
+        columns: dict[str, dict] = {}
+
+        if items:
+            hints = get_type_hints(type(items[0]))
+            for f in fields(type(items[0])):
+                if not f.init:
+                    continue
+
+                values = [getattr(item, f.name) for item in items]
+                kind = _column_kind(values, hints.get(f.name))
+                blob = _encode_column(kind, values)
+
+                columns[f.name] = {
+                    "kind": kind.value,
+                    "offset": offset,
+                    "size": len(blob),
+                }
+                blobs.append(blob)
+
+                padding = -len(blob) % _ALIGNMENT
+                blobs.append(bytes(padding))
+                offset += len(blob) + padding
+
+        table[key] = {"count": len(items), "columns": columns}
+
+    header = json.dumps({"sections": table}, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(_HEADER.size + len(header)) % _ALIGNMENT)
+
+    with path.open("wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+
+
+class ContainerReader:
+    """Memory mapped binary container with sections decoded on demand.
+
+    The mapping is released once every section was decoded, or by close.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+        self._file = path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version, _, header_size = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version > VERSION:
+            self.close()
+            raise ValueError(f"Unsupported container format in '{path}'")
+
+        start = _HEADER.size
+        header = json.loads(self._map[start : start + header_size])
+        self._data_start = start + header_size
+        self._sections: dict[str, dict] = header["sections"]
+        self._pending = set(self._sections)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sections
+
+    @property
+    def closed(self) -> bool:
+        return self._map is None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def count(self, key: str) -> int:
+        return self._sections[key]["count"]
+
+    def section(self, key: str, data_class: Type[Serializable]) -> list[Serializable]:
+        """Decode the records of a section"""
+
+        if self._map is None:
+            raise ValueError(f"Container '{self.path}' is closed")
+
+        items = list(self._records(self._sections[key], data_class))
+
+        self._pending.discard(key)
+        if not self._pending:
+            self.close()
+
+        return items
+
+    def _records(
+        self, section: dict, data_class: Type[Serializable]
+    ) -> Iterator[Serializable]:
+        count = section["count"]
+        converters = data_class.field_converters()
+
+        names: list[str] = []
+        columns: list[list] = []
+        for name, column in section["columns"].items():
+            # Columns of fields that no longer exist are ignored
+            if name not in converters:
+                continue
+
+            names.append(name)
+            columns.append(self._column(column, count, converters[name]))
+
+        for values in zip(*columns):
+            yield data_class(**dict(zip(names, values)))
+
+    def _column(self, column: dict, count: int, convert) -> list:
+        kind = ColumnKind(column["kind"])
+        offset = self._data_start + column["offset"]
+
+        if kind == ColumnKind.JSON:
+            values = json.loads(self._map[offset : offset + column["size"]])
+            if convert is None:
+                return values
+            return [convert(value) for value in values]
+
+        array = np.frombuffer(
+            self._map,
+            dtype=_DTYPES[kind],
+            count=count * 2 if kind == ColumnKind.POINT else count,
+            offset=offset,
+        )
+        # tolist copies out so no view keeps the mapping alive
+        values = array.tolist()
+        del array
+
+        if kind == ColumnKind.POINT:
+            return [Point(values[i], values[i + 1]) for i in range(0, len(values), 2)]
+        return values
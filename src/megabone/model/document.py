@@ -1,6 +1,7 @@
-import json
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 from megabone.command.document import DocumentCommand
 from megabone.qt import QObject, QUndoStack, Signal
@@ -8,7 +9,11 @@ from megabone.qt import QObject, QUndoStack, Signal
 from .attachment import AttachmentModel
 from .bone import BoneModel
 from .collection import BaseCollectionModel
+from .container import ContainerReader, is_container
 from .keyframe import KeyframeModel
+from .loader import JsonRecordReader, ProgressCallback
+from .skeleton_arrays import SkeletonArrays
+from .snapshot import DocumentSnapshot
 from .sprite import SpriteModel
 
 
@@ -21,11 +26,19 @@ class Document(QObject):
         super().__init__()
         self.doc_id = uuid.uuid4().hex
         self.path = path
+
+        # Format of the file at path, saving writes the same one back
+        self.binary = False
         self.bones = BoneModel()
         self.sprites = SpriteModel()
         self.keyframes = KeyframeModel()
         self.attachments = AttachmentModel()
+        self.bone_arrays = SkeletonArrays(self.bones)
         self.undo_stack = QUndoStack()
+        self._batch_depth = 0
+
+        # Mapped binary file the collections are decoded from on demand
+        self._container: ContainerReader | None = None
 
         # Connect to collections signals
         for model in [self.bones, self.sprites, self.keyframes, self.attachments]:
@@ -52,22 +65,108 @@ class Document(QObject):
         self.attachments.from_list(data.get(self.attachments.key_name, []))
         self.keyframes.from_list(data.get(self.keyframes.key_name, []))
 
+        # Loading replaces the collections without emitting per item signals
+        self.bone_arrays.reset()
+
         return self
 
-    def save(self, path: Path | None = None) -> None:
+    def save(self, path: Path | None = None, binary: bool | None = None) -> None:
         if path:
             self.path = path
+        if binary is not None:
+            self.binary = binary
 
         assert self.path is not None, "No file save path set"
-        self.path.write_text(json.dumps(self.to_dict(), indent=4), encoding="utf-8")
+        self.write(self.path, self.binary)
+
+    def write(self, path: Path, binary: bool = False) -> None:
+        """Write the document to path without making it the document path"""
+        DocumentSnapshot.capture(self).write(path, binary)
+
+    def release_container(self) -> None:
+        """Decode the collections still mapped from file and unmap it"""
+
+        if self._container is None:
+            return
+
+        for collection in self.get_all_collections():
+            collection.ensure_loaded()
+
+        self._container.close()
+        self._container = None
 
     @staticmethod
-    def load(path: Path) -> "Document":
-        with path.open("r", encoding="utf-8") as f:
-            return Document(path).from_dict(json.load(f))
+    def load(path: Path, progress: ProgressCallback | None = None) -> "Document":
+        """Load a document from a binary container or a JSON file"""
+
+        document = Document(path)
+
+        # The extension doesn't tell, JSON projects were saved as .mgb too
+        document.binary = is_container(path)
+
+        if document.binary:
+            document._map_container(path)
+            if progress:
+                size = path.stat().st_size
+                progress(size, size)
+        else:
+            document._stream_json(path, progress)
+
+        # Loading fills the collections without emitting per item signals
+        document.bone_arrays.reset()
+
+        return document
+
+    def _map_container(self, path: Path) -> None:
+        container = ContainerReader(path)
+
+        for collection in self.get_all_collections():
+            if collection.key_name in container:
+                key = collection.key_name
+                collection.defer_load(
+                    lambda data_class, key=key: container.section(key, data_class)
+                )
+
+        self._container = container
+
+    def _stream_json(self, path: Path, progress: ProgressCallback | None) -> None:
+        collections = {
+            collection.key_name: collection
+            for collection in self.get_all_collections()
+        }
+
+        for key, record in JsonRecordReader(path).records(collections, progress):
+            collections[key].load_item(record)
 
     def push(self, command: DocumentCommand) -> None:
         self.undo_stack.push(command)
 
+    @contextmanager
+    def batch(self) -> Iterator["Document"]:
+        """Group collection changes into one notification per collection.
+
+        Per item signals are suspended while the block runs. On exit every
+        touched collection emits a single itemsChanged with its coalesced
+        ChangeSet and documentModified is emitted once. Nested blocks are
+        committed by the outermost one.
+        """
+
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            for collection in self.get_all_collections():
+                collection.begin_batch()
+
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                changes = [
+                    collection.end_batch()
+                    for collection in self.get_all_collections()
+                ]
+                if any(changes):
+                    self.documentModified.emit()
+
     def _on_content_changed(self, *args):
         self.documentModified.emit()
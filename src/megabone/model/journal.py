@@ -0,0 +1,194 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from .collection import ChangeSet, UpdateSource
+from .document import Document
+from .serializable import Serializable
+
+JournalEntries = list[tuple[str, str, Serializable | None]]
+"""Collection key, item id and current record, None once removed"""
+
+
+class ChangeJournal:
+    """Ids of the records a document changed since they were last written.
+
+    Follows the collection signals and appends the current value of every
+    touched record, or its removal, as JSON lines. Replaying the lines over
+    the snapshot they were recorded against restores the document, later
+    lines winning over earlier ones. The first line of a journal file
+    identifies that snapshot file.
+    """
+
+    def __init__(self, document: Document):
+        self._document = document
+        self._collections = {
+            collection.key_name: collection
+            for collection in document.get_all_collections()
+        }
+
+        # Collection key -> touched item ids
+        self._touched: dict[str, set[str]] = {key: set() for key in self._collections}
+
+        # Entries written since the journal was last cleared
+        self.entries = 0
+
+        # Signal and slot pairs, kept to disconnect them in detach
+        self._connections: list[tuple[Any, Callable]] = []
+
+        for key, collection in self._collections.items():
+            touched = self._touched[key]
+            self._connect(collection.itemAdded, touched.add)
+            self._connect(collection.itemRemoved, touched.add)
+            self._connect(
+                collection.itemModified,
+                lambda item_id, source, touched=touched: touched.add(item_id),
+            )
+            self._connect(
+                collection.itemsChanged,
+                lambda changes, touched=touched: self._on_items_changed(
+                    touched, changes
+                ),
+            )
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._touched.values())
+
+    @property
+    def document(self) -> Document:
+        return self._document
+
+    def detach(self) -> None:
+        """Stop following the document, e.g. once it was closed"""
+
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections.clear()
+
+    def _connect(self, signal, slot: Callable) -> None:
+        signal.connect(slot)
+        self._connections.append((signal, slot))
+
+    def clear(self) -> None:
+        """Forget the changes, e.g. after a full snapshot was written"""
+
+        for ids in self._touched.values():
+            ids.clear()
+        self.entries = 0
+
+    def take(self) -> JournalEntries:
+        """Pending changes with the current records, clearing them.
+
+        Only references are collected so the entries can be written from
+        another thread.
+        """
+
+        entries = [
+            (key, item_id, self._collections[key].get_item(item_id))
+            for key, ids in self._touched.items()
+            for item_id in ids
+        ]
+
+        for ids in self._touched.values():
+            ids.clear()
+
+        self.entries += len(entries)
+        return entries
+
+    @staticmethod
+    def snapshot_stamp(snapshot: Path) -> dict[str, int]:
+        """Identity of a snapshot file, kept when it is renamed"""
+
+        stat = snapshot.stat()
+        return {
+            "inode": stat.st_ino,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    @staticmethod
+    def recorded_against(path: Path, snapshot: Path) -> bool:
+        """True if the journal file was started against the snapshot file"""
+
+        with path.open("r", encoding="utf-8") as file:
+            line = file.readline()
+
+        try:
+            header = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+
+        return (
+            isinstance(header, dict)
+            and header.get("snapshot") == ChangeJournal.snapshot_stamp(snapshot)
+        )
+
+    @staticmethod
+    def append(path: Path, entries: JournalEntries, snapshot: Path) -> None:
+        """Append entries taken from a journal to a journal file, durably.
+
+        A new journal file starts with the stamp of snapshot, the file the
+        entries apply to.
+        """
+
+        if not entries:
+            return
+
+        lines = []
+        if not path.exists():
+            header = {"snapshot": ChangeJournal.snapshot_stamp(snapshot)}
+            lines.append(json.dumps(header) + "\n")
+
+        for key, item_id, item in entries:
+            if item is None:
+                entry = {"collection": key, "removed": item_id}
+            else:
+                entry = {"collection": key, "record": item.to_dict()}
+            lines.append(json.dumps(entry) + "\n")
+
+        with path.open("a", encoding="utf-8") as file:
+            file.writelines(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def replay(document: Document, path: Path) -> int:
+        """Apply the entries of a journal file and return how many were applied.
+
+        A partially written last line, as left by a crash, ends the replay.
+        Check recorded_against first, entries only apply to their snapshot.
+        """
+
+        collections = {
+            collection.key_name: collection
+            for collection in document.get_all_collections()
+        }
+
+        applied = 0
+        with document.batch(), path.open("r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+                collection = collections.get(entry.get("collection"))
+                if collection is None:
+                    continue
+
+                if "removed" in entry:
+                    collection.remove_item(entry["removed"], UpdateSource.AUTOSAVE)
+                else:
+                    data = collection.data_class.from_dict(entry["record"])
+                    if collection.get_item(data.id) is None:
+                        collection.add_item(data, UpdateSource.AUTOSAVE)
+                    else:
+                        collection.modify_item(data, UpdateSource.AUTOSAVE)
+                applied += 1
+
+        return applied
+
+    @staticmethod
+    def _on_items_changed(touched: set[str], changes: ChangeSet) -> None:
+        touched.update(changes.added, changes.removed, changes.modified)
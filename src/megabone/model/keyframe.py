@@ -3,6 +3,7 @@ from enum import Enum, auto
 from typing import Any
 
 from megabone.qt import QPointF
+from megabone.util.types import Point
 
 from .collection import BaseCollectionModel
 from .serializable import Serializable
@@ -14,7 +15,7 @@ class EaseType(Enum):
     EASE_OUT = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyframeData(Serializable):
     bone_id: str = ""
     frame: int = 0
@@ -28,6 +29,11 @@ class KeyframeData(Serializable):
                 self._ease(self.value.x(), other.value.x(), t),
                 self._ease(self.value.y(), other.value.y(), t),
             )
+        elif isinstance(self.value, Point):
+            return Point(
+                self._ease(self.value.x, other.value.x, t),
+                self._ease(self.value.y, other.value.y, t),
+            )
         elif isinstance(self.value, (int, float)):
             return self._ease(self.value, other.value, t)
 
@@ -0,0 +1,69 @@
+import numpy as np
+
+from megabone.util.types import Point
+
+from .keyframe import EaseType, KeyframeData
+
+
+class KeyframeColumns:
+    """Columnar copy of a track's keyframes for vectorized evaluation.
+
+    Frames, values and easing codes are stored as NumPy arrays. Scalar
+    values give a (keys,) value column, point values a (keys, 2) one.
+    """
+
+    def __init__(self, keyframes: list[KeyframeData]):
+        self.frames = np.array([k.frame for k in keyframes], dtype=np.float64)
+        self.easing = np.array([k.easing.value for k in keyframes], dtype=np.int8)
+        self.values = np.array(
+            [self._column_value(k.value) for k in keyframes], dtype=np.float64
+        )
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def is_point(self) -> bool:
+        return self.values.ndim == 2
+
+    def sample(self, frames) -> np.ndarray:
+        """Evaluate the track at every frame in one call.
+
+        Frames before the first or after the last keyframe hold the end
+        values, matching AnimationTrack.getValue.
+        """
+
+        frames = np.asarray(frames, dtype=np.float64)
+
+        if len(self.frames) == 1:
+            return np.repeat(self.values[:1], frames.size, axis=0)
+
+        # Segment start index for every frame
+        index = np.searchsorted(self.frames, frames, side="right") - 1
+        np.clip(index, 0, len(self.frames) - 2, out=index)
+
+        start = self.frames[index]
+        t = (frames - start) / (self.frames[index + 1] - start)
+        np.clip(t, 0.0, 1.0, out=t)
+
+        # Easing of the segment start keyframe
+        easing = self.easing[index]
+        t = np.where(
+            easing == EaseType.EASE_IN.value,
+            t * t,
+            np.where(easing == EaseType.EASE_OUT.value, 1 - (1 - t) * (1 - t), t),
+        )
+
+        if self.is_point:
+            t = t[:, None]
+
+        first = self.values[index]
+        return first + (self.values[index + 1] - first) * t
+
+    @staticmethod
+    def _column_value(value) -> float | tuple[float, float]:
+        if isinstance(value, Point):
+            return value.x, value.y
+        if isinstance(value, (int, float)):
+            return float(value)
+        return value.x(), value.y()
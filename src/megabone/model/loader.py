@@ -0,0 +1,147 @@
+import json
+import re
+from collections.abc import Callable, Container, Iterator
+from pathlib import Path
+
+ProgressCallback = Callable[[int, int], None]
+"""Called with the bytes read so far and the file size"""
+
+
+class JsonRecordReader:
+    """Stream the records of a document file without loading it whole.
+
+    The file is a JSON object whose collection keys map to arrays of
+    records. Records of the requested collections are decoded one at a time
+    from a buffer refilled in chunks, other top level values are decoded
+    whole and skipped.
+    """
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, path: Path, chunk_size: int = 1 << 16) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.size = path.stat().st_size
+
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._read = 0
+        self._file = None
+        self._progress: ProgressCallback | None = None
+
+    @property
+    def bytes_read(self) -> int:
+        # Characters read, the same as bytes for the ASCII files we write
+        return min(self._read, self.size)
+
+    def records(
+        self, collections: Container[str], progress: ProgressCallback | None = None
+    ) -> Iterator[tuple[str, dict]]:
+        """Yield (collection key, record) pairs in file order"""
+
+        self._progress = progress
+
+        with self.path.open("r", encoding="utf-8") as self._file:
+            self._expect("{")
+            if self._peek() == "}":
+                return
+
+            while True:
+                key = self._value()
+                self._expect(":")
+
+                if self._peek() != "[":
+                    self._value()
+                elif key in collections:
+                    yield from ((key, record) for record in self._array())
+                else:
+                    # Skipped arrays are still streamed to bound memory
+                    for _ in self._array():
+                        pass
+
+                if self._next_token() == "}":
+                    break
+                self._expect_current(",")
+
+        if progress:
+            progress(self.size, self.size)
+
+    def _array(self) -> Iterator[dict]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._value()
+
+            token = self._next_token()
+            if token == "]":
+                return
+            self._expect_current(",")
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, False at end of file"""
+
+        if self._eof:
+            return False
+
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._read += len(chunk)
+
+        # Drop what was consumed before growing the buffer
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+
+        if self._progress:
+            self._progress(self.bytes_read, self.size)
+        return True
+
+    def _peek(self) -> str:
+        """Next non whitespace character, without consuming it"""
+
+        while True:
+            self._pos = self._whitespace.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                raise ValueError(f"Unexpected end of file in '{self.path}'")
+
+    def _next_token(self) -> str:
+        token = self._peek()
+        self._pos += 1
+        return token
+
+    def _expect(self, token: str) -> None:
+        self._next_token()
+        self._expect_current(token)
+
+    def _expect_current(self, token: str) -> None:
+        # The token was already consumed by _next_token
+        if self._buffer[self._pos - 1] != token:
+            raise ValueError(f"Expected '{token}' in '{self.path}'")
+
+    def _value(self):
+        self._peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number ending at the buffer end may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._pos = end
+            return value
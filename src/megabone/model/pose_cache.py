@@ -0,0 +1,132 @@
+import numpy as np
+
+from megabone.IKSolver import BatchFABRIK, NumpyFABRIK
+from megabone.qt import QPointF
+
+from .animation_track import AnimationTrack
+from .property import POSE_DEPENDENT, PropertyType
+
+
+class PoseCache:
+    """Pose of every frame of an Animation evaluated ahead of playback.
+
+    Each track is sampled over frame_start..frame_end into one array and IK
+    target tracks also keep the solved joints of their chain per frame.
+    Tracks are re-baked only when their keyframes changed since the last
+    bake, so editing one track leaves the rest of the cache untouched.
+    """
+
+    def __init__(self, animation):
+        self.animation = animation
+
+        self._range: tuple[int, int] | None = None
+        self._values: dict[AnimationTrack, np.ndarray] = {}
+        self._ik_joints: dict[AnimationTrack, np.ndarray] = {}
+        self._revisions: dict[AnimationTrack, int] = {}
+
+    @property
+    def frames(self) -> np.ndarray:
+        return np.arange(self.animation.frame_start, self.animation.frame_end + 1)
+
+    def invalidate(self, track: AnimationTrack | None = None) -> None:
+        """Force a track, or the whole animation, to be baked again"""
+
+        if track is None:
+            self._revisions.clear()
+        else:
+            self._revisions.pop(track, None)
+
+    def bake(self) -> list[AnimationTrack]:
+        """Bake every stale track and return the ones that were baked"""
+
+        frame_range = (self.animation.frame_start, self.animation.frame_end)
+        if frame_range != self._range:
+            self._range = frame_range
+            self._values.clear()
+            self._ik_joints.clear()
+            self._revisions.clear()
+
+        # Forget tracks removed from the animation
+        for track in set(self._values) - set(self.animation.tracks):
+            self._values.pop(track, None)
+            self._ik_joints.pop(track, None)
+            self._revisions.pop(track, None)
+
+        stale = [
+            track
+            for track in self.animation.tracks
+            if self._revisions.get(track) != track.revision
+        ]
+        if not stale:
+            return []
+
+        frames = self.frames
+        for track in stale:
+            self._revisions[track] = track.revision
+            self._ik_joints.pop(track, None)
+
+            values = track.sample(frames)
+            if values is None:
+                self._values.pop(track, None)
+            else:
+                self._values[track] = values
+
+        self._bake_ik(
+            [
+                track
+                for track in stale
+                if track in self._values
+                and track.property_type == PropertyType.IK_TARGET
+                and isinstance(track.target.chain, NumpyFABRIK)
+            ]
+        )
+
+        return stale
+
+    def apply(self, frame: int) -> None:
+        """Push the baked pose of a frame to the scene items"""
+
+        self.bake()
+
+        assert self._range is not None
+        index = min(max(frame, self._range[0]), self._range[1]) - self._range[0]
+
+        # Tracks reading bone positions go after the bones and IK chains
+        ordered = sorted(
+            self._values.items(),
+            key=lambda item: item[0].property_type in POSE_DEPENDENT,
+        )
+        for track, values in ordered:
+            if not track.enabled:
+                continue
+
+            row = values[index]
+            value = QPointF(row[0], row[1]) if values.ndim == 2 else float(row)
+            self.animation.apply_value(track, value)
+
+            joints = self._ik_joints.get(track)
+            if joints is not None:
+                track.target.chain.apply_joints(joints[index])
+            elif track.property_type == PropertyType.IK_TARGET:
+                track.target.chain.solve(value)
+
+    def _bake_ik(self, tracks: list[AnimationTrack]) -> None:
+        if not tracks:
+            return
+
+        tracks = [track for track in tracks if track.target.chain.bones]
+        batch = BatchFABRIK([track.target.chain for track in tracks])
+
+        baked = [
+            np.empty((len(self.frames), len(track.target.chain.bones) + 1, 2))
+            for track in tracks
+        ]
+        # Every frame starts from the pose solved for the previous one, the
+        # first from the current pose, as sequential playback does
+        for i in range(len(self.frames)):
+            targets = [QPointF(*self._values[track][i]) for track in tracks]
+            solved = batch.solve(targets, apply=False, from_previous=i > 0)
+            for joints, chain_joints in zip(baked, solved):
+                joints[i] = chain_joints
+
+        self._ik_joints.update(zip(tracks, baked))
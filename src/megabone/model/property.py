@@ -8,3 +8,7 @@ class PropertyType(StrEnum):
     IK_TARGET = "ik_target"
     IK_POLE = "ik_pole"
     SPRITE_OFFSET = "sprite_offset"
+
+
+# Properties that read bone positions, applied once the bones are posed
+POSE_DEPENDENT = frozenset({PropertyType.IK_POLE, PropertyType.SPRITE_OFFSET})
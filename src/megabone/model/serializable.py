@@ -1,11 +1,35 @@
 from dataclasses import dataclass, field, fields
-from typing import Self, get_type_hints
+from enum import Enum
+from typing import Any, Callable, Self, get_type_hints
 from uuid import uuid4
 
+from megabone.qt import QPointF
 from megabone.util.types import Point
 
+# Per class field name -> value converter, None when stored as is
+_converters: dict[type, dict[str, Callable[[Any], Any] | None]] = {}
 
-@dataclass
+
+def _point_from_json(value) -> Point:
+    # Coordinates are floats however they were written
+    return Point(float(value[0]), float(value[1]))
+
+
+def _qpointf_from_json(value) -> QPointF:
+    return QPointF(value[0], value[1])
+
+
+def _converter_for(hint) -> Callable[[Any], Any] | None:
+    if hint is Point:
+        return _point_from_json
+    if hint is QPointF:
+        return _qpointf_from_json
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return hint
+    return None
+
+
+@dataclass(slots=True)
 class Serializable:
     id: str = field(default_factory=lambda: uuid4().hex)
     name: str = ""
@@ -19,17 +43,37 @@ class Serializable:
                 value = list(value)
             elif isinstance(value, Point):
                 value = (value.x, value.y)
+            elif isinstance(value, QPointF):
+                value = (value.x(), value.y())
+            elif isinstance(value, Enum):
+                value = value.value
             result[f.name] = value
         return result
 
+    @classmethod
+    def field_converters(cls) -> dict[str, Callable[[Any], Any] | None]:
+        """Converters of the init fields, resolved from type hints once per class"""
+
+        converters = _converters.get(cls)
+        if converters is None:
+            hints = get_type_hints(cls)
+            converters = {
+                f.name: _converter_for(hints.get(f.name)) for f in fields(cls) if f.init
+            }
+            _converters[cls] = converters
+        return converters
+
     @classmethod
     def from_dict(cls, data: dict) -> Self:
-        hints = get_type_hints(cls)
+        converters = cls.field_converters()
         converted_data = {}
 
         for key, value in data.items():
-            if hints.get(key) is Point:
-                value = Point(value[0], value[1])
-            converted_data[key] = value
+            # Keys of fields that no longer exist are ignored
+            if key not in converters:
+                continue
+
+            convert = converters[key]
+            converted_data[key] = value if convert is None else convert(value)
 
         return cls(**converted_data)
@@ -0,0 +1,205 @@
+import numpy as np
+
+from .bone import BoneData, BoneModel
+from .collection import ChangeSet, UpdateSource
+
+
+class SkeletonArrays:
+    """Index mapped NumPy view of the bones of a document.
+
+    Rows hold the start and end points, parent row and z index of every
+    bone in BoneModel and follow its signals. Removed bones are swapped with
+    the last row, so row numbers are only stable until the next removal and
+    must be looked up through index_of.
+
+    Rows are filled on first access, so a document mapped from a container
+    does not decode its bones until the skeleton is evaluated.
+    """
+
+    _initial_capacity = 64
+
+    def __init__(self, model: BoneModel):
+        self._model = model
+
+        self._ids: list[str] = []
+        self._parent_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._allocate(self._initial_capacity)
+
+        # Parent rows are resolved lazily after structural changes
+        self._parents_dirty = False
+
+        # Rows are reloaded from the model on next access
+        self._stale = True
+
+        model.itemAdded.connect(self._on_item_added)
+        model.itemRemoved.connect(self._on_item_removed)
+        model.itemModified.connect(self._on_item_modified)
+        model.itemsChanged.connect(self._on_items_changed)
+
+    def __len__(self) -> int:
+        self._ensure_rows()
+        return len(self._ids)
+
+    @property
+    def ids(self) -> list[str]:
+        self._ensure_rows()
+        return self._ids
+
+    @property
+    def start_points(self) -> np.ndarray:
+        return self._start[: len(self)]
+
+    @property
+    def end_points(self) -> np.ndarray:
+        return self._end[: len(self)]
+
+    @property
+    def parents(self) -> np.ndarray:
+        """Parent row of every bone, -1 for roots"""
+        count = len(self)
+        if self._parents_dirty:
+            self._resolve_parents()
+        return self._parent[:count]
+
+    @property
+    def z_order(self) -> np.ndarray:
+        return self._z[: len(self)]
+
+    @property
+    def stale(self) -> bool:
+        """True until the rows are next read from the model"""
+        return self._stale
+
+    def index_of(self, item_id: str) -> int | None:
+        self._ensure_rows()
+        return self._rows.get(item_id)
+
+    def reset(self) -> None:
+        """Reload every row from the model on next access, e.g. after a load"""
+        self._stale = True
+
+    def _ensure_rows(self) -> None:
+        if not self._stale:
+            return
+
+        self._stale = False
+        self._ids.clear()
+        self._parent_ids.clear()
+        self._rows.clear()
+
+        bones = [data for data in self._model.get_items() if isinstance(data, BoneData)]
+        self._allocate(max(self._initial_capacity, len(bones)))
+        for data in bones:
+            self._append(data)
+
+        self._parents_dirty = True
+
+    def _allocate(self, capacity: int) -> None:
+        self._start = np.zeros((capacity, 2))
+        self._end = np.zeros((capacity, 2))
+        self._parent = np.full(capacity, -1, dtype=np.int32)
+        self._z = np.zeros(capacity, dtype=np.int32)
+
+    def _grow(self) -> None:
+        count = len(self._ids)
+        start, end, parent, z = self._start, self._end, self._parent, self._z
+
+        self._allocate(len(start) * 2)
+        self._start[:count] = start[:count]
+        self._end[:count] = end[:count]
+        self._parent[:count] = parent[:count]
+        self._z[:count] = z[:count]
+
+    def _append(self, data: BoneData) -> None:
+        if len(self._ids) == len(self._start):
+            self._grow()
+
+        row = len(self._ids)
+        self._ids.append(data.id)
+        self._parent_ids.append(data.parent_id)
+        self._rows[data.id] = row
+        self._write(row, data)
+
+    def _write(self, row: int, data: BoneData) -> None:
+        self._start[row] = data.start_point.x, data.start_point.y
+        self._end[row] = data.end_point.x, data.end_point.y
+        self._z[row] = data.z_index
+
+    def _remove(self, item_id: str) -> None:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+
+        # Move the last row into the hole
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._parent_ids[row] = self._parent_ids[last]
+            self._rows[moved] = row
+
+            self._start[row] = self._start[last]
+            self._end[row] = self._end[last]
+            self._z[row] = self._z[last]
+
+        self._ids.pop()
+        self._parent_ids.pop()
+
+    def _update(self, item_id: str) -> None:
+        data = self._model.get_item(item_id)
+        row = self._rows.get(item_id)
+        if row is None or not isinstance(data, BoneData):
+            return
+
+        self._write(row, data)
+        if self._parent_ids[row] != data.parent_id:
+            self._parent_ids[row] = data.parent_id
+            self._parents_dirty = True
+
+    def _resolve_parents(self) -> None:
+        rows = self._rows
+        self._parent[: len(self._ids)] = [
+            rows.get(parent_id, -1) for parent_id in self._parent_ids
+        ]
+        self._parents_dirty = False
+
+    def _on_item_added(self, item_id: str) -> None:
+        if self._stale:
+            return
+
+        data = self._model.get_item(item_id)
+        if not isinstance(data, BoneData):
+            return
+
+        # Re-adding an id replaces its row
+        self._remove(item_id)
+        self._append(data)
+        self._parents_dirty = True
+
+    def _on_item_removed(self, item_id: str) -> None:
+        if self._stale:
+            return
+
+        self._remove(item_id)
+        self._parents_dirty = True
+
+    def _on_item_modified(self, item_id: str, source: UpdateSource) -> None:
+        if self._stale:
+            return
+
+        self._update(item_id)
+
+    def _on_items_changed(self, changes: ChangeSet) -> None:
+        # Stale rows are rebuilt from the model on next access anyway
+        if self._stale:
+            return
+
+        for item_id in changes.removed:
+            self._remove(item_id)
+        for item_id in changes.added:
+            self._on_item_added(item_id)
+        for item_id in changes.modified:
+            self._update(item_id)
+
+        self._parents_dirty = True
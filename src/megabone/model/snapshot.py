@@ -0,0 +1,62 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .container import write_container
+from .serializable import Serializable
+
+if TYPE_CHECKING:
+    from .document import Document
+
+
+@dataclass(frozen=True)
+class DocumentSnapshot:
+    """Immutable view of the collections of a document at one point in time.
+
+    Capturing only copies the item references of every collection, which
+    is safe because records are replaced rather than mutated once added.
+    The snapshot can then be written from any thread.
+    """
+
+    sections: dict[str, tuple[Serializable, ...]]
+
+    @classmethod
+    def capture(cls, document: "Document") -> "DocumentSnapshot":
+        # A mapped file may be overwritten by the write
+        document.release_container()
+
+        return cls(
+            {
+                collection.key_name: collection.snapshot()
+                for collection in document.get_all_collections()
+            }
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            key: [item.to_dict() for item in items]
+            for key, items in self.sections.items()
+        }
+
+    def write(self, path: Path, binary: bool = False) -> None:
+        """Write to path as JSON or as a binary container, durably.
+
+        The data goes to a sibling temp file that is synced to disk and then
+        replaces path, so a failed write never leaves a truncated file.
+        """
+
+        temp_file = path.with_name(path.name + ".tmp")
+
+        if binary:
+            write_container(temp_file, self.sections)
+        else:
+            temp_file.write_text(
+                json.dumps(self.to_dict(), indent=4), encoding="utf-8"
+            )
+
+        with temp_file.open("rb+") as file:
+            os.fsync(file.fileno())
+
+        temp_file.replace(path)
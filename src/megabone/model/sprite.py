@@ -21,7 +21,7 @@ class SpriteSheetData:
     frames: list[FrameData] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SpriteData(Serializable):
     name: str = "sprite"
     path: str = ""
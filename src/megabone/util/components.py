@@ -0,0 +1,105 @@
+import numpy as np
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row, first column and end column (exclusive) of every horizontal run"""
+
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    # Both scans are row major so starts and ends pair up in order
+    return rows, starts, ends
+
+
+def _touching_runs(
+    rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs of runs on consecutive rows that touch, diagonals included"""
+
+    # Runs sorted by row then column, keys grow monotonically in both
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+
+    # Runs of the row above overlapping [start - 1, end + 1)
+    above = (rows - 1) * stride
+    first = np.searchsorted(end_keys, above + starts, side="left")
+    last = np.searchsorted(start_keys, above + ends, side="right")
+
+    counts = np.maximum(last - first, 0)
+    total = int(counts.sum())
+
+    lower = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    upper = np.repeat(first, counts) + offsets
+
+    return upper, lower
+
+
+def _components(count: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Root of every node of a graph, the smallest node of its component"""
+
+    parent = np.arange(count)
+
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        pending = root_a != root_b
+        if not pending.any():
+            return parent
+
+        # Hook the larger root under the smaller one
+        low = np.minimum(root_a[pending], root_b[pending])
+        high = np.maximum(root_a[pending], root_b[pending])
+        np.minimum.at(parent, high, low)
+
+        # Pointer jumping until every node points at its root
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+
+def connected_boxes(mask: np.ndarray, min_area: int = 1) -> np.ndarray:
+    """Bounding boxes of the 8-connected islands of a boolean mask.
+
+    Returns an (n, 4) array of x, y, width and height sorted top to bottom
+    and then left to right, skipping islands with fewer than min_area set
+    pixels. Labeling works on horizontal runs instead of pixels, so the cost
+    follows the amount of sprite edges rather than the sheet size.
+    """
+
+    rows, starts, ends = _runs(mask)
+    if not len(rows):
+        return np.empty((0, 4), dtype=np.int64)
+
+    upper, lower = _touching_runs(rows, starts, ends, mask.shape[1])
+    roots = _components(len(rows), upper, lower)
+
+    labels, component = np.unique(roots, return_inverse=True)
+    count = len(labels)
+
+    left = np.full(count, mask.shape[1])
+    top = np.full(count, mask.shape[0])
+    right = np.zeros(count, dtype=np.int64)
+    bottom = np.zeros(count, dtype=np.int64)
+    area = np.zeros(count, dtype=np.int64)
+
+    np.minimum.at(left, component, starts)
+    np.minimum.at(top, component, rows)
+    np.maximum.at(right, component, ends)
+    np.maximum.at(bottom, component, rows + 1)
+    np.add.at(area, component, ends - starts)
+
+    keep = area >= min_area
+    boxes = np.stack(
+        [left[keep], top[keep], right[keep] - left[keep], bottom[keep] - top[keep]],
+        axis=1,
+    )
+
+    return boxes[np.lexsort((boxes[:, 0], boxes[:, 1]))]
@@ -1,4 +1,8 @@
 _DEFAULT_FILE_EXT = ".json"
 _DEFAULT_DESCRIPTOR = f"Megabone project file (*{_DEFAULT_FILE_EXT})"
+_BINARY_FILE_EXT = ".mgb"
+_BINARY_DESCRIPTOR = f"Megabone binary project file (*{_BINARY_FILE_EXT})"
+_OPEN_DESCRIPTOR = f"Megabone project files (*{_DEFAULT_FILE_EXT} *{_BINARY_FILE_EXT})"
 _SETTINGS_COMPANY_NAME = "paspallas.dev.works"
 _SETTINGS_APP_NAME = "megabone"
+_SETTINGS_OPENGL_VIEWPORT = "opengl_viewport"
@@ -1,6 +1,12 @@
 import random
+import sys
+from collections.abc import Iterable
+from enum import Enum, auto
+
+import numpy as np
 
 from megabone.qt import (
+    QBrush,
     QColor,
     QGraphicsItem,
     QGraphicsPixmapItem,
@@ -11,12 +17,29 @@ from megabone.qt import (
     QPen,
     QPixmap,
     QPoint,
+    QRect,
     QRectF,
     QSize,
     Qt,
-    qAlpha,
 )
 
+from megabone.util.components import connected_boxes
+
+# Byte of the alpha channel in a 32 bit ARGB pixel as stored in memory
+_ALPHA_BYTE = 3 if sys.byteorder == "little" else 0
+
+_ALPHA_FORMATS = (
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+)
+
+
+class SliceMode(Enum):
+    GRID = auto()
+    """Fixed size cells from an offset"""
+    AUTO = auto()
+    """Tight bounds of every island of opaque pixels"""
+
 
 class Image:
     @staticmethod
@@ -52,7 +75,32 @@ class Image:
         return background
 
     @staticmethod
-    def grid(
+    def checker_brush(check_size: int = 32) -> QBrush:
+        """Texture brush tiling the checker_board pattern from its origin"""
+
+        dark = QColor("#404040")
+        light = QColor("#666666")
+
+        tile = QPixmap(2 * check_size, 2 * check_size)
+        tile.fill(dark)
+
+        painter = QPainter(tile)
+        painter.fillRect(0, 0, check_size, check_size, light)
+        painter.fillRect(check_size, check_size, check_size, check_size, light)
+        painter.end()
+
+        return QBrush(tile)
+
+    @staticmethod
+    def grid_pen() -> QPen:
+        """Pen of frame outlines, one device pixel wide at any zoom"""
+
+        pen = QPen(QColor(220, 220, 220), 1, Qt.PenStyle.DashLine)
+        pen.setCosmetic(True)
+        return pen
+
+    @staticmethod
+    def grid_rects(
         size: QSize,
         frame_width: int,
         frame_height: int,
@@ -60,13 +108,9 @@ class Image:
         offset_y: int = 0,
         space_x: int = 0,
         space_y: int = 0,
-    ) -> QPixmap:
-        grid_pixmap = QPixmap(size)
-        grid_pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(grid_pixmap)
-        pen = QPen(QColor(220, 220, 220), 1, Qt.PenStyle.DashLine)
-        pen.setCosmetic(True)
-        painter.setPen(pen)
+        within: QRect | None = None,
+    ) -> list[QRect]:
+        """Frame cells of a sheet of size, only those touching within if given"""
 
         # Compute number of rows and cols
         img_width = size.width() - offset_x
@@ -78,30 +122,103 @@ class Image:
         cols = (img_width + space_x) // total_width
         rows = (img_height + space_y) // total_height
 
-        # Draw frame boundaries
-        for row in range(rows):
-            for col in range(cols):
-                x = offset_x + col * total_width
-                y = offset_y + row * total_height
-                painter.drawRect(x, y, frame_width, frame_height)
+        first_col, first_row = 0, 0
+        if within is not None:
+            # Cells whose outline can cross the region, borders included
+            first_col = max((within.left() - offset_x) // total_width - 1, 0)
+            first_row = max((within.top() - offset_y) // total_height - 1, 0)
+            cols = min(cols, (within.right() - offset_x) // total_width + 2)
+            rows = min(rows, (within.bottom() - offset_y) // total_height + 2)
+
+        return [
+            QRect(
+                offset_x + col * total_width,
+                offset_y + row * total_height,
+                frame_width,
+                frame_height,
+            )
+            for row in range(first_row, rows)
+            for col in range(first_col, cols)
+        ]
 
-        painter.end()
-        return grid_pixmap
+    @staticmethod
+    def remove_background(
+        image: QImage, bg_color: QColor, tolerance: int = 0
+    ) -> QImage:
+        """ARGB32 copy of image with the pixels of bg_color made transparent"""
+        keyed = image.convertToFormat(QImage.Format.Format_ARGB32)
+        Image.key_colors(keyed, [bg_color], tolerance)
+        return keyed
+
+    @staticmethod
+    def key_colors(image: QImage, colors: Iterable[QColor], tolerance: int = 0) -> None:
+        """Make the pixels close to any of colors transparent, in place.
+
+        A pixel matches when none of its ARGB channels differs from the key
+        by more than tolerance. Only QImage is used, so it can run on worker
+        threads.
+        """
+        if image.format() != QImage.Format.Format_ARGB32:
+            raise ValueError("Expected a Format_ARGB32 image")
+
+        # bits() detaches the image from copies sharing its buffer
+        pixels = np.frombuffer(image.bits(), dtype=np.uint32).reshape(
+            image.height(), image.bytesPerLine() // 4
+        )[:, : image.width()]
+
+        matches = np.zeros(pixels.shape, dtype=bool)
+        if tolerance <= 0:
+            for color in colors:
+                matches |= pixels == color.rgba()
+        else:
+            for color in colors:
+                matches |= Image._near(pixels, color.rgba(), tolerance)
+
+        pixels[matches] = 0
+
+    @staticmethod
+    def _near(pixels: np.ndarray, rgba: int, tolerance: int) -> np.ndarray:
+        """Pixels whose every channel lies within tolerance of rgba"""
+
+        # Bytes of a 32 bit pixel in memory order
+        key = np.array([rgba], dtype=np.uint32).view(np.uint8).astype(np.int16)
+        low = np.clip(key - tolerance, 0, 255).astype(np.uint8)
+        span = (np.clip(key + tolerance, 0, 255) - low).astype(np.uint8)
+
+        # Rows of bytes against the bounds repeated once per pixel, wrapping
+        # uint8 subtraction turns each range check into a single compare
+        width = pixels.shape[1]
+        rows = np.ascontiguousarray(pixels).view(np.uint8)
+        inside = (rows - np.tile(low, width)) <= np.tile(span, width)
+
+        # All four channel checks of a pixel passed
+        return inside.view(np.uint32) == 0x01010101
+
+    @staticmethod
+    def with_alpha(image: QImage) -> QImage:
+        """The image itself if it is 32 bit ARGB, else an ARGB32 copy"""
+        if image.format() in _ALPHA_FORMATS:
+            return image
+        return image.convertToFormat(QImage.Format.Format_ARGB32)
 
     @staticmethod
-    def remove_background(image: QImage, bg_color: QColor):
-        pixmap = QPixmap.fromImage(image)
-        pixmap.setMask(pixmap.createMaskFromColor(bg_color))
+    def alpha_channel(image: QImage) -> np.ndarray:
+        """Read only (height, width) view of the alpha bytes of an ARGB32 image.
+
+        No pixels are copied, so the image must outlive the array.
+        """
+        if image.format() not in _ALPHA_FORMATS:
+            raise ValueError("Expected a 32 bit ARGB image, see Image.with_alpha")
 
-        return pixmap.toImage()
+        rows = np.frombuffer(image.constBits(), dtype=np.uint8).reshape(
+            image.height(), image.bytesPerLine()
+        )
+        return rows[:, _ALPHA_BYTE : image.width() * 4 : 4]
 
     @staticmethod
     def is_transparent(image: QImage) -> bool:
-        for y in range(image.height()):
-            for x in range(image.width()):
-                if qAlpha(image.pixel(x, y)) != 0:
-                    return False
-        return True
+        image = Image.with_alpha(image)
+        return not Image.alpha_channel(image).any()
 
     @staticmethod
     def set_alpha(alpha: int, pixmap: QPixmap) -> QPixmap:
@@ -204,17 +321,78 @@ class Image:
         frame_height: int,
         offset_x: int = 0,
         offset_y: int = 0,
+        mode: SliceMode = SliceMode.GRID,
     ) -> list[QPixmap]:
+        frames = Image.extract_frames(
+            image, frame_width, frame_height, offset_x, offset_y, mode
+        )
+        return [QPixmap.fromImage(frame) for frame in frames]
+
+    @staticmethod
+    def extract_frames(
+        image: QImage,
+        frame_width: int,
+        frame_height: int,
+        offset_x: int = 0,
+        offset_y: int = 0,
+        mode: SliceMode = SliceMode.GRID,
+    ) -> list[QImage]:
+        """Non empty frames of image, safe to call from worker threads.
+
+        The frame size and offset are ignored when auto detecting.
+        """
+
+        match mode:
+            case SliceMode.AUTO:
+                image = Image.with_alpha(image)
+                return [image.copy(rect) for rect in Image.sprite_rects(image)]
+            case SliceMode.GRID:
+                return Image._extract_grid(
+                    image, frame_width, frame_height, offset_x, offset_y
+                )
+
+    @staticmethod
+    def sprite_rects(image: QImage, min_area: int = 4) -> list[QRect]:
+        """Bounds of the 8-connected opaque islands of image in reading order.
+
+        Islands of fewer than min_area pixels are treated as noise.
+        """
+
+        image = Image.with_alpha(image)
+        boxes = connected_boxes(Image.alpha_channel(image) != 0, min_area)
+        return [QRect(*box) for box in boxes.tolist()]
+
+    @staticmethod
+    def _extract_grid(
+        image: QImage,
+        frame_width: int,
+        frame_height: int,
+        offset_x: int,
+        offset_y: int,
+    ) -> list[QImage]:
         cols = (image.width() - offset_x) // frame_width
         rows = (image.height() - offset_y) // frame_height
+        if cols <= 0 or rows <= 0:
+            return []
 
-        sprites = []
+        image = Image.with_alpha(image)
 
-        for row in range(rows):
-            for col in range(cols):
-                x = (col * frame_width) + offset_x
-                y = (row * frame_height) + offset_y
-                sprite = image.copy(x, y, frame_width, frame_height)
-                if not Image.is_transparent(sprite):
-                    sprites.append(QPixmap.fromImage(sprite))
-        return sprites
+        # Any opaque pixel per cell, reduced over the whole grid at once
+        alpha = Image.alpha_channel(image)[
+            offset_y : offset_y + rows * frame_height,
+            offset_x : offset_x + cols * frame_width,
+        ]
+        occupied = alpha.reshape(rows, frame_height, cols, frame_width).any(
+            axis=(1, 3)
+        )
+
+        # Only cells with content are copied out, in row major order
+        return [
+            image.copy(
+                int(col) * frame_width + offset_x,
+                int(row) * frame_height + offset_y,
+                frame_width,
+                frame_height,
+            )
+            for row, col in zip(*np.nonzero(occupied))
+        ]
@@ -0,0 +1,67 @@
+import megabone.util.constants as c
+from megabone.qt import (
+    QGraphicsView,
+    QOpenGLContext,
+    QOpenGLWidget,
+    QSettings,
+    QSurfaceFormat,
+)
+
+_available: bool | None = None
+
+
+def viewport_format() -> QSurfaceFormat:
+    """OpenGL 2.1 compatibility format, also provided by software Mesa"""
+
+    fmt = QSurfaceFormat()
+    fmt.setRenderableType(QSurfaceFormat.RenderableType.OpenGL)
+    fmt.setVersion(2, 1)
+    fmt.setProfile(QSurfaceFormat.OpenGLContextProfile.CompatibilityProfile)
+    fmt.setSwapInterval(1)
+    return fmt
+
+
+def opengl_available() -> bool:
+    """Check once whether a context can be created with the viewport format"""
+
+    global _available
+    if _available is None:
+        context = QOpenGLContext()
+        context.setFormat(viewport_format())
+        _available = context.create()
+    return _available
+
+
+def opengl_enabled() -> bool:
+    settings = QSettings(c._SETTINGS_COMPANY_NAME, c._SETTINGS_APP_NAME)
+    return settings.value(c._SETTINGS_OPENGL_VIEWPORT, False, type=bool)
+
+
+def set_opengl_enabled(enabled: bool) -> None:
+    """Opt in to OpenGL viewports for views created from now on"""
+
+    settings = QSettings(c._SETTINGS_COMPANY_NAME, c._SETTINGS_APP_NAME)
+    settings.setValue(c._SETTINGS_OPENGL_VIEWPORT, enabled)
+
+
+def use_opengl_viewport(view: QGraphicsView, enabled: bool | None = None) -> bool:
+    """Paint a view through OpenGL when enabled, False if it stays raster.
+
+    The whole framebuffer is redrawn every frame, so partial viewport
+    updates only add bookkeeping. Pixmaps are uploaded as textures on first
+    draw and reused while their cache key is unchanged, which is why sprites
+    should draw the shared ResourceManager pixmaps rather than item caches.
+    enabled overrides the stored setting when given.
+    """
+
+    if enabled is None:
+        enabled = opengl_enabled()
+
+    if not enabled or not opengl_available():
+        return False
+
+    viewport = QOpenGLWidget()
+    viewport.setFormat(viewport_format())
+    view.setViewport(viewport)
+    view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+    return True
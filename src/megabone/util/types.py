@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import NamedTuple
+import math
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
 
 
 class Size(NamedTuple):
@@ -9,20 +10,61 @@ class Size(NamedTuple):
     h: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     x: float = 0.0
     y: float = 0.0
 
+    # Last QPointF conversion with the coordinates it was made from
+    _qpointf: tuple[float, float, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def to_qpointf(self):
+        """QPointF of this point, shared between calls so don't mutate it"""
+        cached = self._qpointf
+        if cached is not None and cached[0] == self.x and cached[1] == self.y:
+            return cached[2]
+
         from megabone.qt import QPointF
 
-        return QPointF(self.x, self.y)
+        point = QPointF(self.x, self.y)
+        self._qpointf = (self.x, self.y, point)
+        return point
 
     @classmethod
     def from_qpointf(cls, point) -> "Point":
         return cls(x=point.x(), y=point.y())
 
+    # In place variants for scratch points the caller owns. Records and bone
+    # items share their points, those must be replaced instead
+
+    def set(self, x: float, y: float) -> "Point":
+        self.x = x
+        self.y = y
+        return self
+
+    def iadd(self, other: "Point") -> "Point":
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def isub(self, other: "Point") -> "Point":
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def imul(self, scalar: float) -> "Point":
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def inormalize(self) -> "Point":
+        length = math.hypot(self.x, self.y)
+        if length == 0:
+            return self.set(0.0, 0.0)
+        return self.imul(1 / length)
+
     def __add__(self, other: "Point") -> "Point":
         return Point(self.x + other.x, self.y + other.y)
 
@@ -54,12 +96,10 @@ class Point:
         return self.x == other.x and self.y == other.y
 
     def length(self) -> float:
-        import math
-
-        return math.sqrt(self.x**2 + self.y**2)
+        return math.hypot(self.x, self.y)
 
     def normalized(self) -> "Point":
-        length = self.length()
+        length = math.hypot(self.x, self.y)
         if length == 0:
             return Point(0.0, 0.0)
         return Point(self.x / length, self.y / length)
@@ -68,7 +108,7 @@ class Point:
         return self.x * other.x + self.y * other.y
 
     def distance_to(self, other: "Point") -> float:
-        return (self - other).length()
+        return math.hypot(self.x - other.x, self.y - other.y)
 
     def __iter__(self):
         yield self.x
@@ -1,3 +1,4 @@
+from megabone.model.animation import Animation
 from megabone.qt import (
     QHBoxLayout,
     QLabel,
@@ -37,10 +38,15 @@ class AnimationPlayer(QWidget):
         self.play_button = QPushButton("Play")
         self.play_button.clicked.connect(self.togglePlay)
 
+        self.bake_button = QPushButton("Bake")
+        self.bake_button.setCheckable(True)
+        self.bake_button.toggled.connect(self.setBaked)
+
         self.frame_spinbox = QSpinBox()
         self.frame_spinbox.valueChanged.connect(self.setFrame)
 
         controls_layout.addWidget(self.play_button)
+        controls_layout.addWidget(self.bake_button)
         controls_layout.addWidget(QLabel("Frame:"))
         controls_layout.addWidget(self.frame_spinbox)
 
@@ -61,8 +67,18 @@ class AnimationPlayer(QWidget):
     def setAnimation(self, name):
         if name in self.animations:
             self.current_animation = self.animations[name]
+            self.bake_button.setChecked(self.current_animation.baked)
             self.updateUI()
 
+    def setBaked(self, baked: bool):
+        if not self.current_animation:
+            return
+
+        if baked:
+            self.current_animation.bake()
+        else:
+            self.current_animation.unbake()
+
     def togglePlay(self):
         self.playing = not self.playing
 
@@ -108,7 +124,7 @@ class AnimationPlayer(QWidget):
                 kf_item = QTreeWidgetItem()
                 kf_item.setText(0, f"Frame {keyframe.frame}")
                 kf_item.setText(1, str(keyframe.value))
-                kf_item.setText(2, keyframe.easing)
+                kf_item.setText(2, keyframe.easing.name)
                 item.addChild(kf_item)
 
             self.tracks_tree.addTopLevelItem(item)
@@ -1,11 +1,17 @@
+from dataclasses import replace
+from typing import Iterable
+
+from megabone.command.document import ReorderCommand, ZIndexChange
 from megabone.command.sprite import CreateSpriteCommand
 from megabone.editor.item import BoneItem, ItemFactory
 from megabone.editor.item.model_item import ModelBoundItem
-from megabone.editor.item.sprite import SpriteItem
-from megabone.editor.layer import LayerManager
+from megabone.editor.layer import Layer, LayerManager
+from megabone.editor.skeleton import SkeletonEvaluator
 from megabone.manager.resource import ResourceManager
 from megabone.model.bone import BoneData
+from megabone.model.collection import BaseCollectionModel, ChangeSet, UpdateSource
 from megabone.model.document import Document
+from megabone.model.serializable import Serializable
 from megabone.model.sprite import SpriteData
 from megabone.qt import (
     QColor,
@@ -36,51 +42,208 @@ class ModalEditorScene(QGraphicsScene):
     def __init__(self, *args, document: Document, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Editor modes pick through the per layer grids of the layer manager.
+        # Qt keeps its BSP index for hover and its own item lookups, without
+        # it those scan every item (see bench/hit_testing.py)
         self.layer_manager = LayerManager(self)
+        self.layer_manager.keys_changed = self._on_layer_keys_changed
         self.document = document
-        self.document.documentModified.connect(self.rebuild)
         self.overlay = OverlayItem()
 
+        # Model record id -> bound scene item
+        self._item_index: dict[str, ModelBoundItem] = {}
+
+        # Bone id -> recorded parent id, and parent id -> child bone ids. A
+        # child stays listed under a removed parent so undo can reattach it
+        self._parent_ids: dict[str, str] = {}
+        self._child_ids: dict[str, set[str]] = {}
+
+        # Bone hierarchy evaluated in parent before child order
+        self.skeleton = SkeletonEvaluator(self.document, self._item_index)
+
+        # Keep the scene in sync with per record changes
+        for model in self.document.get_all_collections():
+            model.itemAdded.connect(
+                lambda item_id, m=model: self._on_item_added(m, item_id)
+            )
+            model.itemRemoved.connect(self._on_item_removed)
+            model.itemModified.connect(self._on_item_modified)
+            model.itemsChanged.connect(
+                lambda changes, m=model: self._on_items_changed(m, changes)
+            )
+
         # Add items from a document loaded from file
-        ItemFactory.add_items_from_document(document, self)
+        self.rebuild()
 
     def setOverlaySize(self, rect: QRect) -> None:
         self.overlay.setRect(
             -rect.width() / 2, -rect.height() / 2, rect.width(), rect.height()
         )
 
-    def add_item(self, item: QGraphicsItem) -> int:
+    def add_item(self, item: QGraphicsItem, z_index: int | None = None) -> int:
         self.addItem(item)
         item.setSelected(False)
 
-        return self.layer_manager.add_item(item)
+        return self.layer_manager.add_item(item, z_index)
 
     def remove_item(self, item: QGraphicsItem) -> None:
         self.layer_manager.remove_item(item)
         self.removeItem(item)
 
+    def get_model_item(self, item_id: str) -> ModelBoundItem | None:
+        return self._item_index.get(item_id)
+
     def rebuild(self) -> None:
         """Recreate the scene with model bound items"""
 
         self.layer_manager.clear()
+        self._item_index.clear()
+        self._parent_ids.clear()
+        self._child_ids.clear()
+        self.skeleton.invalidate()
         self.clear()
 
         for model in self.document.get_all_collections():
-            for data in model.get_items():
-                item: ModelBoundItem | None = None
+            # Collections without scene items, e.g. keyframes, may stay mapped
+            # from file until something else reads them
+            if not ItemFactory.creates_items_for(model.data_class):
+                continue
 
-                if isinstance(data, BoneData):
-                    item = BoneItem(document=self.document, id=data.id)
-                elif isinstance(data, SpriteData):
-                    item = SpriteItem(document=self.document, id=data.id)
+            for data in model.get_items():
+                self._create_item(data)
 
-                if item:
-                    # TODO loaded files already have z index set in the model
-                    data.z_index = self.add_item(item)
-                    item.apply_data_from_model(data)
+        for item in self._item_index.values():
+            if isinstance(item, BoneItem):
+                self._link_parent_bone(item)
 
         self.sceneRebuilt.emit()
 
+    def _create_item(self, data: Serializable) -> ModelBoundItem | None:
+        item = ItemFactory.create_item(self.document, data)
+        if not isinstance(item, ModelBoundItem):
+            return None
+
+        # Keep the stored order, items without one go on top of their layer
+        self.add_item(item, data.z_index)
+        item.apply_data_from_model(data)
+        self._item_index[data.id] = item
+
+        return item
+
+    def _link_parent_bone(self, bone: BoneItem) -> None:
+        data = self.document.bones.get_item(bone.id)
+        if not isinstance(data, BoneData):
+            return
+
+        self._index_parent(bone.id, data.parent_id)
+
+        parent = self._item_index.get(data.parent_id) if data.parent_id else None
+        if parent is not bone.parent_bone:
+            bone.set_parent_bone(parent if isinstance(parent, BoneItem) else None)
+            self.skeleton.invalidate()
+
+    def _index_parent(self, bone_id: str, parent_id: str | None) -> None:
+        old_parent_id = self._parent_ids.pop(bone_id, None)
+        if old_parent_id is not None:
+            siblings = self._child_ids[old_parent_id]
+            siblings.discard(bone_id)
+            if not siblings:
+                del self._child_ids[old_parent_id]
+
+        if parent_id:
+            self._parent_ids[bone_id] = parent_id
+            self._child_ids.setdefault(parent_id, set()).add(bone_id)
+
+    def _on_item_added(self, model: BaseCollectionModel, item_id: str) -> None:
+        data = model.get_item(item_id)
+        if data is None:
+            return
+
+        # Re-adding a record (e.g. undo of a delete) replaces any stale item
+        self._on_item_removed(item_id)
+
+        item = self._create_item(data)
+        if not isinstance(item, BoneItem):
+            return
+
+        self.skeleton.invalidate()
+        self._link_parent_bone(item)
+
+        # Reattach children that outlived this bone (e.g. undo of a delete)
+        for child_id in self._child_ids.get(item_id, ()):
+            child = self._item_index.get(child_id)
+            if isinstance(child, BoneItem):
+                child.set_parent_bone(item)
+
+    def _on_item_removed(self, item_id: str) -> None:
+        item = self._item_index.pop(item_id, None)
+        if item is None:
+            return
+
+        if isinstance(item, BoneItem):
+            self._index_parent(item_id, None)
+            for child in list(item.child_bones):
+                child.detach_from_parent()
+            item.detach_from_parent()
+            self.skeleton.invalidate()
+
+        self.remove_item(item)
+
+    def _on_item_modified(self, item_id: str, source: UpdateSource) -> None:
+        self._refresh_item(item_id)
+
+    def _on_items_changed(self, model: BaseCollectionModel, changes: ChangeSet) -> None:
+        for item_id in changes.removed:
+            self._on_item_removed(item_id)
+        for item_id in changes.added:
+            self._on_item_added(model, item_id)
+        self._refresh_items(changes.modified)
+
+    def _refresh_item(self, item_id: str) -> None:
+        self._refresh_items([item_id])
+
+    def _refresh_items(self, item_ids: Iterable[str]) -> None:
+        restack: dict[ModelBoundItem, int] = {}
+
+        for item_id in item_ids:
+            item = self._item_index.get(item_id)
+            if item is None:
+                continue
+
+            data = item.current_data_from_model()
+            item.apply_data_from_model(data)
+            if isinstance(item, BoneItem):
+                self._link_parent_bone(item)
+
+            # Stored order changed by the model, e.g. undo of a reorder
+            if data.z_index >= 0 and data.z_index != item.z_index:
+                restack[item] = data.z_index
+
+        if restack:
+            self.layer_manager.restack(restack)
+
+    def _on_layer_keys_changed(self, items: list, undoable: bool) -> None:
+        """Store the keys the layer order gave to items in their records"""
+
+        changes: list[ZIndexChange] = []
+        for item in dict.fromkeys(items):
+            if not isinstance(item, ModelBoundItem):
+                continue
+
+            data = item.model.get_item(item.id)
+            if data is None or data.z_index == item.z_index:
+                continue
+
+            if undoable:
+                changes.append((item.model, item.id, data.z_index, item.z_index))
+            else:
+                # Keys assigned on load, insert or renumbering follow from the
+                # stored order, they are neither an undo step nor an edit
+                item.model.store_item(replace(data, z_index=item.z_index))
+
+        if changes:
+            self.document.push(ReorderCommand(self.document, changes))
+
     def on_sprite_drop(self, path: str, index: int, position: Point) -> None:
         """Add sprite to document from sprite palette"""
 
@@ -93,6 +256,6 @@ class ModalEditorScene(QGraphicsScene):
             path=path,
             frame_index=index,
             position=position,
-            z_index=self.layer_manager.get_next_index(),
+            z_index=self.layer_manager.get_next_index(Layer.SPRITE),
         )
         self.document.push(CreateSpriteCommand(self.document, data))
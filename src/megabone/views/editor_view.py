@@ -1,18 +1,49 @@
+import time
+from enum import Enum, auto
+
 from megabone.controller.editor_protocol import EditorControllerProtocol
 from megabone.editor.grid import EditorGrid
+from megabone.editor.layer import Layer
 from megabone.event_filter import PanControl, ZoomControl
 from megabone.model.document import Document
 from megabone.qt import (
     QFrame,
+    QGraphicsItem,
     QGraphicsView,
+    QKeySequence,
+    QRect,
+    QRegion,
+    QShortcut,
     QSizePolicy,
     Qt,
 )
+from megabone.util.opengl import use_opengl_viewport
 from megabone.util.types import Point
+from megabone.widget import RepaintOverlay
 
 from .editor_scene import ModalEditorScene
 
 
+class ViewUpdateStrategy(Enum):
+    """How much of the viewport is repainted when scene items change"""
+
+    FULL = auto()
+    BOUNDING_RECT = auto()
+    SMART = auto()
+    MINIMAL = auto()
+
+    def viewport_update_mode(self) -> QGraphicsView.ViewportUpdateMode:
+        match self:
+            case ViewUpdateStrategy.FULL:
+                return QGraphicsView.ViewportUpdateMode.FullViewportUpdate
+            case ViewUpdateStrategy.BOUNDING_RECT:
+                return QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate
+            case ViewUpdateStrategy.SMART:
+                return QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+            case ViewUpdateStrategy.MINIMAL:
+                return QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate
+
+
 class MainEditorView(QGraphicsView):
     _width = 512
     _height = 512
@@ -28,9 +59,19 @@ class MainEditorView(QGraphicsView):
         )
         self.setScene(self.modal_scene)
 
+        if self.opengl:
+            # Sprites draw the shared sheet pixmaps, each uploaded once as a
+            # texture, instead of per item cache pixmaps
+            self.modal_scene.layer_manager.set_layer_cache_mode(
+                Layer.SPRITE, QGraphicsItem.CacheMode.NoCache
+            )
+
         self.grid = EditorGrid(self, size=grid_size)
         self.controller: EditorControllerProtocol | None = None
 
+        self.repaint_overlay = RepaintOverlay(self)
+        self._setup_shortcuts()
+
     def _configure_view(self):
         self.centerOn(0, 0)
         self.setContentsMargins(0, 0, 0, 0)
@@ -38,7 +79,10 @@ class MainEditorView(QGraphicsView):
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.NoAnchor)
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        self.opengl = use_opengl_viewport(self)
+        self.set_update_strategy(
+            ViewUpdateStrategy.FULL if self.opengl else ViewUpdateStrategy.SMART
+        )
         self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
         self.setFrameStyle(QFrame.Shape.NoFrame)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -48,6 +92,53 @@ class MainEditorView(QGraphicsView):
         ZoomControl(self)
         PanControl(self)
 
+    def _setup_shortcuts(self) -> None:
+        self.toggle_overlay = QShortcut(QKeySequence(Qt.Key.Key_F9), self)
+        self.toggle_overlay.activated.connect(
+            lambda: self.repaint_overlay.setVisible(
+                not self.repaint_overlay.isVisible()
+            )
+        )
+
+        self.cycle_strategy = QShortcut(QKeySequence(Qt.Key.Key_F10), self)
+        self.cycle_strategy.activated.connect(self._next_update_strategy)
+
+    def set_update_strategy(self, strategy: ViewUpdateStrategy) -> None:
+        self.update_strategy = strategy
+        self.setViewportUpdateMode(strategy.viewport_update_mode())
+
+    def _next_update_strategy(self) -> None:
+        strategies = list(ViewUpdateStrategy)
+        index = strategies.index(self.update_strategy)
+        self.set_update_strategy(strategies[(index + 1) % len(strategies)])
+
+    def paintEvent(self, event) -> None:
+        if not self.repaint_overlay.isVisible():
+            super().paintEvent(event)
+            return
+
+        start = time.perf_counter()
+        super().paintEvent(event)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # Every report repaints the viewport under the translucent overlay,
+        # that area is not part of the scene update being measured
+        overlay = self.repaint_overlay
+        overlay_rect = QRect(
+            self.viewport().mapFrom(self, overlay.pos()), overlay.size()
+        )
+        region = event.region().subtracted(QRegion(overlay_rect))
+        if region.isEmpty():
+            return
+
+        viewport = self.viewport().rect()
+        overlay.report(
+            self.update_strategy.name,
+            region,
+            viewport.width() * viewport.height(),
+            elapsed,
+        )
+
     def showModalDialog(self):
         viewport = self.viewport()
         assert viewport is not None, "Editor view has no viewport"
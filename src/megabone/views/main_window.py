@@ -8,7 +8,7 @@ from megabone.manager.autosave import AutoSaveManager
 from megabone.manager.dock import DockConfig, DockManager
 from megabone.manager.document import DocumentManager
 from megabone.manager.status import StatusBarManager as status
-from megabone.qt import QStatusBar, Qt, QToolBar
+from megabone.qt import QCloseEvent, QStatusBar, Qt, QToolBar
 from megabone.widget import HistoryPanel, SpritePalettePanel, ZenWindow
 
 
@@ -61,6 +61,11 @@ class AppMainWindow(ZenWindow):
         self.app_controller.requestZenMode.connect(self.toggle_zen_mode)
         self.app_controller.requestQuit.connect(self.close)
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        # Let saves still being written finish before the process exits
+        self.documents.save_queue.wait()
+        super().closeEvent(event)
+
     def _populate_dock(self):
         show_menu = self.menu.get_builder(MenuType.VIEW).get_submenu("Show")
 
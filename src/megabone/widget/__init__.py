@@ -1,5 +1,6 @@
 from .custom_dock import CustomDockWidget, DockCloseAction
 from .history import HistoryPanel
+from .repaint_overlay import RepaintOverlay
 from .sprite_palette import SpritePalettePanel
 from .welcome import WelcomeWidget
 from .zen_window import ZenWindow
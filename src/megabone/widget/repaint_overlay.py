@@ -0,0 +1,22 @@
+from megabone.qt import QLabel, QRegion, Qt, QWidget
+
+
+class RepaintOverlay(QLabel):
+    """Report the area and time of the last viewport repaint"""
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: white; padding: 4px;"
+        )
+        self.move(8, 8)
+        self.hide()
+
+    def report(self, strategy: str, region: QRegion, viewport_area: int, ms: float):
+        area = sum(rect.width() * rect.height() for rect in region)
+        percent = 100 * area / viewport_area if viewport_area else 0
+
+        self.setText(f"{strategy}\n{area} px ({percent:.1f}%)\n{ms:.2f} ms")
+        self.adjustSize()
@@ -1,8 +1,11 @@
+from pathlib import Path
+
 from megabone.dialog import FileDialog
 from megabone.dialog.sprite_sheet_dialog import SpriteSheetDialog
 from megabone.event_filter import PanControl, ZoomControl
 from megabone.manager.resource import ResourceManager
-from megabone.model.sprite import FrameData, SpriteSheetData
+from megabone.manager.sprite_import import SliceSettings, SpriteSheetImporter
+from megabone.model.sprite import SpriteSheetData
 from megabone.qt import (
     QAction,
     QDialog,
@@ -19,6 +22,7 @@ from megabone.qt import (
     QMessageBox,
     QMimeData,
     QPixmap,
+    QProgressDialog,
     QSizePolicy,
     QSplitter,
     Qt,
@@ -26,6 +30,7 @@ from megabone.qt import (
     QVBoxLayout,
     QWidget,
 )
+from megabone.util.opengl import use_opengl_viewport
 
 
 class SpritePalettePanel(QWidget):
@@ -33,6 +38,14 @@ class SpritePalettePanel(QWidget):
         super().__init__(parent)
         self._sheets: dict[str, SpriteSheetData] = {}  # path → sheet
 
+        self._importer = SpriteSheetImporter(self)
+        self._importer.sheetImported.connect(self._add_sheet)
+        self._importer.sheetFailed.connect(self._on_import_failed)
+        self._importer.progress.connect(self._on_import_progress)
+        self._importer.finished.connect(self._on_import_finished)
+        self._import_progress: QProgressDialog | None = None
+        self._import_errors: list[str] = []
+
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -53,7 +66,7 @@ class SpritePalettePanel(QWidget):
 
         self._add_btn = QToolButton()
         self._add_btn.setText("+")
-        self._add_btn.setToolTip("Import spritesheet")
+        self._add_btn.setToolTip("Import spritesheets")
         self._add_btn.clicked.connect(self._import_png)
         header.addWidget(self._add_btn)
 
@@ -103,37 +116,69 @@ class SpritePalettePanel(QWidget):
         self._view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self._view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self._view.setDragMode(QGraphicsView.DragMode.NoDrag)
+        use_opengl_viewport(self._view)
         ZoomControl(self._view)
         PanControl(self._view)
 
     def _import_png(self) -> None:
-        path = FileDialog.open_image()
-        if not path:
-            return
+        paths = FileDialog.open_images()
+        new_paths = [path for path in paths if str(path) not in self._sheets]
 
-        path_str = str(path)
-        if path_str in self._sheets:
-            # Sheet already loaded — just select it
-            self._select_sheet(path_str)
+        if not new_paths:
+            if paths:
+                # Sheet already loaded — just select it
+                self._select_sheet(str(paths[0]))
             return
 
-        dialog = SpriteSheetDialog(path)
+        # The first sheet sets the slicing of the whole batch
+        dialog = SpriteSheetDialog(new_paths[0])
         if dialog.exec() != QDialog.DialogCode.Accepted:
             return
 
-        sprites = dialog.get_sprites()
-        if not sprites:
-            QMessageBox.warning(self, "No Sprites", "No non-transparent frames found.")
-            return
-
-        sheet = SpriteSheetData(
-            path=path_str,
+        settings = SliceSettings(
             frame_width=dialog.frame_size.w,
             frame_height=dialog.frame_size.h,
-            frames=[FrameData(index=i, pixmap=px) for i, px in enumerate(sprites)],
+            offset_x=dialog.offset.x,
+            offset_y=dialog.offset.y,
+            mode=dialog.mode,
+            backgrounds=tuple(dialog.backgrounds),
+            tolerance=dialog.tolerance,
+        )
+        self._start_import(new_paths, settings)
+
+    def _start_import(self, paths: list[Path], settings: SliceSettings) -> None:
+        self._add_btn.setEnabled(False)
+        self._import_errors = []
+
+        progress = QProgressDialog(
+            "Importing spritesheets...", "Cancel", 0, len(paths), self
         )
-        ResourceManager.register_sheet(sheet)
-        self._add_sheet(sheet)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(self._importer.cancel)
+        self._import_progress = progress
+
+        self._importer.start(paths, settings)
+
+    def _on_import_progress(self, done: int, total: int) -> None:
+        if self._import_progress:
+            self._import_progress.setMaximum(total)
+            self._import_progress.setValue(done)
+
+    def _on_import_failed(self, path: str, error: str) -> None:
+        self._import_errors.append(f"{Path(path).name}: {error}")
+
+    def _on_import_finished(self) -> None:
+        if self._import_progress:
+            self._import_progress.reset()
+            self._import_progress.deleteLater()
+            self._import_progress = None
+
+        self._add_btn.setEnabled(True)
+
+        if self._import_errors:
+            QMessageBox.warning(self, "Import Sprites", "\n".join(self._import_errors))
+            self._import_errors = []
 
     def _add_sheet(self, sheet: SpriteSheetData) -> None:
         self._sheets[sheet.path] = sheet
@@ -1,4 +1,7 @@
+from typing import Callable
+
 from megabone.qt import (
+    QBrush,
     QColor,
     QFont,
     QGraphicsDropShadowEffect,
@@ -11,9 +14,10 @@ from megabone.qt import (
     QPoint,
     QPointF,
     QRect,
+    QRectF,
     QScrollArea,
+    QSize,
     Qt,
-    QTransform,
     QWidget,
     Signal,
 )
@@ -157,10 +161,24 @@ class Magnifier(QWidget):
         painter.drawEllipse(0, 0, self.lens_size, self.lens_size)
 
 
+Overlay = Callable[[QPainter, QRect], None]
+"""Paints over the image, in image coordinates, within the exposed rect"""
+
+
 class ImageViewer(QLabel):
+    """Zoomable image drawn as layers on every paint.
+
+    The background brush, the image and the overlay are painted only where
+    the widget is exposed, so nothing is rescaled or composed up front and
+    changing the overlay costs a repaint of the visible area.
+    """
+
     clicked = Signal(object)
     zoomChanged = Signal(float)
 
+    # The shadow renders the whole widget offscreen on every update
+    SHADOW_MAX_AREA = 1024 * 1024
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -175,6 +193,10 @@ class ImageViewer(QLabel):
         # Original pixmap
         self.original_pixmap: QPixmap | None = None
 
+        # Layers under and over the image
+        self.background: QBrush | None = None
+        self.overlay: Overlay | None = None
+
         # Magnifier setup
         self.magnifier = Magnifier(self)
         self.magnifier.hide()
@@ -207,6 +229,16 @@ class ImageViewer(QLabel):
         if self.magnifier:
             self.magnifier.set_source_pixmap(pixmap)
 
+    def set_background(self, brush: QBrush | None) -> None:
+        """Brush filling the image area under it, tiled in image pixels"""
+
+        self.background = brush
+        self.update()
+
+    def set_overlay(self, overlay: Overlay | None) -> None:
+        self.overlay = overlay
+        self.update()
+
     def set_zoom(self, zoom_level: float):
         self.zoom_factor = max(self.min_zoom, min(self.max_zoom, zoom_level))
         self._update_displayed_pixmap()
@@ -217,17 +249,45 @@ class ImageViewer(QLabel):
         if not self.original_pixmap:
             return
 
-        # Scale the pixmap
-        transform = QTransform()
-        transform.scale(self.zoom_factor, self.zoom_factor)
-
-        # Apply zoom
-        zoomed_pixmap = self.original_pixmap.transformed(transform)
-        super().setPixmap(zoomed_pixmap)
-        self.setFixedSize(zoomed_pixmap.size())
+        size = self._zoomed_size()
+        self.shadow.setEnabled(size.width() * size.height() <= self.SHADOW_MAX_AREA)
+        self.setFixedSize(size)
+        self.update()
 
         self.zoomChanged.emit(self.zoom_factor)
 
+    def _zoomed_size(self) -> QSize:
+        assert self.original_pixmap is not None
+        return self.original_pixmap.size() * self.zoom_factor
+
+    def paintEvent(self, event):
+        if not self.original_pixmap:
+            super().paintEvent(event)
+            return
+
+        painter = QPainter(self)
+        painter.translate(self._get_pixmap_offset())
+        painter.scale(self.zoom_factor, self.zoom_factor)
+
+        # Exposed area in image pixels, grown to cover partial pixels
+        exposed = (
+            painter.transform()
+            .inverted()[0]
+            .mapRect(QRectF(event.rect()))
+            .toAlignedRect()
+            .intersected(self.original_pixmap.rect())
+        )
+        if exposed.isEmpty():
+            return
+
+        if self.background is not None:
+            painter.fillRect(exposed, self.background)
+
+        painter.drawPixmap(exposed, self.original_pixmap, exposed)
+
+        if self.overlay is not None:
+            self.overlay(painter, exposed)
+
     def mousePressEvent(self, event):
         if self.can_click and event.button() == Qt.MouseButton.LeftButton:
             original_pos = self._map_to_original_coords(event.pos())
@@ -279,11 +339,11 @@ class ImageViewer(QLabel):
         return None
 
     def _get_pixmap_offset(self) -> QPoint:
-        if not self.pixmap():
+        if not self.original_pixmap:
             return QPoint(0, 0)
 
         # Get the scaled size
-        scaled_size = self.pixmap().size()
+        scaled_size = self._zoomed_size()
 
         # Offset to center
         return QPoint(
@@ -314,5 +374,15 @@ class ScrollImageViewer(QScrollArea):
     def setPixmap(self, pixmap: QPixmap):
         self.image_viewer.setPixmap(pixmap)
 
+    def set_background(self, brush: QBrush | None) -> None:
+        self.image_viewer.set_background(brush)
+
+    def set_overlay(self, overlay: Overlay | None) -> None:
+        self.image_viewer.set_overlay(overlay)
+
+    def update_overlay(self) -> None:
+        """Repaint the visible area after the overlay state changed"""
+        self.image_viewer.update()
+
     def toggle_click(self):
         self.image_viewer.toggle_click()
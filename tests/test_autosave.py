@@ -0,0 +1,87 @@
+import pytest
+
+
+@pytest.fixture
+def autosave(app, tmp_path, monkeypatch):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.manager.autosave import AutoSaveManager
+    from megabone.manager.document import DocumentManager
+    from megabone.model.bone import BoneData
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    manager = AutoSaveManager(DocumentManager())
+
+    document = Document()
+    document.bones.add_item(BoneData(name="first"), UpdateSource.LOAD)
+    manager.document_manager.add_document(document)
+
+    return manager, document
+
+
+def backup(app, manager, document) -> None:
+    """Run one autosave of document and wait for its write"""
+
+    manager._save_backup(document.doc_id, document)
+    while manager.document_manager.save_queue.pending:
+        app.processEvents()
+
+
+def rename_bone(document, name: str) -> None:
+    from dataclasses import replace
+
+    from megabone.model.collection import UpdateSource
+
+    bone = document.bones.get_items()[0]
+    document.bones.modify_item(replace(bone, name=name), UpdateSource.COMMAND)
+
+
+def recovered_name(manager, document) -> str:
+    return manager.recover_backup(document.doc_id).bones.get_items()[0].name
+
+
+def test_journal_is_replayed_onto_its_snapshot(app, autosave):
+    manager, document = autosave
+
+    backup(app, manager, document)
+    rename_bone(document, "journaled")
+    backup(app, manager, document)
+
+    assert manager._get_journal_path(document.doc_id).exists()
+    assert recovered_name(manager, document) == "journaled"
+
+
+def test_journal_is_not_replayed_onto_another_snapshot(app, autosave):
+    manager, document = autosave
+    backup_file = manager._get_backup_path(document.doc_id)
+    journal_file = manager._get_journal_path(document.doc_id)
+
+    backup(app, manager, document)
+    rename_bone(document, "journaled")
+    backup(app, manager, document)
+
+    # Crash while compacting, after the new snapshot replaced the backup
+    journal = journal_file.read_bytes()
+    rename_bone(document, "compacted")
+    manager._save_snapshot(document.doc_id, document)
+    while manager.document_manager.save_queue.pending:
+        app.processEvents()
+    journal_file.write_bytes(journal)
+
+    assert recovered_name(manager, document) == "compacted"
+
+    # The previous snapshot the journal was recorded against
+    backup_file.write_text("not a document", encoding="utf-8")
+    assert recovered_name(manager, document) == "journaled"
+
+
+def test_closed_documents_are_no_longer_followed(app, autosave):
+    manager, document = autosave
+    journal = manager._journals[document.doc_id]
+
+    manager._on_document_removed(document.doc_id)
+    rename_bone(document, "after close")
+
+    assert len(journal) == 0
+    assert document.doc_id not in manager._dirty_documents
@@ -0,0 +1,59 @@
+from collections import deque
+
+import pytest
+
+
+def bfs_boxes(mask, min_area: int) -> list[tuple[int, int, int, int]]:
+    """Bounding boxes of the 8-connected islands found pixel by pixel"""
+
+    height, width = mask.shape
+    seen = mask == 0
+    boxes = []
+
+    for y in range(height):
+        for x in range(width):
+            if seen[y, x]:
+                continue
+
+            seen[y, x] = True
+            queue = deque([(y, x)])
+            left, top, right, bottom, area = x, y, x, y, 0
+            while queue:
+                cy, cx = queue.popleft()
+                area += 1
+                left, right = min(left, cx), max(right, cx)
+                top, bottom = min(top, cy), max(bottom, cy)
+
+                for ny in range(max(cy - 1, 0), min(cy + 2, height)):
+                    for nx in range(max(cx - 1, 0), min(cx + 2, width)):
+                        if not seen[ny, nx]:
+                            seen[ny, nx] = True
+                            queue.append((ny, nx))
+
+            if area >= min_area:
+                boxes.append((left, top, right - left + 1, bottom - top + 1))
+
+    return sorted(boxes, key=lambda box: (box[1], box[0]))
+
+
+@pytest.mark.parametrize("seed", range(400))
+def test_connected_boxes_match_a_flood_fill(seed):
+    import numpy as np
+
+    from megabone.util.components import connected_boxes
+
+    rng = np.random.default_rng(seed)
+    height, width = rng.integers(1, 40, size=2)
+    mask = rng.random((height, width)) < rng.uniform(0.05, 0.6)
+    min_area = int(rng.integers(1, 5))
+
+    boxes = [tuple(box) for box in connected_boxes(mask, min_area).tolist()]
+    assert boxes == bfs_boxes(mask, min_area)
+
+
+def test_connected_boxes_of_an_empty_mask():
+    import numpy as np
+
+    from megabone.util.components import connected_boxes
+
+    assert connected_boxes(np.zeros((4, 4), dtype=bool)).shape == (0, 4)
@@ -0,0 +1,169 @@
+import pytest
+
+
+def sample_document():
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.model.attachment import AttachmentData
+    from megabone.model.bone import BoneData
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.model.keyframe import EaseType, KeyframeData
+    from megabone.model.sprite import SpriteData
+    from megabone.qt import QPointF
+    from megabone.util.types import Point
+
+    document = Document()
+    root = BoneData(
+        name="root", start_point=Point(0.5, 0.0), end_point=Point(10.25, -3.5)
+    )
+    child = BoneData(
+        name="child",
+        parent_id=root.id,
+        start_point=Point(10.25, -3.5),
+        end_point=Point(20.0, 1e-9),
+        z_index=3,
+    )
+    sprite = SpriteData(
+        name="torso",
+        path="sheets/hero.png",
+        bone_id=root.id,
+        frame_index=7,
+        offset=Point(-4.0, 2.5),
+        position=Point(100.0, 200.75),
+        rotation=12.5,
+        z_index=0,
+    )
+    records = [
+        (document.bones, root),
+        (document.bones, child),
+        (document.sprites, sprite),
+        (document.keyframes, KeyframeData(bone_id=root.id, frame=0, value=0.0)),
+        (
+            document.keyframes,
+            KeyframeData(
+                bone_id=root.id, frame=12, value=45.5, easing=EaseType.EASE_OUT
+            ),
+        ),
+        (
+            document.attachments,
+            AttachmentData(
+                bone_id=root.id,
+                sprite_id=sprite.id,
+                offset=QPointF(1.5, -2.0),
+                rotation_offset=90.0,
+            ),
+        ),
+    ]
+    for collection, data in records:
+        collection.add_item(data, UpdateSource.LOAD)
+
+    return document
+
+
+def records(document) -> dict[str, list]:
+    return {
+        collection.key_name: collection.get_items()
+        for collection in document.get_all_collections()
+    }
+
+
+def test_round_trip_between_json_and_container(app, tmp_path):
+    from megabone.model.container import is_container
+    from megabone.model.document import Document
+
+    document = sample_document()
+    expected = records(document)
+    assert all(expected.values())
+
+    document.write(tmp_path / "first.json")
+    from_json = Document.load(tmp_path / "first.json")
+    assert records(from_json) == expected
+
+    from_json.write(tmp_path / "doc.mgb", binary=True)
+    assert is_container(tmp_path / "doc.mgb")
+    from_container = Document.load(tmp_path / "doc.mgb")
+    assert records(from_container) == expected
+
+    from_container.write(tmp_path / "second.json")
+    second = (tmp_path / "second.json").read_text(encoding="utf-8")
+    assert second == (tmp_path / "first.json").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("suffix", [".json", ".mgb"])
+def test_integer_point_coordinates_load_as_floats(app, tmp_path, suffix):
+    from megabone.model.bone import BoneData
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.util.types import Point
+
+    document = Document()
+    bone = BoneData(start_point=Point(1, 2), end_point=Point(3.5, 4))
+    document.bones.add_item(bone, UpdateSource.LOAD)
+
+    path = tmp_path / f"doc{suffix}"
+    document.write(path, binary=suffix == ".mgb")
+    loaded = Document.load(path).bones.get_item(bone.id)
+
+    for point, expected in (
+        (loaded.start_point, (1.0, 2.0)),
+        (loaded.end_point, (3.5, 4.0)),
+    ):
+        assert (point.x, point.y) == expected
+        assert type(point.x) is float and type(point.y) is float
+
+
+def test_untyped_values_decode_the_same_from_either_format(app, tmp_path):
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.model.keyframe import KeyframeData
+    from megabone.util.types import Point
+
+    document = Document()
+    for frame, value in enumerate([Point(1.0, 2.0), Point(3.0, 4.5)]):
+        document.keyframes.add_item(
+            KeyframeData(frame=frame, value=value), UpdateSource.LOAD
+        )
+
+    values = []
+    for name in ("doc.json", "doc.mgb"):
+        document.write(tmp_path / name, binary=name.endswith(".mgb"))
+        loaded = Document.load(tmp_path / name)
+        values.append([data.value for data in loaded.keyframes.get_items()])
+
+    assert values[0] == values[1]
+
+
+def test_load_defers_sections_the_scene_does_not_show(app, tmp_path):
+    from megabone.model.document import Document
+    from megabone.views.editor_scene import ModalEditorScene
+
+    sample_document().write(tmp_path / "doc.mgb", binary=True)
+    document = Document.load(tmp_path / "doc.mgb")
+    assert document.bone_arrays.stale
+
+    scene = ModalEditorScene(document=document)
+    assert len(scene.layer_manager.items) == 3
+    assert document.bone_arrays.stale
+    assert document.keyframes.deferred
+    assert document.attachments.deferred
+
+    assert len(document.bone_arrays) == 2
+    assert list(document.bone_arrays.parents) == [-1, 0]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_save_keeps_the_format_the_document_was_loaded_from(app, tmp_path, binary):
+    from megabone.model.container import is_container
+    from megabone.model.document import Document
+
+    # Projects were saved as JSON under the .mgb extension before the container
+    path = tmp_path / "doc.mgb"
+    sample_document().write(path, binary)
+
+    document = Document.load(path)
+    assert document.binary == binary
+    document.save()
+    assert is_container(path) == binary
+
+    document.save(tmp_path / "copy.mgb", binary=True)
+    assert is_container(tmp_path / "copy.mgb")
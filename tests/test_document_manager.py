@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.fixture
+def manager(app, monkeypatch):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.manager.document import DocumentManager
+    from megabone.model.document import Document
+    from megabone.qt import QMessageBox
+
+    errors = []
+    monkeypatch.setattr(QMessageBox, "critical", lambda *args: errors.append(args[2]))
+
+    manager = DocumentManager()
+    manager.add_document(Document())
+    return manager, errors
+
+
+def save_as(monkeypatch, path) -> None:
+    from megabone.dialog import FileDialog
+
+    monkeypatch.setattr(FileDialog, "save_file", staticmethod(lambda: (path, False)))
+
+
+def finish_saves(app, manager) -> None:
+    while manager.save_queue.pending:
+        app.processEvents()
+
+
+def test_failed_save_as_keeps_the_document_path(app, manager, monkeypatch, tmp_path):
+    manager, errors = manager
+    document = next(iter(manager._documents.values()))
+
+    save_as(monkeypatch, tmp_path / "missing" / "doc.json")
+    manager.save_document_as(document)
+    assert document.path is None
+
+    finish_saves(app, manager)
+    assert document.path is None
+    assert errors
+
+    save_as(monkeypatch, tmp_path / "doc.json")
+    manager.save_document_as(document)
+    finish_saves(app, manager)
+    assert document.path == tmp_path / "doc.json"
+
+
+@pytest.mark.parametrize("directory, closed", [("", True), ("missing", False)])
+def test_close_waits_for_the_save(
+    app, manager, monkeypatch, tmp_path, directory, closed
+):
+    from megabone.qt import QMessageBox
+
+    manager, errors = manager
+    document = next(iter(manager._documents.values()))
+    document.path = tmp_path / directory / "doc.json"
+
+    monkeypatch.setattr(
+        QMessageBox, "question", lambda *args: QMessageBox.StandardButton.Save
+    )
+    closed_ids = []
+    manager.closedDocument.connect(closed_ids.append)
+
+    manager.close_document(document.doc_id)
+    assert not closed_ids
+
+    finish_saves(app, manager)
+    assert (closed_ids == [document.doc_id]) == closed
+    assert (manager.get_document(document.doc_id) is None) == closed
+    assert bool(errors) != closed
@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.fixture
+def sprite_scene(app):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.model.sprite import SpriteData
+    from megabone.views.editor_scene import ModalEditorScene
+
+    # Documents written before sparse keys store 0 for the bottom-most item
+    document = Document()
+    for name, z_index in (("top", 2), ("bottom", 0), ("middle", 1)):
+        document.sprites.add_item(
+            SpriteData(name=name, z_index=z_index), UpdateSource.LOAD
+        )
+
+    return document, ModalEditorScene(document=document)
+
+
+def stacking(document, scene) -> list[str]:
+    from megabone.editor.layer import Layer
+
+    items = scene.layer_manager.layers[Layer.SPRITE].items
+    return [document.sprites.get_item(item.id).name for item in items]
+
+
+def stored_keys_match(document, scene) -> bool:
+    return all(
+        document.sprites.get_item(item.id).z_index == item.z_index
+        for item in scene.layer_manager.items
+    )
+
+
+def test_zero_z_index_stays_at_the_bottom(sprite_scene):
+    document, scene = sprite_scene
+    assert stacking(document, scene) == ["bottom", "middle", "top"]
+
+
+def test_reorder_is_stored_and_undoable(sprite_scene):
+    document, scene = sprite_scene
+    bottom = scene.layer_manager.items[0]
+
+    bottom.setSelected(True)
+    scene.layer_manager._move_selected(1)
+    assert stacking(document, scene) == ["middle", "bottom", "top"]
+    assert stored_keys_match(document, scene)
+
+    document.undo_stack.undo()
+    assert stacking(document, scene) == ["bottom", "middle", "top"]
+    assert stored_keys_match(document, scene)
+
+
+def test_renumbered_keys_are_stored(sprite_scene):
+    from megabone.model.collection import UpdateSource
+    from megabone.model.sprite import SpriteData
+
+    document, scene = sprite_scene
+    bottom = scene.layer_manager.items[0]
+
+    # Inserting at a taken key goes right above its owner, the dense keys of
+    # the old document leave no gap so the layer is renumbered
+    for _ in range(12):
+        z_index = document.sprites.get_item(bottom.id).z_index
+        document.sprites.add_item(SpriteData(z_index=z_index), UpdateSource.COMMAND)
+
+    assert stored_keys_match(document, scene)
+    assert stacking(document, scene)[0] == "bottom"
+
+
+def test_loading_does_not_modify_the_document(app):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.model.sprite import SpriteData
+    from megabone.views.editor_scene import ModalEditorScene
+
+    document = Document()
+    for name, z_index in (("first", 0), ("second", 0)):
+        document.sprites.add_item(
+            SpriteData(name=name, z_index=z_index), UpdateSource.LOAD
+        )
+
+    modified = []
+    document.documentModified.connect(lambda: modified.append(True))
+    scene = ModalEditorScene(document=document)
+
+    assert stored_keys_match(document, scene)
+    assert not modified
+    assert document.undo_stack.count() == 0
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def ik_animation(app):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.IKSolver import NumpyFABRIK
+    from megabone.model.animation import Animation
+    from megabone.model.bone import BoneData
+    from megabone.model.collection import UpdateSource
+    from megabone.model.document import Document
+    from megabone.model.property import PropertyType
+    from megabone.qt import QGraphicsRectItem, QPointF
+    from megabone.util.types import Point
+    from megabone.views.editor_scene import ModalEditorScene
+
+    document = Document()
+    parent_id = ""
+    for i in range(4):
+        bone = BoneData(
+            parent_id=parent_id,
+            start_point=Point(i * 20, 0),
+            end_point=Point((i + 1) * 20, 0),
+        )
+        document.bones.add_item(bone, UpdateSource.LOAD)
+        parent_id = bone.id
+
+    scene = ModalEditorScene(document=document)
+    bones = [scene.get_model_item(bone.id) for bone in document.bones.get_items()]
+
+    # Stands in for an IKHandle, playback only uses its chain and target
+    handle = SimpleNamespace(chain=NumpyFABRIK(bones), target=QGraphicsRectItem())
+
+    animation = Animation("ik")
+    animation.frame_end = 30
+    track = animation.addTrack(handle, PropertyType.IK_TARGET)
+    track.addKeyframe(0, QPointF(50, 40))
+    track.addKeyframe(10, QPointF(-30, 50))
+    track.addKeyframe(20, QPointF(20, -60))
+    track.addKeyframe(30, QPointF(70, 10))
+
+    return animation, handle.chain
+
+
+def play(animation, chain) -> np.ndarray:
+    poses = []
+    for frame in range(animation.frame_start, animation.frame_end + 1):
+        animation.update(frame)
+        poses.append(chain.read_joints().copy())
+    return np.array(poses)
+
+
+def test_baked_ik_matches_live_playback(ik_animation):
+    animation, chain = ik_animation
+    rest = chain.read_joints().copy()
+
+    animation.bake()
+    baked = play(animation, chain)
+
+    chain.apply_joints(rest)
+    animation.unbake()
+    live = play(animation, chain)
+
+    np.testing.assert_allclose(baked, live, atol=1e-9)
+
+
+def test_sprite_offsets_follow_the_solved_pose(ik_animation):
+    from megabone.model.property import PropertyType
+    from megabone.util.types import Point
+
+    animation, chain = ik_animation
+
+    # Stands in for a sprite, the offset track only moves it
+    positions = []
+    sprite = SimpleNamespace(
+        attached_bone=chain.bones[-1], bone_offset=None, setPos=positions.append
+    )
+    # Added ahead of the IK track, it is still applied after the solve
+    track = animation.addTrack(sprite, PropertyType.SPRITE_OFFSET)
+    track.addKeyframe(0, Point(5.0, -5.0))
+    animation.tracks.insert(0, animation.tracks.pop())
+
+    for frame in (0, 10, 20):
+        animation.update(frame)
+        assert positions[-1] == chain.bones[-1].end_point + Point(5.0, -5.0)
+
+
+def test_batch_skips_the_targets_of_empty_chains(ik_animation):
+    from megabone.IKSolver import BatchFABRIK, NumpyFABRIK
+    from megabone.qt import QPointF
+
+    animation, chain = ik_animation
+
+    batch = BatchFABRIK([NumpyFABRIK([]), chain])
+    solved = batch.solve([QPointF(1000, 1000), QPointF(30, 40)])
+
+    assert len(solved) == 1
+    np.testing.assert_allclose(solved[0][-1], (30, 40), atol=0.01)
+
+    # Playback keeps the batch while the chains are unchanged
+    animation.solve_ik([NumpyFABRIK([]), chain], [QPointF(1, 1), QPointF(30, 40)])
+    kept = animation._ik_batch
+    animation.solve_ik([NumpyFABRIK([]), chain], [QPointF(1, 1), QPointF(20, 50)])
+    assert animation._ik_batch is kept
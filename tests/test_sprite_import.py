@@ -0,0 +1,25 @@
+def test_results_of_a_cancelled_import_are_dropped(app, tmp_path):
+    import megabone.widget  # noqa: F401  (resolves the widget import cycle)
+    from megabone.manager.sprite_import import SliceSettings, SpriteSheetImporter
+
+    path = tmp_path / "sheet.png"
+    settings = SliceSettings(frame_width=8, frame_height=8)
+    importer = SpriteSheetImporter()
+
+    failed = []
+    importer.sheetFailed.connect(lambda path, error: failed.append(error))
+
+    importer.start([path], settings)
+    stale = importer._tasks[str(path)]
+    importer.cancel()
+    importer.start([path], settings)
+
+    # The cancelled task was already slicing the same sheet
+    stale.signals.failed.emit(str(path), "stale")
+    assert importer.running
+    assert not failed
+
+    importer.wait()
+    while importer.running:
+        app.processEvents()
+    assert failed == ["Unable to read image"]